@@ -1,21 +1,132 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
-from accounts.models import User, Employee, Resignation
+from accounts import services
+from accounts.archive import restore
+from accounts.models import User, Employee, Resignation, ArchivedAccount, Job
+
+
+def estimate_count(queryset) -> int:
+    """조건이 없는 queryset이면 DB 통계에 기록된 테이블의 추정 행 수를 반환한다.
+
+    Returns:
+        int: 추정 행 수, 추정할 수 없으면 None
+    """
+    if queryset.query.where:
+        return None
+
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+    elif connection.vendor == "mysql":
+        sql = (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s"
+        )
+    else:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """ADMIN_ESTIMATED_COUNT_THRESHOLD 행 이상인 테이블 전체를 볼 때는
+    COUNT(*)로 테이블 전체를 읽지 않고 추정 건수로 페이지를 나눈다.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        estimated = estimate_count(self.object_list)
+        if (
+            estimated is not None
+            and estimated >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+        ):
+            return estimated
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """행이 많은 테이블의 admin 목록 설정
+    - 추정 건수로 페이지를 나누고, 검색 결과 화면에서 전체 건수를 다시 세지 않는다.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+def iterate_in_batches(queryset):
+    """선택한 행을 ADMIN_ACTION_BATCH_SIZE 개씩 pk 순서로 읽는다."""
+    last_pk = None
+    while True:
+        batch = queryset.order_by("pk")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        rows = list(batch[: settings.ADMIN_ACTION_BATCH_SIZE])
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1].pk
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
-    list_display = ["email", "username", "phone", "state"]
+class UserAdmin(LargeTableAdmin):
+    list_display = ["email", "username", "phone", "state", "created_at"]
+    list_filter = ["state"]
+    # email, username, phone은 index가 있는 컬럼이라 startswith 검색이 index를 사용한다.
+    search_fields = ["email__startswith", "username__startswith", "phone__startswith"]
+    date_hierarchy = "created_at"
+    actions = ["approve_users", "reject_users"]
+
+    @admin.action(description="선택한 가입 신청 승인")
+    def approve_users(self, request, queryset) -> None:
+        """선택한 가입 대기 유저를 승인하고 기본 권한의 임직원으로 등록한다.
+            batch 마다 accounts.services로 한 번에 처리한다.
+
+        Args:
+            request (HttpRequest): admin 요청
+            queryset (QuerySet): 선택한 User 목록
+        """
+        approved = 0
+        queryset = queryset.filter(state=User.StateChoices.AWAIT, is_superuser=False)
+        for users in iterate_in_batches(queryset):
+            approved += len(services.approve(users))
+        self.message_user(request, f"{approved}명의 가입 신청을 승인했습니다.")
+
+    @admin.action(description="선택한 가입 신청 거절")
+    def reject_users(self, request, queryset) -> None:
+        """선택한 가입 대기 유저의 가입 신청을 거절한다.
+
+        Args:
+            request (HttpRequest): admin 요청
+            queryset (QuerySet): 선택한 User 목록
+        """
+        rejected = 0
+        queryset = queryset.filter(state=User.StateChoices.AWAIT, is_superuser=False)
+        for users in iterate_in_batches(queryset):
+            rejected += len(services.reject(users, "관리자 페이지에서 일괄 거절"))
+        self.message_user(request, f"{rejected}명의 가입 신청을 거절했습니다.")
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(LargeTableAdmin):
     list_display = [
         "get_user",
         "authorization_grade",
         "signup_approval_authorization",
         "is_resigned",
     ]
+    list_filter = ["authorization_grade", "is_resigned"]
+    list_select_related = ["user"]
+    search_fields = ["user__email__startswith", "user__username__startswith"]
+    raw_id_fields = ["user"]
+    actions = ["resign_employees"]
 
     @admin.display(description="임직원")
     def get_user(self, obj: Employee) -> str:
@@ -29,10 +140,28 @@ class EmployeeAdmin(admin.ModelAdmin):
         """
         return obj.user.username
 
+    @admin.action(description="선택한 임직원 탈퇴")
+    def resign_employees(self, request, queryset) -> None:
+        """선택한 재직 중인 임직원을 탈퇴시킨다.
+
+        Args:
+            request (HttpRequest): admin 요청
+            queryset (QuerySet): 선택한 Employee 목록
+        """
+        resigned = 0
+        queryset = queryset.filter(is_resigned=False)
+        for employees in iterate_in_batches(queryset):
+            resigned += len(services.resign(employees, "관리자 페이지에서 일괄 탈퇴"))
+        self.message_user(request, f"{resigned}명의 임직원을 탈퇴시켰습니다.")
+
 
 @admin.register(Resignation)
-class ResignationAdmin(admin.ModelAdmin):
+class ResignationAdmin(LargeTableAdmin):
     list_display = ["get_resigned_user", "resigned_at", "reason_for_resignation"]
+    list_select_related = ["resigned_user__user"]
+    search_fields = ["resigned_user__user__email__startswith"]
+    date_hierarchy = "resigned_at"
+    raw_id_fields = ["resigned_user"]
 
     @admin.display(description="임직원")
     def get_resigned_user(self, obj: Resignation) -> str:
@@ -45,3 +174,34 @@ class ResignationAdmin(admin.ModelAdmin):
             str: 회원가입 승인 신청 전 모델의 이름을 반환한다.
         """
         return obj.resigned_user.user.username
+
+
+@admin.register(ArchivedAccount)
+class ArchivedAccountAdmin(LargeTableAdmin):
+    list_display = ["email", "reason", "joined_at", "archived_at"]
+    list_filter = ["reason"]
+    search_fields = ["email__startswith"]
+    actions = ["restore_accounts"]
+
+    @admin.action(description="선택한 계정 되돌리기")
+    def restore_accounts(self, request, queryset) -> None:
+        """선택한 보관 계정을 hot 테이블로 되돌린다.
+
+        Args:
+            request (HttpRequest): admin 요청
+            queryset (QuerySet): 선택한 ArchivedAccount 목록
+        """
+        restored = 0
+        for archived in queryset:
+            try:
+                restore(archived)
+                restored += 1
+            except ValueError as error:
+                self.message_user(request, f"{archived.email}: {error}", messages.ERROR)
+        self.message_user(request, f"{restored}개의 계정을 되돌렸습니다.")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["task", "status", "processed", "total", "attempts", "created_at"]
+    list_filter = ["status", "task"]
@@ -1,6 +1,56 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self) -> None:
+        from accounts.bloom import add_created_user_email
+        from accounts.db import apply_sqlite_pragmas
+        from accounts.directory import (
+            delete_employee_row,
+            sync_saved_employee,
+            sync_saved_user,
+        )
+        from accounts.events import publish_saved_event
+        from accounts.slowlog import install_slow_query_logger
+
+        # 작업 함수를 accounts.jobs.TASKS에 등록한다.
+        import accounts.tasks  # noqa: F401
+
+        connection_created.connect(
+            apply_sqlite_pragmas,
+            dispatch_uid="accounts_apply_sqlite_pragmas",
+        )
+        connection_created.connect(
+            install_slow_query_logger,
+            dispatch_uid="accounts_install_slow_query_logger",
+        )
+        post_save.connect(
+            add_created_user_email,
+            sender=self.get_model("User"),
+            dispatch_uid="accounts_add_created_user_email",
+        )
+        post_save.connect(
+            sync_saved_employee,
+            sender=self.get_model("Employee"),
+            dispatch_uid="accounts_sync_saved_employee",
+        )
+        post_save.connect(
+            sync_saved_user,
+            sender=self.get_model("User"),
+            dispatch_uid="accounts_sync_saved_user",
+        )
+        post_delete.connect(
+            delete_employee_row,
+            sender=self.get_model("Employee"),
+            dispatch_uid="accounts_delete_employee_row",
+        )
+        post_save.connect(
+            publish_saved_event,
+            sender=self.get_model("OutboxEvent"),
+            dispatch_uid="accounts_publish_saved_event",
+        )
@@ -0,0 +1,238 @@
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import (
+    ArchivedAccount,
+    Employee,
+    Resignation,
+    ShardDirectory,
+    User,
+)
+from accounts.sharding import (
+    get_user_databases,
+    is_sharding_enabled,
+    user_id_for_email,
+)
+
+
+def serialize_row(obj) -> dict:
+    """모델 인스턴스의 모든 컬럼 값을 attname 기준으로 반환한다.
+    DjangoJSONEncoder는 일시를 밀리초까지만 남기므로 일시는 직접 isoformat으로 바꾼다.
+    """
+    row = {}
+    for field in obj._meta.concrete_fields:
+        value = field.value_from_object(obj)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        row[field.attname] = value
+    return row
+
+
+def deserialize_row(model, data: dict):
+    """serialize_row로 저장한 값으로 인스턴스를 만든다. 문자열이 된 일시는 다시 변환한다."""
+    return model(
+        **{
+            field.attname: field.to_python(data[field.attname])
+            for field in model._meta.concrete_fields
+            if field.attname in data
+        },
+    )
+
+
+def get_rejected_queryset(using: str, before):
+    return User.objects.using(using).filter(
+        state=User.StateChoices.REJECTED,
+        is_superuser=False,
+        rejected_at__lt=before,
+    )
+
+
+def get_resigned_queryset(using: str, before):
+    return User.objects.using(using).filter(
+        is_superuser=False,
+        employee__is_resigned=True,
+        employee__resignation__resigned_at__lt=before,
+    )
+
+
+def archive_batch(using: str, queryset, reason: str, batch_size: int) -> int:
+    """queryset에서 batch_size 명을 골라 ArchivedAccount로 옮기고 hot 테이블에서 지운다.
+        다른 작업이 잠근 행은 건너뛰고, 한 batch를 하나의 짧은 transaction으로 처리한다.
+        샤딩 시 같은 이메일로 다시 가입할 수 있도록 ShardDirectory의 행도 함께 지운다.
+
+    Returns:
+        int: 옮긴 유저 수
+    """
+    with transaction.atomic(using=using):
+        users = list(
+            queryset.select_for_update(skip_locked=True, of=("self",)).order_by("pk")[
+                :batch_size
+            ],
+        )
+        if not users:
+            return 0
+
+        user_ids = [user.pk for user in users]
+        employees = {
+            employee.user_id: employee
+            for employee in Employee.objects.using(using).filter(user_id__in=user_ids)
+        }
+        resignations = {
+            resignation.resigned_user_id: resignation
+            for resignation in Resignation.objects.using(using).filter(
+                resigned_user_id__in=[employee.pk for employee in employees.values()],
+            )
+        }
+
+        archived = []
+        for user in users:
+            employee = employees.get(user.pk)
+            resignation = resignations.get(employee.pk) if employee else None
+            archived.append(
+                ArchivedAccount(
+                    user_id=user.pk,
+                    email=user.email,
+                    reason=reason,
+                    joined_at=user.created_at,
+                    rejected_at=user.rejected_at,
+                    resigned_at=resignation.resigned_at if resignation else None,
+                    user_data=serialize_row(user),
+                    employee_data=serialize_row(employee) if employee else None,
+                    resignation_data=(
+                        serialize_row(resignation) if resignation else None
+                    ),
+                ),
+            )
+        ArchivedAccount.objects.using(using).bulk_create(archived)
+
+        # Employee, Resignation, EmployeeDirectory는 cascade와 signal로 함께 지워진다.
+        User.objects.using(using).filter(pk__in=user_ids).delete()
+        if is_sharding_enabled():
+            with transaction.atomic(using="default"):
+                ShardDirectory.objects.using("default").filter(
+                    pk__in=user_ids,
+                ).delete()
+    return len(users)
+
+
+def archive_accounts(
+    using: str,
+    batch_size: int = None,
+    pause: float = 0,
+    now=None,
+) -> dict:
+    """보관 기간이 지난 거절 유저와 퇴사자를 batch 단위로 ArchivedAccount로 옮긴다.
+        - 거절 유저: rejected_at 이후 ARCHIVE_REJECTED_AFTER_DAYS 일이 지난 경우
+        - 퇴사자: resigned_at 이후 ARCHIVE_RESIGNED_AFTER_DAYS 일이 지난 경우
+
+    Args:
+        using (str): database alias
+        batch_size (int): 한 transaction에서 옮길 유저 수 (기본값: ARCHIVE_BATCH_SIZE)
+        pause (float): batch 사이에 쉬는 시간(초). 다른 쓰기 작업에 lock을 양보한다.
+        now (datetime): 보관 기간 계산 기준 시각 (기본값: 현재)
+
+    Returns:
+        dict: 보관 사유 별로 옮긴 유저 수
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    now = now or timezone.now()
+    targets = {
+        ArchivedAccount.ReasonChoices.REJECTED: get_rejected_queryset(
+            using,
+            now - timedelta(days=settings.ARCHIVE_REJECTED_AFTER_DAYS),
+        ),
+        ArchivedAccount.ReasonChoices.RESIGNED: get_resigned_queryset(
+            using,
+            now - timedelta(days=settings.ARCHIVE_RESIGNED_AFTER_DAYS),
+        ),
+    }
+
+    counts = dict.fromkeys(targets, 0)
+    for reason, queryset in targets.items():
+        while True:
+            archived = archive_batch(using, queryset, reason, batch_size)
+            counts[reason] += archived
+            if archived < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+    return counts
+
+
+def find_archived(email: str = None, user_id: int = None) -> list:
+    """모든 database에서 보관된 계정을 이메일 또는 user_id로 찾는다.
+
+    Args:
+        email (str): 찾을 이메일
+        user_id (int): 찾을 유저 id
+
+    Raises:
+        ValueError: email과 user_id 모두 없는 경우 발생
+
+    Returns:
+        list: ArchivedAccount 목록
+    """
+    if email is None and user_id is None:
+        raise ValueError("email 또는 user_id를 입력해야합니다.")
+
+    lookups = {}
+    if email is not None:
+        lookups["email"] = email
+    if user_id is not None:
+        lookups["user_id"] = user_id
+
+    archived = []
+    for using in get_user_databases():
+        archived.extend(ArchivedAccount.objects.using(using).filter(**lookups))
+    return archived
+
+
+def restore(archived: ArchivedAccount) -> User:
+    """보관된 계정을 원래 pk 그대로 hot 테이블에 되돌리고 보관 행을 지운다.
+        샤딩 시 ShardDirectory에 원래 user_id와 이메일을 다시 등록한다.
+
+    Args:
+        archived (ArchivedAccount): find_archived로 찾은 보관 계정
+
+    Raises:
+        ValueError: 같은 이메일로 다시 가입한 유저가 있는 경우 발생
+
+    Returns:
+        User: 되돌린 유저
+    """
+    using = archived._state.db
+    with transaction.atomic(using=using):
+        if User.objects.using(using).filter(email=archived.email).exists() or (
+            is_sharding_enabled() and user_id_for_email(archived.email) is not None
+        ):
+            raise ValueError("같은 이메일로 가입한 유저가 있어 되돌릴 수 없습니다.")
+
+        user = deserialize_row(User, archived.user_data)
+        user.save(force_insert=True, using=using)
+        # auto_now, auto_now_add로 덮어쓴 일시를 원래 값으로 되돌린다.
+        User.objects.using(using).filter(pk=user.pk).update(
+            created_at=archived.user_data["created_at"],
+            updated_at=archived.user_data["updated_at"],
+        )
+
+        if archived.employee_data:
+            employee = deserialize_row(Employee, archived.employee_data)
+            employee.save(force_insert=True, using=using)
+        if archived.resignation_data:
+            resignation = deserialize_row(Resignation, archived.resignation_data)
+            resignation.save(force_insert=True, using=using)
+
+        if is_sharding_enabled():
+            with transaction.atomic(using="default"):
+                ShardDirectory.objects.using("default").create(
+                    pk=archived.user_id,
+                    email=archived.email,
+                )
+        archived.delete()
+
+    user.refresh_from_db()
+    return user
@@ -0,0 +1,216 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+
+from accounts.metrics import record_cache_access
+from accounts.sharding import is_sharding_enabled
+
+
+logger = logging.getLogger(__name__)
+
+EMAIL_FILTER_VERSION_KEY = "email_filter:version"
+
+
+class BloomFilter:
+    """비트 배열과 k개의 해시로 원소의 존재 여부를 확인하는 Bloom filter
+    없다고 판단한 원소는 반드시 없고, 있다고 판단한 원소는 error_rate 확률로 틀릴 수 있다.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.bit_count = math.ceil(
+            -self.capacity * math.log(error_rate) / (math.log(2) ** 2),
+        )
+        self.hash_count = max(1, round(self.bit_count / self.capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.bit_count / 8))
+        self.count = 0
+
+    def get_positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.bit_count
+
+    def add(self, value: str) -> None:
+        for position in self.get_positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.get_positions(value)
+        )
+
+    @property
+    def size_in_bytes(self) -> int:
+        return len(self.bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """현재 저장된 원소 수 기준의 예상 false positive 비율"""
+        return (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** (
+            self.hash_count
+        )
+
+
+class EmailFilter:
+    """가입된 이메일의 Bloom filter
+        LoginForm과 SignUpForm이 가입되지 않은 이메일을 DB 조회 없이 판단하는 데 사용한다.
+
+    - 서버 시작 시(warmup) 또는 처음 사용할 때 백그라운드에서 만들고,
+      EMAIL_FILTER_REBUILD_INTERVAL 마다 다시 만든다. 만드는 동안에는 DB에서 확인한다.
+    - 유저 생성이 commit되면 add_email()로 추가하고 EMAIL_FILTER_CACHE의 version을 올린다.
+      다른 프로세스에서 유저가 생성되어 version이 달라지면 filter를 믿지 않고 DB에서 확인한다.
+      따라서 여러 worker를 사용할 때는 EMAIL_FILTER_CACHE가 worker 간에 공유되어야 한다.
+    """
+
+    def __init__(self) -> None:
+        self.bloom = None
+        self.version = None
+        self.built_at = 0.0
+        self.lock = threading.Lock()
+        self.rebuilding = False
+
+    @property
+    def cache(self):
+        return caches[settings.EMAIL_FILTER_CACHE]
+
+    def get_version(self) -> int:
+        version = self.cache.get(EMAIL_FILTER_VERSION_KEY)
+        record_cache_access(settings.EMAIL_FILTER_CACHE, version is not None)
+        if version is None:
+            version = self.cache.get_or_set(EMAIL_FILTER_VERSION_KEY, 0, timeout=None)
+        return version
+
+    def get_emails(self):
+        from accounts.models import ShardDirectory, User
+
+        if is_sharding_enabled():
+            queryset = ShardDirectory.objects.using("default")
+        else:
+            queryset = User.objects.all()
+        return queryset.values_list("email", flat=True).iterator(chunk_size=10000)
+
+    def build(self) -> BloomFilter:
+        """가입된 모든 이메일로 Bloom filter를 새로 만든다.
+
+        Returns:
+            BloomFilter: 새로 만든 filter
+        """
+        try:
+            # version을 이메일보다 먼저 읽어야 그 사이 commit된 가입을 놓쳐도
+            # version이 달라져서 filter를 믿지 않는다.
+            version = self.get_version()
+            emails = list(self.get_emails())
+            bloom = BloomFilter(
+                max(settings.EMAIL_FILTER_CAPACITY, len(emails) * 2),
+                settings.EMAIL_FILTER_ERROR_RATE,
+            )
+            for email in emails:
+                bloom.add(email)
+        except Exception:
+            with self.lock:
+                self.rebuilding = False
+            raise
+
+        with self.lock:
+            self.bloom = bloom
+            self.version = version
+            self.built_at = time.monotonic()
+            self.rebuilding = False
+        logger.info("email filter built %s", self.stats())
+        return bloom
+
+    def rebuild_in_background(self) -> None:
+        with self.lock:
+            if self.rebuilding:
+                return
+            self.rebuilding = True
+        threading.Thread(target=self.build_in_thread, daemon=True).start()
+
+    def build_in_thread(self) -> None:
+        try:
+            self.build()
+        finally:
+            # thread 마다 따로 연 DB 연결을 닫는다.
+            connections.close_all()
+
+    def add_email(self, email: str) -> None:
+        """새로 가입한 이메일을 filter에 추가하고 다른 프로세스에 알린다."""
+        try:
+            version = self.cache.incr(EMAIL_FILTER_VERSION_KEY)
+        except ValueError:
+            version = 1
+            self.cache.set(EMAIL_FILTER_VERSION_KEY, version, timeout=None)
+
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(email)
+            # 그 사이 다른 프로세스에서 생성된 유저가 없을 때만 version을 따라간다.
+            if self.version == version - 1:
+                self.version = version
+
+    def is_definitely_missing(self, email: str) -> bool:
+        """이메일이 가입되지 않은 것이 확실한지 확인한다.
+
+        Args:
+            email (str): 확인할 이메일
+
+        Returns:
+            bool: 가입되지 않은 것이 확실하면 True,
+                가입되었거나 확실하지 않으면 False (DB에서 확인해야 한다.)
+        """
+        if not settings.EMAIL_FILTER_ENABLED or not email:
+            return False
+        bloom = self.bloom
+        if bloom is None:
+            # 요청 처리 중에 전체 이메일을 읽지 않도록 백그라운드에서 만든다.
+            self.rebuild_in_background()
+            return False
+        if time.monotonic() - self.built_at > settings.EMAIL_FILTER_REBUILD_INTERVAL:
+            self.rebuild_in_background()
+
+        if email in bloom:
+            return False
+        if self.version != self.get_version():
+            self.rebuild_in_background()
+            return False
+        return True
+
+    def stats(self) -> dict:
+        bloom = self.bloom
+        if bloom is None:
+            return {}
+        return {
+            "emails": bloom.count,
+            "capacity": bloom.capacity,
+            "hash_count": bloom.hash_count,
+            "size_in_bytes": bloom.size_in_bytes,
+            "target_false_positive_rate": bloom.error_rate,
+            "false_positive_rate": round(bloom.false_positive_rate, 6),
+        }
+
+
+email_filter = EmailFilter()
+
+
+def add_created_user_email(sender, instance, created, **kwargs) -> None:
+    """User post_save signal 수신 시 새로 생성된 유저의 이메일을 filter에 추가한다.
+    가입 transaction이 commit되기 전에 version을 올리면 다른 프로세스가 그 사이
+    이메일이 빠진 filter를 최신으로 만들 수 있으므로 commit 후에 추가한다.
+    """
+    if created:
+        email = instance.email
+        transaction.on_commit(
+            lambda: email_filter.add_email(email),
+            using=instance._state.db,
+        )
@@ -0,0 +1,329 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import stat
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MAGIC = b"ASMCACHE"
+# magic, set 수, set 당 slot 수, slot 크기
+HEADER = struct.Struct("<8sIII")
+# key hash, 만료 시각(0이면 만료 없음), 마지막 사용 시각, key 길이(0이면 빈 slot), value 길이
+SLOT_HEADER = struct.Struct("<QdQHI")
+EMPTY_SLOT = SLOT_HEADER.pack(0, 0.0, 0, 0, 0)
+
+
+class SharedMemoryCache(BaseCache):
+    """한 서버의 worker 프로세스들이 같은 memory-mapped 파일을 공유하는 cache backend
+        LOCATION 파일 하나에 고정 크기 slot을 두고 모든 프로세스가 직접 읽고 쓴다.
+
+    - slot은 WAYS 개씩 set으로 묶고, key hash로 set을 고른다. set이 가득 차면
+      마지막 사용 시각이 가장 오래된 slot을 덮어쓴다. (set 단위 LRU)
+    - 모든 프로세스가 같은 slot을 보기 때문에 한 프로세스에서 delete, set 하면
+      다른 프로세스에서도 바로 반영된다.
+    - set 마다 파일의 해당 영역에 fcntl lock을 걸어서 프로세스 간 쓰기를 직렬화한다.
+    - key와 pickle된 value가 slot에 들어가지 않으면 저장하지 않는다.
+    - OPTIONS의 SLOTS, SLOT_SIZE, WAYS가 파일과 다르면 파일을 비우고 다시 만든다.
+    - 저장된 값을 unpickle 하므로 현재 유저의 파일만 사용한다. (open_file)
+
+    CACHES 예)
+        "shared": {
+            "BACKEND": "accounts.cache.SharedMemoryCache",
+            "LOCATION": "/srv/assignment/cache/shared",
+            "OPTIONS": {"SLOTS": 4096, "SLOT_SIZE": 512, "WAYS": 8},
+        }
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location: str, params: dict) -> None:
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.path = location
+        self.ways = options.get("WAYS", 8)
+        self.sets = max(1, options.get("SLOTS", 4096) // self.ways)
+        self.slot_size = options.get("SLOT_SIZE", 512)
+        self.capacity = self.slot_size - SLOT_HEADER.size
+        self.size = HEADER.size + self.sets * self.ways * self.slot_size
+        self.pid = None
+        self.fd = None
+        self.map = None
+        self.open_lock = threading.Lock()
+
+    def open(self) -> None:
+        """프로세스 별로 한 번 파일을 열고 mmap 한다. fork된 worker는 다시 연다."""
+        if self.pid == os.getpid():
+            return
+        with self.open_lock:
+            if self.pid == os.getpid():
+                return
+            if self.map is not None:
+                self.map.close()
+                os.close(self.fd)
+
+            fd = self.open_file()
+            header = HEADER.pack(MAGIC, self.sets, self.ways, self.slot_size)
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            try:
+                if os.pread(fd, HEADER.size, 0) != header:
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, self.size)
+                    os.pwrite(fd, header, 0)
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN)
+
+            self.fd = fd
+            self.map = mmap.mmap(fd, self.size)
+            # fork 시점에 다른 thread가 잡고 있던 lock을 이어받지 않는다.
+            self.thread_lock = threading.Lock()
+            self.pid = os.getpid()
+
+    def open_file(self) -> int:
+        """LOCATION 파일을 현재 유저만 읽고 쓸 수 있게 열거나 만든다.
+            다른 유저가 미리 만들어 둔 파일이나 symlink의 내용을 unpickle 하지 않도록
+            symlink는 따라가지 않고, 소유자가 다르거나 다른 유저가 쓸 수 있는 파일은 거부한다.
+
+        Raises:
+            PermissionError: 현재 유저가 소유한 일반 파일이 아니거나
+                그룹, 다른 유저에게 쓰기 권한이 있는 경우 발생
+
+        Returns:
+            int: 파일 descriptor
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd = os.open(
+            self.path,
+            os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC,
+            0o600,
+        )
+        status = os.fstat(fd)
+        if (
+            not stat.S_ISREG(status.st_mode)
+            or status.st_uid != os.getuid()
+            or status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        ):
+            os.close(fd)
+            raise PermissionError(
+                f"{self.path}는 현재 유저만 쓸 수 있는 파일이어야 합니다.",
+            )
+        return fd
+
+    @contextmanager
+    def lock(self, set_index: int = None):
+        """set 하나의 영역을 잠근다. set_index가 없으면 파일 전체를 잠근다."""
+        self.open()
+        if set_index is None:
+            start, length = 0, 0
+        else:
+            start, length = self.get_set_offset(set_index), self.ways * self.slot_size
+        # fcntl lock은 프로세스 단위라서 같은 프로세스의 thread는 따로 막는다.
+        with self.thread_lock:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, length, start)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, length, start)
+
+    def get_set_offset(self, set_index: int) -> int:
+        return HEADER.size + set_index * self.ways * self.slot_size
+
+    def locate(self, key, version: int = None) -> tuple:
+        """key의 bytes, hash, set 번호를 반환한다."""
+        key = self.make_and_validate_key(key, version=version).encode()
+        key_hash = int.from_bytes(
+            hashlib.blake2b(key, digest_size=8).digest(), "little"
+        )
+        return key, key_hash, key_hash % self.sets
+
+    def find(self, key: bytes, key_hash: int, set_index: int) -> tuple:
+        """set 안에서 key가 저장된 slot과 새로 저장할 slot을 찾는다.
+            lock 안에서 호출해야 한다.
+
+        Returns:
+            tuple: (key가 저장된 slot의 offset 또는 None, 빈 slot 또는 LRU slot의 offset)
+        """
+        now = time.time()
+        base = self.get_set_offset(set_index)
+        found = victim = None
+        victim_used_at = None
+        for way in range(self.ways):
+            offset = base + way * self.slot_size
+            stored_hash, expires, used_at, key_length, _ = SLOT_HEADER.unpack_from(
+                self.map, offset
+            )
+            if key_length == 0 or (expires and expires <= now):
+                # 빈 slot과 만료된 slot을 가장 먼저 사용한다.
+                used_at = -1
+            elif stored_hash == key_hash and self.read_key(offset, key_length) == key:
+                found = offset
+                continue
+            if victim is None or used_at < victim_used_at:
+                victim, victim_used_at = offset, used_at
+        if found is not None:
+            return found, found
+        return None, victim
+
+    def read_key(self, offset: int, key_length: int) -> bytes:
+        start = offset + SLOT_HEADER.size
+        return self.map[start : start + key_length]
+
+    def read_value(self, offset: int) -> bytes:
+        _, _, _, key_length, value_length = SLOT_HEADER.unpack_from(self.map, offset)
+        start = offset + SLOT_HEADER.size + key_length
+        return self.map[start : start + value_length]
+
+    def write(
+        self, offset: int, key: bytes, key_hash: int, value: bytes, expires: float
+    ) -> None:
+        start = offset + SLOT_HEADER.size
+        self.map[start : start + len(key) + len(value)] = key + value
+        SLOT_HEADER.pack_into(
+            self.map,
+            offset,
+            key_hash,
+            expires or 0.0,
+            time.monotonic_ns(),
+            len(key),
+            len(value),
+        )
+
+    def clear_slot(self, offset: int) -> None:
+        self.map[offset : offset + SLOT_HEADER.size] = EMPTY_SLOT
+
+    def touch_slot(self, offset: int) -> None:
+        """LRU 순서를 위해 slot의 마지막 사용 시각을 갱신한다."""
+        key_hash, expires, _, key_length, value_length = SLOT_HEADER.unpack_from(
+            self.map, offset
+        )
+        SLOT_HEADER.pack_into(
+            self.map,
+            offset,
+            key_hash,
+            expires,
+            time.monotonic_ns(),
+            key_length,
+            value_length,
+        )
+
+    def store(self, key, value, timeout, version, only_if_missing: bool) -> bool:
+        key, key_hash, set_index = self.locate(key, version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        expires = self.get_backend_timeout(timeout)
+        with self.lock(set_index):
+            found, target = self.find(key, key_hash, set_index)
+            if found is not None and only_if_missing:
+                return False
+            if len(key) + len(pickled) > self.capacity:
+                # 이전 값이 남아 있지 않도록 지운다.
+                if found is not None:
+                    self.clear_slot(found)
+                return False
+            self.write(target, key, key_hash, pickled, expires)
+        return True
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        return self.store(key, value, timeout, version, only_if_missing=True)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> None:
+        self.store(key, value, timeout, version, only_if_missing=False)
+
+    def get(self, key, default=None, version=None):
+        key, key_hash, set_index = self.locate(key, version)
+        with self.lock(set_index):
+            found, _ = self.find(key, key_hash, set_index)
+            if found is None:
+                return default
+            self.touch_slot(found)
+            pickled = self.read_value(found)
+        return pickle.loads(pickled)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        key, key_hash, set_index = self.locate(key, version)
+        with self.lock(set_index):
+            found, _ = self.find(key, key_hash, set_index)
+            if found is None:
+                return False
+            self.write(
+                found,
+                key,
+                key_hash,
+                self.read_value(found),
+                self.get_backend_timeout(timeout),
+            )
+        return True
+
+    def delete(self, key, version=None) -> bool:
+        key, key_hash, set_index = self.locate(key, version)
+        with self.lock(set_index):
+            found, _ = self.find(key, key_hash, set_index)
+            if found is None:
+                return False
+            self.clear_slot(found)
+        return True
+
+    def incr(self, key, delta=1, version=None):
+        """다른 프로세스의 incr와 겹치지 않도록 set lock 안에서 읽고 쓴다."""
+        key, key_hash, set_index = self.locate(key, version)
+        with self.lock(set_index):
+            found, _ = self.find(key, key_hash, set_index)
+            if found is None:
+                raise ValueError("Key '%s' not found" % key.decode())
+            expires = SLOT_HEADER.unpack_from(self.map, found)[1]
+            value = pickle.loads(self.read_value(found)) + delta
+            pickled = pickle.dumps(value, self.pickle_protocol)
+            if len(key) + len(pickled) > self.capacity:
+                self.clear_slot(found)
+                raise ValueError("Value for key '%s' is too large" % key.decode())
+            self.write(found, key, key_hash, pickled, expires)
+        return value
+
+    def update(self, key, function, timeout=DEFAULT_TIMEOUT, version=None):
+        """key의 값을 function(현재 값, 없으면 None)의 반환값으로 바꾼다.
+            다른 프로세스의 update와 겹치지 않도록 set lock 안에서 읽고 쓰므로
+            function은 짧게 끝나야 한다.
+
+        Raises:
+            ValueError: 새 값이 slot에 들어가지 않는 경우 발생
+
+        Returns:
+            새로 저장한 값
+        """
+        key, key_hash, set_index = self.locate(key, version)
+        expires = self.get_backend_timeout(timeout)
+        with self.lock(set_index):
+            found, target = self.find(key, key_hash, set_index)
+            current = None
+            if found is not None:
+                self.touch_slot(found)
+                current = pickle.loads(self.read_value(found))
+            value = function(current)
+            pickled = pickle.dumps(value, self.pickle_protocol)
+            if len(key) + len(pickled) > self.capacity:
+                if found is not None:
+                    self.clear_slot(found)
+                raise ValueError("Value for key '%s' is too large" % key.decode())
+            self.write(target, key, key_hash, pickled, expires)
+        return value
+
+    def clear(self) -> None:
+        with self.lock():
+            self.map[HEADER.size :] = bytes(self.size - HEADER.size)
+
+    def stats(self) -> dict:
+        """사용 중인 slot 수와 전체 slot 수를 반환한다. (만료된 slot은 사용 중으로 센다.)"""
+        self.open()
+        total = self.sets * self.ways
+        used = 0
+        for index in range(total):
+            offset = HEADER.size + index * self.slot_size
+            if SLOT_HEADER.unpack_from(self.map, offset)[3]:
+                used += 1
+        return {"used": used, "total": total, "slot_size": self.slot_size}
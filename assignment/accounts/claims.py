@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import User
+from accounts.sharding import get_user_databases
+
+
+def get_claimable_condition(reviewer_id: int, now) -> Q:
+    """점유되지 않았거나, 점유가 만료되었거나, 이미 reviewer가 점유한 유저"""
+    return (
+        Q(claim_expires_at__isnull=True)
+        | Q(claim_expires_at__lte=now)
+        | Q(claimed_by=reviewer_id)
+    )
+
+
+def claim_batch(using: str, reviewer_id: int, batch_size: int, now) -> list:
+    """using DB의 가입 대기 유저를 batch_size 명까지 reviewer에게 점유시킨다.
+        - SKIP LOCKED를 지원하는 DB는 다른 reviewer가 잠근 행을 건너뛴다.
+        - 점유는 조건부 UPDATE로 기록하므로 SQLite처럼 SKIP LOCKED가 없어도
+          같은 유저가 두 reviewer에게 동시에 점유되지 않는다.
+
+    Returns:
+        list: 점유한 유저의 pk 목록
+    """
+    claimable = get_claimable_condition(reviewer_id, now)
+    expires_at = now + timedelta(seconds=settings.SIGNUP_QUEUE_LEASE_SECONDS)
+
+    with transaction.atomic(using=using):
+        candidate_ids = list(
+            User.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .filter(claimable, state=User.StateChoices.AWAIT, is_superuser=False)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size],
+        )
+        if not candidate_ids:
+            return []
+
+        User.objects.using(using).filter(claimable, pk__in=candidate_ids).update(
+            claimed_by=reviewer_id,
+            claim_expires_at=expires_at,
+        )
+        return list(
+            User.objects.using(using)
+            .filter(
+                pk__in=candidate_ids,
+                claimed_by=reviewer_id,
+                claim_expires_at=expires_at,
+            )
+            .values_list("pk", flat=True),
+        )
+
+
+def claim_signups(reviewer_id: int, batch_size: int = None) -> list:
+    """reviewer에게 다음 검토 대상 유저를 점유시킨다.
+        reviewer가 이미 점유한 유저는 점유 기간을 연장해서 다시 돌려준다.
+
+    Args:
+        reviewer_id (int): 검토하는 임직원의 유저 id
+        batch_size (int): 점유할 최대 유저 수 (기본값: SIGNUP_QUEUE_BATCH_SIZE)
+
+    Returns:
+        list: pk 순서로 정렬된 점유한 유저 목록
+    """
+    batch_size = batch_size or settings.SIGNUP_QUEUE_BATCH_SIZE
+    now = timezone.now()
+
+    users = []
+    for using in get_user_databases():
+        claimed_ids = claim_batch(using, reviewer_id, batch_size - len(users), now)
+        users.extend(User.objects.using(using).filter(pk__in=claimed_ids))
+        if len(users) >= batch_size:
+            break
+    return sorted(users, key=lambda user: user.pk)
+
+
+def is_claimed_by_other(user: User, reviewer_id: int) -> bool:
+    """다른 reviewer가 점유 중인 유저인지 확인한다."""
+    return (
+        user.claimed_by is not None
+        and user.claimed_by != reviewer_id
+        and user.claim_expires_at is not None
+        and user.claim_expires_at > timezone.now()
+    )
+
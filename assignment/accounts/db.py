@@ -0,0 +1,73 @@
+import threading
+
+from django.conf import settings
+
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# 한 프로세스 안의 SQLite 쓰기를 하나씩 처리하기 위한 lock
+write_lock = threading.RLock()
+
+
+def get_sqlite_pragmas() -> dict:
+    """settings의 SQLITE_PRAGMAS를 반환한다. 설정하지 않으면 pragma를 적용하지 않는다.
+
+    Returns:
+        dict: pragma 이름과 값
+    """
+    return dict(getattr(settings, "SQLITE_PRAGMAS", {}))
+
+
+def is_write_statement(sql: str) -> bool:
+    """sql이 테이블에 쓰기를 하는 문장인지 확인한다.
+
+    Args:
+        sql (str): 실행할 sql
+
+    Returns:
+        bool: INSERT, UPDATE, DELETE, REPLACE 문이면 True
+    """
+    return sql.lstrip().upper().startswith(WRITE_STATEMENTS)
+
+
+def serialize_writes(execute, sql, params, many, context):
+    """SQLite 쓰기가 "database is locked"로 실패하지 않도록 쓰기 순서를 정한다.
+
+    - autocommit 상태의 쓰기 쿼리는 write_lock으로 감싸서 프로세스 안에서는
+      한 번에 하나의 쓰기만 SQLite로 보낸다.
+    - transaction.atomic()이 시작할 때 실행하는 BEGIN은 BEGIN IMMEDIATE로 바꿔서
+      transaction을 시작할 때 쓰기 lock을 잡는다. 기본(DEFERRED) transaction은 읽은 뒤
+      쓰기로 바뀔 때 다른 연결이 먼저 쓰고 있으면 busy_timeout을 기다리지 않고 바로
+      실패하지만, BEGIN IMMEDIATE는 시작할 때 busy_timeout 만큼 기다린다.
+      (WAL 모드에서는 읽기만 하는 연결을 막지 않는다.)
+    """
+    if sql == "BEGIN":
+        return execute("BEGIN IMMEDIATE", params, many, context)
+
+    connection = context["connection"]
+    if connection.in_atomic_block or not is_write_statement(sql):
+        return execute(sql, params, many, context)
+
+    with write_lock:
+        return execute(sql, params, many, context)
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs) -> None:
+    """connection_created signal 수신 시 SQLite 연결에 성능 프로필을 적용한다.
+        - WAL journal, synchronous=NORMAL, busy_timeout, mmap_size, cache_size
+        - settings.SQLITE_WRITE_QUEUE가 True이면 쓰기 직렬화 wrapper를 등록한다.
+
+    Args:
+        sender: connection의 DatabaseWrapper class
+        connection: 새로 생성된 DatabaseWrapper
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value};")
+
+    if getattr(settings, "SQLITE_WRITE_QUEUE", False):
+        if serialize_writes not in connection.execute_wrappers:
+            connection.execute_wrappers.append(serialize_writes)
@@ -0,0 +1,96 @@
+from django.db import transaction
+
+from accounts.models import Employee, EmployeeDirectory, User
+
+
+# 이 필드가 저장될 때만 읽기 모델을 갱신한다.
+DIRECTORY_EMPLOYEE_FIELDS = {"user", "authorization_grade", "is_resigned"}
+DIRECTORY_USER_FIELDS = {"email", "username", "last_login"}
+
+
+def build_row(employee: Employee, user: User) -> EmployeeDirectory:
+    return EmployeeDirectory(
+        id=employee.pk,
+        user_id=user.pk,
+        email=user.email,
+        username=user.username,
+        authorization_grade=employee.authorization_grade,
+        is_resigned=employee.is_resigned,
+        joined_at=user.created_at,
+        last_login=user.last_login,
+    )
+
+
+def sync_employee(employee: Employee) -> None:
+    """Employee와 같은 DB에 읽기 모델 행을 저장한다. (UPDATE 후 없으면 INSERT)
+
+    Args:
+        employee (Employee): 저장된 임직원
+    """
+    using = employee._state.db
+    user = User.objects.using(using).get(pk=employee.user_id)
+    build_row(employee, user).save(using=using)
+
+
+def sync_user(user: User) -> None:
+    """임직원으로 등록된 유저의 이메일, 이름, 최근 로그인일시를 읽기 모델에 반영한다.
+    아직 승인되지 않은 유저는 읽기 모델 행이 없으므로 아무것도 갱신하지 않는다.
+
+    Args:
+        user (User): 저장된 유저
+    """
+    EmployeeDirectory.objects.using(user._state.db).filter(user_id=user.pk).update(
+        email=user.email,
+        username=user.username,
+        last_login=user.last_login,
+    )
+
+
+def is_relevant_save(update_fields, fields: set) -> bool:
+    return update_fields is None or bool(fields.intersection(update_fields))
+
+
+def sync_saved_employee(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Employee post_save signal 수신 시 읽기 모델을 갱신한다."""
+    if raw or not is_relevant_save(update_fields, DIRECTORY_EMPLOYEE_FIELDS):
+        return
+    sync_employee(instance)
+
+
+def sync_saved_user(sender, instance, update_fields=None, raw=False, **kwargs):
+    """User post_save signal 수신 시 읽기 모델을 갱신한다."""
+    if raw or not is_relevant_save(update_fields, DIRECTORY_USER_FIELDS):
+        return
+    sync_user(instance)
+
+
+def delete_employee_row(sender, instance, **kwargs):
+    """Employee post_delete signal 수신 시 (User 삭제로 인한 cascade 포함) 행을 지운다."""
+    EmployeeDirectory.objects.using(instance._state.db).filter(pk=instance.pk).delete()
+
+
+def rebuild_directory(using: str, batch_size: int = 1000) -> int:
+    """using DB의 읽기 모델을 Employee, User로부터 다시 만든다.
+
+    Args:
+        using (str): database alias
+        batch_size (int): 한 번에 읽고 저장할 행 수
+
+    Returns:
+        int: 저장한 행 수
+    """
+    count = 0
+    with transaction.atomic(using=using):
+        EmployeeDirectory.objects.using(using).all().delete()
+        employees = Employee.objects.using(using).select_related("user").order_by("pk")
+        rows = []
+        for employee in employees.iterator(chunk_size=batch_size):
+            rows.append(build_row(employee, employee.user))
+            if len(rows) >= batch_size:
+                EmployeeDirectory.objects.using(using).bulk_create(rows)
+                count += len(rows)
+                rows = []
+        if rows:
+            EmployeeDirectory.objects.using(using).bulk_create(rows)
+            count += len(rows)
+    return count
@@ -0,0 +1,280 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from http.cookies import SimpleCookie
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import transaction
+from django.db.models import Q
+from django.http import HttpRequest
+
+from accounts.models import Employee, OutboxEvent
+from accounts.outbox import serialize_event
+from accounts.sharding import get_user_databases
+
+
+logger = logging.getLogger(__name__)
+
+# 가입 대기 목록 화면에 전달하는 이벤트 종류
+SIGNUP_EVENT_TYPES = [
+    OutboxEvent.EventTypeChoices.SIGNUP_CREATED,
+    OutboxEvent.EventTypeChoices.SIGNUP_APPROVED,
+    OutboxEvent.EventTypeChoices.SIGNUP_REJECTED,
+]
+
+
+def format_message(event: dict) -> bytes:
+    """이벤트를 Server-Sent Events 형식의 메시지로 바꾼다."""
+    data = json.dumps(
+        {
+            "user_id": event["user_id"],
+            "created_at": event["created_at"],
+            **event["payload"],
+        },
+        ensure_ascii=False,
+    )
+    return f"event: {event['event_type']}\ndata: {data}\n\n".encode()
+
+
+class Broker:
+    """프로세스 안의 구독자(열려 있는 가입 대기 목록 화면)에게 이벤트를 전달한다.
+    메시지는 이벤트마다 한 번만 만들고, 구독자마다 크기가 제한된 queue에 넣는다.
+    publish는 view가 실행되는 thread에서, 구독은 ASGI event loop에서 일어나므로
+    queue에는 call_soon_threadsafe로 넣는다.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._poller = None
+
+    def subscribe(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=settings.SIGNUP_EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = loop
+        if settings.SIGNUP_EVENTS_POLL_INTERVAL and (
+            self._poller is None or self._poller.done()
+        ):
+            self._poller = loop.create_task(poll_outbox(self))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, message: bytes) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                # event loop가 이미 닫힌 구독자
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: bytes) -> None:
+        # 읽지 못하고 밀린 구독자는 가장 오래된 메시지를 버린다.
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+broker = Broker()
+
+
+def publish_saved_event(sender, instance: OutboxEvent, created: bool, **kwargs) -> None:
+    """post_save receiver, 가입 관련 outbox 이벤트를 transaction이 commit된 후
+    프로세스 안의 구독자에게 전달한다. SIGNUP_EVENTS_POLL_INTERVAL을 사용하면
+    poller가 DB에서 읽어 전달하므로 여기서는 전달하지 않는다.
+    """
+    event = instance
+    if not created or event.event_type not in SIGNUP_EVENT_TYPES:
+        return
+    if settings.SIGNUP_EVENTS_POLL_INTERVAL:
+        return
+
+    message = format_message(serialize_event(event))
+    transaction.on_commit(
+        lambda: broker.publish(message),
+        using=event._state.db,
+    )
+
+
+def get_last_event_ids() -> dict:
+    last_ids = {}
+    for using in get_user_databases():
+        last = OutboxEvent.objects.using(using).order_by("-pk").first()
+        last_ids[using] = last.pk if last else 0
+    return last_ids
+
+
+def fetch_new_events(last_ids: dict, gaps: dict) -> list:
+    """database 별로 last_ids 이후에 저장된 가입 관련 이벤트를 읽는다. last_ids를 갱신한다.
+        pk는 INSERT 할 때 정해지고 commit 순서는 다를 수 있어서, 이미 읽은 pk보다 작은
+        pk의 이벤트가 나중에 commit될 수 있다. 건너뛴 pk는 gaps에 기록해두고
+        SIGNUP_EVENTS_GAP_TIMEOUT 초 동안 다시 읽는다. 그 뒤에는 rollback된 것으로 본다.
+
+    Args:
+        last_ids (dict): database 별 마지막으로 읽은 pk
+        gaps (dict): database 별 건너뛴 pk와 처음 건너뛴 시각
+
+    Returns:
+        list: serialize_event로 변환된 가입 관련 이벤트 목록
+    """
+    now = time.monotonic()
+    events = []
+    for using, last_id in last_ids.items():
+        pending = gaps.setdefault(using, {})
+        for pk, skipped_at in list(pending.items()):
+            if now - skipped_at > settings.SIGNUP_EVENTS_GAP_TIMEOUT:
+                del pending[pk]
+
+        # 건너뛴 pk를 알 수 있도록 모든 종류의 이벤트를 읽고 가입 관련 이벤트만 전달한다.
+        rows = list(
+            OutboxEvent.objects.using(using)
+            .filter(Q(pk__gt=last_id) | Q(pk__in=list(pending)))
+            .order_by("pk")[: settings.SIGNUP_EVENTS_QUEUE_SIZE],
+        )
+        for row in rows:
+            if row.pk > last_id:
+                # 한 번에 기록하는 gap은 queue 크기로 제한한다.
+                first = max(last_id + 1, row.pk - settings.SIGNUP_EVENTS_QUEUE_SIZE)
+                for pk in range(first, row.pk):
+                    pending[pk] = now
+                last_id = row.pk
+            else:
+                pending.pop(row.pk, None)
+            if row.event_type in SIGNUP_EVENT_TYPES:
+                events.append(serialize_event(row))
+        last_ids[using] = last_id
+    return events
+
+
+async def poll_outbox(broker: Broker) -> None:
+    """여러 서버에서 실행할 때 다른 서버에서 일어난 이벤트도 전달하도록
+    SIGNUP_EVENTS_POLL_INTERVAL 마다 outbox 테이블을 읽는다. 구독자가 없으면 멈춘다.
+    """
+    last_ids = await sync_to_async(get_last_event_ids)()
+    gaps = {}
+    while broker.subscriber_count:
+        await asyncio.sleep(settings.SIGNUP_EVENTS_POLL_INTERVAL)
+        try:
+            events = await sync_to_async(fetch_new_events)(last_ids, gaps)
+        except Exception:
+            logger.exception("signup event polling failed")
+            continue
+        for event in events:
+            broker.publish(format_message(event))
+
+
+def can_subscribe(session_key: str) -> bool:
+    """session의 유저가 가입 승인 권한이 있는 임직원인지 확인한다."""
+    if not session_key:
+        return False
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    user = get_user(request)
+    if not user.is_authenticated or user.state != "AP":
+        return False
+    employee = Employee.objects.filter(user_id=user.id).last()
+    return bool(employee and employee.signup_approval_authorization)
+
+
+def get_session_key(scope: dict) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            cookie = SimpleCookie(value.decode("latin-1"))
+            if settings.SESSION_COOKIE_NAME in cookie:
+                return cookie[settings.SESSION_COOKIE_NAME].value
+    return None
+
+
+async def wait_for_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def stream_signup_events(scope: dict, receive, send) -> None:
+    """가입 신청, 승인, 거절 이벤트를 text/event-stream 으로 계속 보낸다.
+    보낼 이벤트가 없으면 SIGNUP_EVENTS_KEEPALIVE 초마다 주석 한 줄을 보내 연결을 유지한다.
+    """
+    if not await sync_to_async(can_subscribe)(get_session_key(scope)):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 403,
+                "headers": [(b"content-type", b"text/plain")],
+            },
+        )
+        await send({"type": "http.response.body", "body": b"Forbidden"})
+        return
+
+    queue = broker.subscribe()
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            },
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": b"retry: 3000\n\n",
+                "more_body": True,
+            },
+        )
+        while not disconnected.done():
+            message = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait(
+                {message, disconnected},
+                timeout=settings.SIGNUP_EVENTS_KEEPALIVE,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if message in done:
+                body = message.result()
+            else:
+                message.cancel()
+                if disconnected.done():
+                    break
+                body = b": keepalive\n\n"
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+    finally:
+        broker.unsubscribe(queue)
+        disconnected.cancel()
+
+
+class SignupEventsMiddleware:
+    """SIGNUP_EVENTS_PATH 요청은 직접 처리하고, 나머지는 Django ASGI application에 넘긴다.
+    Django view로 처리하면 연결마다 thread 하나를 계속 차지하므로 ASGI 단에서 처리한다.
+    """
+
+    def __init__(self, application) -> None:
+        self.application = application
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and scope["path"] == settings.SIGNUP_EVENTS_PATH
+        ):
+            await stream_signup_events(scope, receive, send)
+            return
+        await self.application(scope, receive, send)
@@ -1,11 +1,13 @@
 import re
 
-from django.contrib.auth.hashers import check_password
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.exceptions import ValidationError
 from django import forms
 
 from accounts.models import User, Employee, Resignation
+from accounts.bloom import email_filter
+from accounts.hashers import verify_password
+from accounts.instrumentation import timed
 
 
 class SignUpForm(forms.Form):
@@ -50,7 +52,10 @@ class SignUpForm(forms.Form):
         match = "^[a-zA-Z0-9_]+@[a-zA-Z0-9_]+\.[a-zA-Z0-9.]+$"
         validation = re.compile(match)
 
-        if User.objects.filter(email=email).exists():
+        if (
+            not email_filter.is_definitely_missing(email)
+            and User.objects.filter(email=email).exists()
+        ):
             raise ValidationError("이미 존재하는 이메일입니다.")
 
         if validation.match(str(email)) is None:
@@ -137,6 +142,7 @@ class LoginForm(forms.Form):
         Raises:
             ValidationError: 입력한 비밀번호가 입려한 이메일로 저장된 유저의 비밀번호가 다를 경우 발생한다.
             ValidationError: 입력한 이메일이 가입되지 않은 이메일이면 발생한다.
+            - email_filter로 가입되지 않은 것이 확실한 이메일은 DB를 조회하지 않는다.
 
         Returns:
             dict: LoginForm 의 유효성 검증에 통과한 전체 데이터를 반환한다.
@@ -146,8 +152,14 @@ class LoginForm(forms.Form):
         password = cleaned_data.get("password")
 
         try:
+            if email_filter.is_definitely_missing(email):
+                raise ObjectDoesNotExist
             user = User.objects.filter(email=email).last()
-            if not check_password(password, user.get_password()):
+            if user is None:
+                raise ObjectDoesNotExist
+            with timed("hash"):
+                is_correct_password = verify_password(user, password)
+            if not is_correct_password:
                 raise ValidationError({"password": "비밀번호가 잘못되었습니다."})
         except ObjectDoesNotExist:
             raise ValidationError({"email": "가입되지 않은 이메일입니다."})
@@ -169,6 +181,7 @@ class UserForm(forms.ModelForm):
     )
 
     state = forms.CharField(label="상태", required=False)
+    user_version = forms.IntegerField(widget=forms.HiddenInput, required=False)
 
     class Meta:
         model = User
@@ -181,6 +194,11 @@ class UserForm(forms.ModelForm):
             "reason_for_refusal",
         ]
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # 화면을 열었을 때의 version, 저장 시 UPDATE ... WHERE version = ? 에 사용한다.
+        self.fields["user_version"].initial = self.instance.version
+
     def clean_reason_for_refusal(self) -> str:
         """회원가입 신청 거절 시 거절 사유에 대한 유효성 검증을 실시한다.
             가입 대기 목록에서 상세 화면 상황 중 승인을 거절할 시
@@ -214,6 +232,7 @@ class EmployeeForm(forms.ModelForm):
         initial={"authorization_choices": ""},
         required=False,
     )
+    employee_version = forms.IntegerField(widget=forms.HiddenInput, required=False)
 
     class Meta:
         model = Employee
@@ -226,6 +245,11 @@ class EmployeeForm(forms.ModelForm):
             "is_resigned",
         ]
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # 화면을 열었을 때의 version, 저장 시 UPDATE ... WHERE version = ? 에 사용한다.
+        self.fields["employee_version"].initial = self.instance.version
+
 
 class ResignationForm(forms.ModelForm):
     resigned_at = forms.DateTimeField(
@@ -245,6 +269,29 @@ class ResignationForm(forms.ModelForm):
         model = Resignation
         fields = ["reason_for_resignation", "resigned_at"]
 
+    def __init__(self, *args, resigned_user: Employee = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # 탈퇴시킬 임직원, 상세 화면에서 이미 조회한 Employee를 전달받는다.
+        self.resigned_user = resigned_user
+
+    def is_resigned(self) -> bool:
+        """탈퇴시킬 임직원이 이미 탈퇴했는지 확인한다.
+            Resignation은 임직원 당 하나(OneToOneField)이므로 임직원의 pk로
+            unique index를 한 번만 조회하고, 퇴사 유무가 이미 True이면 조회하지 않는다.
+
+        Returns:
+            bool: 이미 탈퇴한 임직원이면 True
+        """
+        if self.instance.pk is not None:
+            return True
+        if self.resigned_user is None:
+            return False
+        if self.resigned_user.is_resigned:
+            return True
+        return Resignation.objects.filter(
+            resigned_user_id=self.resigned_user.pk,
+        ).exists()
+
     def clean_reason_for_resignation(self) -> str:
         """퇴사 사유에 대해 유효성 검증을 실시한다.
             회원 목록의 상세 화면에서 임직원을 퇴사시킬 시 퇴사 사유를 입력 되었는지
@@ -276,17 +323,7 @@ class ResignationForm(forms.ModelForm):
         if "resignation-btn" in self.data:
             cleaned_data = super(ResignationForm, self).clean()
 
-            user = User.objects.filter(
-                name=self.data.get("name"),
-                phone=self.data.get("phone"),
-            ).last()
-
-            employee = Employee.objects.filter(user_id=user.id).last()
-            resigned_user = Resignation.objects.filter(
-                resigned_user_id=employee.id,
-            ).last()
-
-            if resigned_user:
+            if self.is_resigned():
                 raise ValidationError({"reason_for_resignation": "이미 탈퇴된 유저입니다."})
 
             return cleaned_data
@@ -0,0 +1,244 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from accounts.models import (
+    ArchivedAccount,
+    Employee,
+    OutboxEvent,
+    Resignation,
+    SignupFunnelDaily,
+    SignupFunnelTotal,
+    User,
+)
+from accounts.sharding import get_user_databases
+
+
+DAILY_FIELDS = ("signed_up", "approved", "rejected", "resigned")
+TOTAL_STATES = [choice.value for choice in SignupFunnelTotal.StateChoices]
+
+
+def increment_daily(using: str, field: str, amount: int = 1) -> None:
+    """오늘 행의 field 값을 UPDATE ... SET field = field + amount 로 증가시킨다.
+    오늘 행이 없으면 만들고, 동시에 만들어진 경우 다시 UPDATE 한다.
+    """
+    day = timezone.localdate()
+    queryset = SignupFunnelDaily.objects.using(using).filter(day=day)
+    if queryset.update(**{field: F(field) + amount}):
+        return
+    try:
+        with transaction.atomic(using=using):
+            SignupFunnelDaily.objects.using(using).create(day=day, **{field: amount})
+    except IntegrityError:
+        queryset.update(**{field: F(field) + amount})
+
+
+def increment_total(using: str, state: str, amount: int = 1) -> None:
+    """state 행의 count 값을 amount 만큼 증가(음수면 감소)시킨다."""
+    queryset = SignupFunnelTotal.objects.using(using).filter(state=state)
+    if queryset.update(count=F("count") + amount):
+        return
+    try:
+        with transaction.atomic(using=using):
+            SignupFunnelTotal.objects.using(using).create(state=state, count=amount)
+    except IntegrityError:
+        queryset.update(count=F("count") + amount)
+
+
+def record_signup(user: User) -> None:
+    """가입 신청 시 호출한다. 호출하는 쪽에서 transaction.atomic으로 감싸야 한다."""
+    using = user._state.db or "default"
+    increment_daily(using, "signed_up")
+    increment_total(using, User.StateChoices.AWAIT)
+
+
+def record_state_change(user: User, previous_state: str) -> None:
+    """가입 승인, 거절 시 호출한다. 호출하는 쪽에서 transaction.atomic으로 감싸야 한다.
+
+    Args:
+        user (User): 상태가 변경된 유저 (user.state는 변경 후 상태)
+        previous_state (str): 변경 전 상태
+    """
+    record_state_changes(user._state.db or "default", user.state, [previous_state])
+
+
+def record_state_changes(using: str, state: str, previous_states: list) -> None:
+    """여러 유저가 같은 상태로 바뀐 경우 counter를 상태 별로 한 번씩만 갱신한다.
+    호출하는 쪽에서 transaction.atomic으로 감싸야 한다.
+
+    Args:
+        using (str): database alias
+        state (str): 변경 후 상태
+        previous_states (list): 유저 별 변경 전 상태
+    """
+    if not previous_states:
+        return
+    if state == User.StateChoices.APPROVAL:
+        increment_daily(using, "approved", len(previous_states))
+    elif state == User.StateChoices.REJECTED:
+        increment_daily(using, "rejected", len(previous_states))
+
+    moved = Counter(
+        previous_state for previous_state in previous_states if previous_state != state
+    )
+    for previous_state, count in moved.items():
+        increment_total(using, previous_state, -count)
+    if moved:
+        increment_total(using, state, sum(moved.values()))
+
+
+def record_resignation(employee: Employee, count: int = 1) -> None:
+    """퇴사 처리 시 호출한다. 호출하는 쪽에서 transaction.atomic으로 감싸야 한다.
+
+    Args:
+        employee (Employee): 퇴사한 임직원, 여러 명이면 그 중 한 명
+        count (int): 같은 database에서 함께 퇴사한 임직원 수
+    """
+    using = employee._state.db or "default"
+    increment_daily(using, "resigned", count)
+    increment_total(using, SignupFunnelTotal.StateChoices.RESIGNED, count)
+
+
+def get_totals() -> dict:
+    """모든 database의 상태 별 유저 수를 합친다.
+
+    Returns:
+        dict: {"AW": 3, "AP": 10, "RJ": 1, "RS": 2}
+    """
+    totals = dict.fromkeys(TOTAL_STATES, 0)
+    for using in get_user_databases():
+        for state, count in SignupFunnelTotal.objects.using(using).values_list(
+            "state",
+            "count",
+        ):
+            totals[state] += count
+    return totals
+
+
+def get_daily(days: int) -> list:
+    """최근 days 일의 일자 별 건수를 모든 database에서 합친다.
+
+    Returns:
+        list: 최근 일자부터 정렬된 {"day": date, "signed_up": int, ...} 목록
+    """
+    today = timezone.localdate()
+    rows = {
+        today - timedelta(days=offset): dict.fromkeys(DAILY_FIELDS, 0)
+        for offset in range(days)
+    }
+    for using in get_user_databases():
+        queryset = SignupFunnelDaily.objects.using(using).filter(
+            day__gt=today - timedelta(days=days),
+        )
+        for daily in queryset:
+            for field in DAILY_FIELDS:
+                rows[daily.day][field] += getattr(daily, field)
+    return [{"day": day, **rows[day]} for day in sorted(rows, reverse=True)]
+
+
+def count_by_day(queryset, field: str) -> dict:
+    return dict(
+        queryset.annotate(day=TruncDate(field))
+        .values("day")
+        .annotate(count=Count("pk"))
+        .values_list("day", "count"),
+    )
+
+
+def reconcile(using: str, days: int = None) -> dict:
+    """원본 테이블을 집계해서 using DB의 counter를 바로잡는다.
+        승인 건수는 승인 일시가 따로 없으므로 SIGNUP_APPROVED outbox 이벤트로 센다.
+        ArchivedAccount로 옮겨진 거절 유저와 퇴사자도 함께 센다.
+
+    Args:
+        using (str): database alias
+        days (int): 최근 며칠의 일자 별 건수를 다시 계산할지. None이면 전체 기간
+
+    Returns:
+        dict: 값이 달라서 고친 counter (예: {"total:AW": (3, 4), "2026-10-19:approved": (1, 2)})
+    """
+    users = User.objects.using(using).filter(is_superuser=False)
+    truth_totals = {
+        state: users.filter(state=state).count() for state in User.StateChoices.values
+    }
+    truth_totals[SignupFunnelTotal.StateChoices.RESIGNED] = (
+        Employee.objects.using(using).filter(is_resigned=True).count()
+    )
+    archived = ArchivedAccount.objects.using(using)
+    archived_rejected = archived.filter(
+        reason=ArchivedAccount.ReasonChoices.REJECTED,
+    ).count()
+    archived_resigned = archived.filter(
+        reason=ArchivedAccount.ReasonChoices.RESIGNED,
+    ).count()
+    truth_totals[User.StateChoices.REJECTED] += archived_rejected
+    truth_totals[User.StateChoices.APPROVAL] += archived_resigned
+    truth_totals[SignupFunnelTotal.StateChoices.RESIGNED] += archived_resigned
+
+    since = None
+    if days is not None:
+        since = timezone.localdate() - timedelta(days=days - 1)
+
+    sources = [
+        ("signed_up", users, "created_at"),
+        ("signed_up", archived, "joined_at"),
+        (
+            "approved",
+            OutboxEvent.objects.using(using).filter(
+                event_type=OutboxEvent.EventTypeChoices.SIGNUP_APPROVED,
+            ),
+            "created_at",
+        ),
+        ("rejected", users.filter(rejected_at__isnull=False), "rejected_at"),
+        ("rejected", archived.filter(rejected_at__isnull=False), "rejected_at"),
+        (
+            "resigned",
+            Resignation.objects.using(using).filter(resigned_at__isnull=False),
+            "resigned_at",
+        ),
+        ("resigned", archived.filter(resigned_at__isnull=False), "resigned_at"),
+    ]
+    truth_daily = {}
+    for field, queryset, date_field in sources:
+        if since is not None:
+            queryset = queryset.filter(**{f"{date_field}__date__gte": since})
+        for day, count in count_by_day(queryset, date_field).items():
+            truth_daily.setdefault(day, dict.fromkeys(DAILY_FIELDS, 0))[field] += count
+
+    corrected = {}
+    with transaction.atomic(using=using):
+        for state, count in truth_totals.items():
+            total, _ = SignupFunnelTotal.objects.using(using).get_or_create(state=state)
+            if total.count != count:
+                corrected[f"total:{state}"] = (total.count, count)
+                total.count = count
+                total.save(update_fields=["count"])
+
+        dailies = SignupFunnelDaily.objects.using(using).select_for_update()
+        if since is not None:
+            dailies = dailies.filter(day__gte=since)
+        for daily in dailies:
+            truth = truth_daily.pop(daily.day, dict.fromkeys(DAILY_FIELDS, 0))
+            changed = [
+                field for field in DAILY_FIELDS if getattr(daily, field) != truth[field]
+            ]
+            for field in changed:
+                corrected[f"{daily.day}:{field}"] = (
+                    getattr(daily, field),
+                    truth[field],
+                )
+                setattr(daily, field, truth[field])
+            if changed:
+                daily.save(update_fields=changed)
+
+        for day, truth in truth_daily.items():
+            for field in DAILY_FIELDS:
+                if truth[field]:
+                    corrected[f"{day}:{field}"] = (0, truth[field])
+            SignupFunnelDaily.objects.using(using).create(day=day, **truth)
+
+    return corrected
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password
+
+from accounts.metrics import registry
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """반복 횟수를 PASSWORD_HASH_ITERATIONS 설정으로 정하는 PBKDF2-SHA256 hasher
+        Django 버전에 따라 바뀌는 기본 반복 횟수를 그대로 쓰지 않고,
+        hasher_benchmark 명령어로 서버에서 측정한 값을 사용한다.
+
+    - algorithm이 Django의 PBKDF2PasswordHasher와 같아서 기존 비밀번호를 그대로 확인한다.
+    - 저장된 반복 횟수가 설정과 다르면 must_update가 True가 되어
+      로그인 성공 시 다시 해싱된다. (verify_password)
+    """
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_HASH_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+
+def verify_password(user, raw_password: str) -> bool:
+    """비밀번호를 확인하고, 저장된 hash의 알고리즘이나 반복 횟수가 현재 설정과 다르면
+        현재 설정으로 다시 해싱해서 password 컬럼만 저장한다.
+        비밀번호가 바뀐 것이 아니므로 version은 올리지 않는다. (수정 화면과 충돌하지 않는다.)
+
+    Args:
+        user (User): 로그인하려는 유저
+        raw_password (str): 입력된 비밀번호
+
+    Returns:
+        bool: 비밀번호가 맞으면 True
+    """
+
+    def setter(raw_password: str) -> None:
+        # AbstractBaseUser.check_password의 setter와 같지만 version을 올리지 않는다.
+        user.set_password(raw_password)
+        user._password = None
+        user.save_without_version(update_fields=["password"])
+        registry.inc("password_rehash_total")
+
+    return check_password(raw_password, user.password, setter)
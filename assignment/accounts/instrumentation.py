@@ -0,0 +1,96 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+from django.template.backends.django import DjangoTemplates
+
+
+# 현재 요청의 RequestTimings. 샘플링되지 않은 요청이면 None
+current_timings = contextvars.ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    """한 요청 동안 구간 별 소요 시간(ms)과 SQL 실행 횟수를 모은다."""
+
+    def __init__(self) -> None:
+        self.durations = {}
+        self.query_count = 0
+        self.started_at = time.perf_counter()
+
+    def add(self, name: str, duration: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + duration * 1000
+
+    @property
+    def total(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def as_server_timing(self) -> str:
+        """Server-Timing 헤더 값으로 변환한다.
+
+        Returns:
+            str: 예) db;dur=1.20;desc="3 queries", tpl;dur=4.10, total;dur=9.80
+        """
+        metrics = []
+        for name, duration in self.durations.items():
+            if name == "db":
+                metrics.append(
+                    f'db;dur={duration:.2f};desc="{self.query_count} queries"',
+                )
+            else:
+                metrics.append(f"{name};dur={duration:.2f}")
+        metrics.append(f"total;dur={self.total:.2f}")
+        return ", ".join(metrics)
+
+
+@contextmanager
+def timed(name: str):
+    """샘플링된 요청이면 with 블록의 소요 시간을 name 구간에 더한다.
+
+    Args:
+        name (str): Server-Timing 구간 이름 (예: tpl, hash)
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started_at)
+
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper로 등록되어 SQL 실행 횟수와 시간을 기록한다."""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    timings.query_count += 1
+    with timed("db"):
+        return execute(sql, params, many, context)
+
+
+class TimedTemplate:
+    """render()의 소요 시간을 tpl 구간에 기록하는 template wrapper"""
+
+    def __init__(self, template) -> None:
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timed("tpl"):
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """template render 시간을 측정하는 DjangoTemplates backend"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
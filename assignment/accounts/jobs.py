@@ -0,0 +1,201 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from accounts.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# 작업 이름 별 실행 함수. accounts.tasks에서 register로 등록한다.
+TASKS = {}
+
+_worker_lock = threading.Lock()
+
+
+def register(name: str):
+    """함수를 name 이라는 작업으로 등록한다. 등록된 함수는 (job, **kwargs)로 호출된다."""
+
+    def decorator(function):
+        TASKS[name] = function
+        return function
+
+    return decorator
+
+
+def enqueue(task: str, requested_by: int = None, **kwargs) -> Job:
+    """작업을 대기 상태로 등록한다.
+        JOB_RUN_IN_PROCESS가 True이면 transaction이 commit된 후 현재 프로세스의
+        worker thread가 바로 실행한다.
+
+    Args:
+        task (str): register로 등록한 작업 이름
+        requested_by (int): 작업을 요청한 유저 id
+        kwargs: 작업 함수에 전달할 인자 (JSON으로 저장할 수 있는 값)
+
+    Raises:
+        ValueError: 등록되지 않은 작업 이름인 경우 발생
+
+    Returns:
+        Job: 등록된 작업
+    """
+    if task not in TASKS:
+        raise ValueError(f"등록되지 않은 작업입니다: {task}")
+
+    job = Job.objects.create(task=task, kwargs=kwargs, requested_by=requested_by)
+    if settings.JOB_RUN_IN_PROCESS:
+        transaction.on_commit(start_worker_thread)
+    return job
+
+
+def get_lease_expiry():
+    return timezone.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+
+def fail_expired_jobs(now) -> int:
+    """점유가 만료됐고 JOB_MAX_ATTEMPTS 번 시도한 실행 중 작업을 실패로 바꾼다.
+    마지막 시도 중에 worker가 죽은 작업이 실행 중 상태로 남지 않게 한다.
+
+    Returns:
+        int: 실패로 바꾼 작업 수
+    """
+    return Job.objects.filter(
+        status=Job.StatusChoices.RUNNING,
+        locked_until__lte=now,
+        attempts__gte=settings.JOB_MAX_ATTEMPTS,
+    ).update(
+        status=Job.StatusChoices.FAILED,
+        error="점유 기간 안에 끝나지 않았고 최대 시도 횟수를 넘었습니다.",
+        locked_until=None,
+        finished_at=now,
+    )
+
+
+def claim_next() -> Job:
+    """실행할 작업 하나를 점유한다.
+        대기 중인 작업과, 실행 중이지만 점유가 만료된 (worker가 죽은) 작업이 대상이다.
+        점유는 조건부 UPDATE로 기록하므로 여러 worker가 같은 작업을 실행하지 않는다.
+        다시 실행할 수 없는 만료된 작업은 먼저 실패로 바꾼다. (fail_expired_jobs)
+
+    Returns:
+        Job: 점유한 작업, 실행할 작업이 없으면 None
+    """
+    now = timezone.now()
+    fail_expired_jobs(now)
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Job.StatusChoices.QUEUED)
+                | Q(status=Job.StatusChoices.RUNNING, locked_until__lte=now),
+                attempts__lt=settings.JOB_MAX_ATTEMPTS,
+            )
+            .order_by("created_at", "pk")
+            .first()
+        )
+        if job is None:
+            return None
+
+        claimed = Job.objects.filter(
+            pk=job.pk,
+            status=job.status,
+            attempts=job.attempts,
+        ).update(
+            status=Job.StatusChoices.RUNNING,
+            attempts=F("attempts") + 1,
+            locked_until=get_lease_expiry(),
+            started_at=now,
+        )
+        if not claimed:
+            return None
+
+    job.refresh_from_db()
+    return job
+
+
+def report_progress(job: Job, processed: int, total: int = None) -> None:
+    """진행 상황을 저장하고 점유 기간을 연장한다. 작업 함수가 chunk마다 호출한다."""
+    job.processed = processed
+    if total is not None:
+        job.total = total
+    Job.objects.filter(pk=job.pk).update(
+        processed=job.processed,
+        total=job.total,
+        locked_until=get_lease_expiry(),
+    )
+
+
+def run_job(job: Job) -> None:
+    """점유한 작업을 실행하고 결과 상태를 저장한다.
+    실패하면 JOB_MAX_ATTEMPTS 번까지 다시 대기 상태로 돌린다.
+    """
+    try:
+        TASKS[job.task](job, **job.kwargs)
+    except Exception as error:
+        logger.exception("job %s (%s) failed", job.pk, job.task)
+        if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+            status = Job.StatusChoices.FAILED
+        else:
+            status = Job.StatusChoices.QUEUED
+        Job.objects.filter(pk=job.pk).update(
+            status=status,
+            error=repr(error),
+            locked_until=None,
+            finished_at=timezone.now() if status == Job.StatusChoices.FAILED else None,
+        )
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.StatusChoices.DONE,
+            processed=job.processed,
+            result=job.result.name or "",
+            error="",
+            locked_until=None,
+            finished_at=timezone.now(),
+        )
+
+
+def run_pending(max_jobs: int = None) -> int:
+    """실행할 작업이 없을 때까지 작업을 하나씩 점유해서 실행한다.
+
+    Args:
+        max_jobs (int): 실행할 최대 작업 수 (기본값: 제한 없음)
+
+    Returns:
+        int: 실행한 작업 수
+    """
+    count = 0
+    while max_jobs is None or count < max_jobs:
+        job = claim_next()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
+
+
+def _run_worker_thread() -> None:
+    try:
+        run_pending()
+    finally:
+        _worker_lock.release()
+
+    # 마지막 확인과 lock 해제 사이에 등록된 작업이 남지 않도록 한 번 더 확인한다.
+    try:
+        pending = Job.objects.filter(status=Job.StatusChoices.QUEUED).exists()
+    finally:
+        # thread 마다 따로 연 DB 연결을 닫는다.
+        connections.close_all()
+    if pending:
+        start_worker_thread()
+
+
+def start_worker_thread() -> None:
+    """프로세스 안에서 worker thread를 시작한다. 이미 실행 중이면 그 thread가 새 작업도 실행한다."""
+    if not _worker_lock.acquire(blocking=False):
+        return
+    threading.Thread(target=_run_worker_thread, name="job-worker", daemon=True).start()
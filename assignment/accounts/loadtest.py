@@ -0,0 +1,308 @@
+import asyncio
+import itertools
+import math
+import re
+import time
+import uuid
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+
+INPUT_TAG = re.compile(r"<input[^>]*>")
+INPUT_NAME = re.compile(r'name="([^"]+)"')
+INPUT_VALUE = re.compile(r'value="([^"]*)"')
+SIGNUP_DETAIL_LINK = re.compile(r"/accounts/signup-list/(\d+)")
+
+
+class Response:
+    def __init__(self, status: int, headers: list, body: str) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def get_inputs(self) -> dict:
+        """html의 input tag에서 name과 value를 모은다."""
+        inputs = {}
+        for tag in INPUT_TAG.findall(self.body):
+            name = INPUT_NAME.search(tag)
+            if not name:
+                continue
+            value = INPUT_VALUE.search(tag)
+            inputs[name.group(1)] = value.group(1) if value else ""
+        return inputs
+
+
+class HttpClient:
+    """asyncio stream 위에서 동작하는 최소한의 HTTP/1.1 client
+    가상 유저 한 명이 하나의 client를 사용하며 cookie(session, csrftoken)를 유지한다.
+    """
+
+    def __init__(self, base_url: str, stats, timeout: float) -> None:
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.stats = stats
+        self.timeout = timeout
+        self.cookies = {}
+
+    async def request(self, label: str, method: str, path: str, data: dict = None):
+        """요청을 보내고 label 별로 응답 시간과 status를 기록한다.
+
+        Args:
+            label (str): 통계를 모을 단계 이름 (예: login.post)
+            method (str): GET 또는 POST
+            path (str): 요청 경로
+            data (dict): POST form data
+
+        Returns:
+            Response: 응답. 연결 실패나 timeout이면 None
+        """
+        body = urlencode(data or {}).encode()
+        headers = {
+            "Host": f"{self.host}:{self.port}",
+            "Connection": "close",
+            "User-Agent": "accounts-loadtest",
+        }
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        if method == "POST":
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            headers["Content-Length"] = str(len(body))
+            headers["X-CSRFToken"] = self.cookies.get("csrftoken", "")
+            headers["Referer"] = f"http://{self.host}:{self.port}{path}"
+
+        raw = f"{method} {path} HTTP/1.1\r\n"
+        raw += "".join(f"{key}: {value}\r\n" for key, value in headers.items())
+        raw = raw.encode() + b"\r\n" + (body if method == "POST" else b"")
+
+        started_at = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self.send(raw), self.timeout)
+        except (OSError, asyncio.TimeoutError, ValueError) as error:
+            self.stats.record(label, time.perf_counter() - started_at, None, error)
+            return None
+
+        self.stats.record(label, time.perf_counter() - started_at, response.status)
+        for key, value in response.headers:
+            if key.lower() == "set-cookie":
+                cookie = SimpleCookie(value)
+                for name, morsel in cookie.items():
+                    self.cookies[name] = morsel.value
+        return response
+
+    async def send(self, raw: bytes) -> Response:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(raw)
+            await writer.drain()
+            data = await reader.read()
+        finally:
+            writer.close()
+
+        head, _, body = data.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = [tuple(line.split(": ", 1)) for line in lines[1:] if ": " in line]
+        return Response(status, headers, body.decode("utf-8", "replace"))
+
+
+class Stats:
+    """label 별 응답 시간과 status code 분포
+    5xx와 연결 실패는 errors로, 로그인 시도 제한(429)은 rate_limited로 따로 센다.
+    """
+
+    def __init__(self) -> None:
+        self.durations = {}
+        self.statuses = {}
+        self.errors = {}
+        self.rate_limited = {}
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def record(self, label: str, duration: float, status: int, error=None) -> None:
+        self.durations.setdefault(label, []).append(duration)
+        statuses = self.statuses.setdefault(label, {})
+        key = str(status) if status else type(error).__name__
+        statuses[key] = statuses.get(key, 0) + 1
+        if status is None or status >= 500:
+            self.errors[label] = self.errors.get(label, 0) + 1
+        elif status == 429:
+            self.rate_limited[label] = self.rate_limited.get(label, 0) + 1
+
+    @staticmethod
+    def percentile(values: list, rank: float) -> float:
+        if not values:
+            return 0.0
+        index = max(0, math.ceil(rank / 100 * len(values)) - 1)
+        return values[index]
+
+    def summarize_values(
+        self, values: list, errors: int, rate_limited: int, elapsed: float
+    ) -> dict:
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "errors": errors,
+            "error_rate": round(errors / len(values), 4) if values else 0.0,
+            "rate_limited": rate_limited,
+            "rate_limited_rate": (
+                round(rate_limited / len(values), 4) if values else 0.0
+            ),
+            "throughput": round(len(values) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(self.percentile(values, 50) * 1000, 2),
+            "p95_ms": round(self.percentile(values, 95) * 1000, 2),
+            "p99_ms": round(self.percentile(values, 99) * 1000, 2),
+        }
+
+    def summary(self) -> dict:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        steps = {
+            label: {
+                **self.summarize_values(
+                    values,
+                    self.errors.get(label, 0),
+                    self.rate_limited.get(label, 0),
+                    elapsed,
+                ),
+                "statuses": self.statuses[label],
+            }
+            for label, values in sorted(self.durations.items())
+        }
+        total = self.summarize_values(
+            list(itertools.chain.from_iterable(self.durations.values())),
+            sum(self.errors.values()),
+            sum(self.rate_limited.values()),
+            elapsed,
+        )
+        return {"elapsed_seconds": round(elapsed, 2), "total": total, "steps": steps}
+
+
+async def login(client: HttpClient, email: str, password: str) -> None:
+    await client.request("login.get", "GET", "/login/")
+    await client.request(
+        "login.post",
+        "POST",
+        "/login/",
+        {"email": email, "password": password},
+    )
+
+
+async def signup_storm(client: HttpClient, options: dict):
+    """새 이메일로 가입 신청을 반복한다."""
+    while True:
+        await client.request("signup.get", "GET", "/signup/")
+        password = "load1234!"
+        await client.request(
+            "signup.post",
+            "POST",
+            "/signup/",
+            {
+                "email": f"load_{uuid.uuid4().hex[:12]}@loadtest.com",
+                "username": "loadtest",
+                "phone": "01012345678",
+                "password": password,
+                "password_confirm": password,
+            },
+        )
+        yield
+
+
+def get_login_accounts(options: dict) -> list:
+    """login 시나리오에서 돌아가며 사용할 (이메일, 비밀번호) 목록
+    --login-pattern의 {i}를 --login-ids 범위의 숫자로 바꾼다. 예) staff{i}@test.com, 2-30
+    """
+    first, _, last = options["login_ids"].partition("-")
+    return [
+        (options["login_pattern"].format(i=i), options["login_password"])
+        for i in range(int(first), int(last or first) + 1)
+    ]
+
+
+async def login_storm(client: HttpClient, options: dict):
+    """여러 계정으로 돌아가며 LoginForm 검증(비밀번호 해싱 포함)을 반복한다.
+    한 계정으로 반복하면 이메일 별 시도 제한에 걸려 429만 측정하게 되므로 계정을 나눈다.
+    모든 가상 유저가 같은 IP에서 요청하므로 해싱 비용만 측정하려면 서버를
+    LOGIN_RATE_LIMIT_ENABLED = False 로 실행한다. (429는 rate_limited로 따로 집계된다.)
+    """
+    accounts = options["login_accounts"]
+    while True:
+        client.cookies.clear()
+        email, password = accounts[next(options["login_counter"]) % len(accounts)]
+        await login(client, email, password)
+        yield
+
+
+async def list_browsing(client: HttpClient, options: dict):
+    """관리자로 로그인한 후 가입 대기 목록과 회원 목록의 깊은 페이지까지 조회한다."""
+    await login(client, options["email"], options["password"])
+    for page in itertools.cycle(range(1, options["max_page"] + 1)):
+        await client.request(
+            "signup_list.get", "GET", f"/accounts/signup-list/?page={page}"
+        )
+        await client.request("employee_list.get", "GET", f"/employees/?page={page}")
+        yield
+
+
+async def approval_run(client: HttpClient, options: dict):
+    """관리자로 로그인한 후 가입 대기 목록의 유저를 SignupDetailView에서 승인한다."""
+    await login(client, options["email"], options["password"])
+    while True:
+        response = await client.request(
+            "signup_list.get",
+            "GET",
+            "/accounts/signup-list/",
+        )
+        user_ids = SIGNUP_DETAIL_LINK.findall(response.body) if response else []
+        if not user_ids:
+            yield
+            continue
+
+        path = f"/accounts/signup-list/{user_ids[0]}"
+        detail = await client.request("signup_detail.get", "GET", path)
+        if detail is None or detail.status != 200:
+            yield
+            continue
+
+        data = {"username": "loadtest", **detail.get_inputs()}
+        data.pop("csrfmiddlewaretoken", None)
+        data.update({"approval-btn": "", "authorization_grade": "ST"})
+        await client.request("signup_detail.post", "POST", path, data)
+        yield
+
+
+SCENARIOS = {
+    "signup": signup_storm,
+    "login": login_storm,
+    "browse": list_browsing,
+    "approve": approval_run,
+}
+
+
+async def run_virtual_user(scenario, base_url: str, stats: Stats, options: dict):
+    client = HttpClient(base_url, stats, options["timeout"])
+    deadline = time.perf_counter() + options["duration"]
+    async for _ in scenario(client, options):
+        if time.perf_counter() >= deadline:
+            break
+
+
+async def run_scenario(name: str, base_url: str, options: dict) -> dict:
+    """concurrency 명의 가상 유저가 duration 동안 시나리오를 반복한다.
+
+    Returns:
+        dict: 처리량, p50/p95/p99 응답 시간, 에러율
+    """
+    stats = Stats()
+    options = {
+        **options,
+        "login_accounts": get_login_accounts(options),
+        "login_counter": itertools.count(),
+    }
+    await asyncio.gather(
+        *[
+            run_virtual_user(SCENARIOS[name], base_url, stats, options)
+            for _ in range(options["concurrency"])
+        ],
+    )
+    stats.finished_at = time.perf_counter()
+    return stats.summary()
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from accounts.archive import archive_accounts
+from accounts.sharding import get_user_databases
+
+
+class Command(BaseCommand):
+    help = "보관 기간이 지난 거절 유저와 퇴사자를 batch 단위로 ArchivedAccount로 옮긴다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="databases",
+            help="보관할 database alias, 여러 번 지정 가능 (기본값: 모든 shard 또는 default)",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="batch 사이에 쉬는 시간(초)",
+        )
+
+    def handle(self, *args, **options):
+        for using in options["databases"] or get_user_databases():
+            counts = archive_accounts(using, options["batch_size"], options["pause"])
+            self.stdout.write(
+                f"[{using}] rejected={counts['RJ']} resigned={counts['RS']}",
+            )
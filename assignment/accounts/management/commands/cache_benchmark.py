@@ -0,0 +1,132 @@
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from accounts.cache import SharedMemoryCache
+
+
+class Command(BaseCommand):
+    help = (
+        "LocMemCache, FileBasedCache, SharedMemoryCache의 set, get 시간과 "
+        "여러 프로세스에서 동시에 사용할 때의 처리량, 프로세스 간 공유 여부를 비교한다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keys", type=int, default=2000)
+        parser.add_argument("--processes", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("locmem", "filebased", "shared"):
+                cache = self.create_cache(name, Path(directory))
+                result = self.run_benchmark(cache, options["keys"])
+                result["ops_per_sec"] = self.run_processes(cache, **options)
+                result["shared"] = self.is_shared(cache)
+                self.stdout.write(
+                    f"[{name:>9}] set={result['set']:.1f}us "
+                    f"get_hit={result['get_hit']:.1f}us "
+                    f"get_miss={result['get_miss']:.1f}us "
+                    f"hit_rate={result['hit_rate']:.2f} "
+                    f"ops/sec({options['processes']} processes)="
+                    f"{result['ops_per_sec']:.0f} "
+                    f"shared={'yes' if result['shared'] else 'no'}",
+                )
+
+    def create_cache(self, name: str, directory: Path):
+        params = {"TIMEOUT": 300, "OPTIONS": {"MAX_ENTRIES": 100_000}}
+        if name == "locmem":
+            return LocMemCache(f"benchmark-{time.time_ns()}", params)
+        if name == "filebased":
+            return FileBasedCache(str(directory / "filebased"), params)
+        return SharedMemoryCache(
+            str(directory / "shared"),
+            {"TIMEOUT": 300, "OPTIONS": {"SLOTS": 8192, "SLOT_SIZE": 512, "WAYS": 8}},
+        )
+
+    def run_benchmark(self, cache, keys: int) -> dict:
+        """keys 개의 권한 조회 결과 크기의 값을 set 하고 다시 get 한다.
+
+        Returns:
+            dict: 연산 당 시간(us)과 get 적중률
+        """
+        value = {"grade": "MA", "fields": ["username", "phone"], "allowed": True}
+
+        started = time.perf_counter()
+        for index in range(keys):
+            cache.set(f"benchmark:{index}", value)
+        set_time = time.perf_counter() - started
+
+        hits = 0
+        started = time.perf_counter()
+        for index in range(keys):
+            hits += cache.get(f"benchmark:{index}") is not None
+        get_hit_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for index in range(keys):
+            cache.get(f"benchmark:missing:{index}")
+        get_miss_time = time.perf_counter() - started
+
+        return {
+            "set": set_time * 1_000_000 / keys,
+            "get_hit": get_hit_time * 1_000_000 / keys,
+            "get_miss": get_miss_time * 1_000_000 / keys,
+            "hit_rate": hits / keys,
+        }
+
+    def run_processes(self, cache, keys: int, processes: int, seconds: float, **_):
+        """fork한 여러 프로세스에서 get 9번, set 1번 비율로 seconds 동안 실행한다.
+
+        Returns:
+            float: 모든 프로세스의 초당 연산 수 합계
+        """
+        context = multiprocessing.get_context("fork")
+        counts = context.Queue()
+        workers = [
+            context.Process(
+                target=self.worker,
+                args=(cache, keys, seconds, offset, counts),
+            )
+            for offset in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        total = sum(counts.get() for _ in workers)
+        for worker in workers:
+            worker.join()
+        return total / seconds
+
+    @staticmethod
+    def worker(cache, keys: int, seconds: float, offset: int, counts) -> None:
+        operations = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            key = f"benchmark:{(operations * 7 + offset) % keys}"
+            if operations % 10 == 0:
+                cache.set(key, operations)
+            else:
+                cache.get(key)
+            operations += 1
+        counts.put(operations)
+
+    def is_shared(self, cache) -> bool:
+        """다른 프로세스에서 set, delete 한 결과가 현재 프로세스에 보이는지 확인한다."""
+        cache.set("benchmark:invalidate", "stale")
+
+        def change():
+            cache.set("benchmark:shared", "child")
+            cache.delete("benchmark:invalidate")
+
+        process = multiprocessing.get_context("fork").Process(target=change)
+        process.start()
+        process.join()
+        return (
+            cache.get("benchmark:shared") == "child"
+            and cache.get("benchmark:invalidate") is None
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import dispatch_batch
+from accounts.sharding import get_user_databases
+
+
+class Command(BaseCommand):
+    help = "outbox에 쌓인 계정 상태 변경 이벤트를 묶어서 발송한다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="databases",
+            help="outbox를 확인할 database alias, 여러 번 지정 가능 (기본값: 모든 유저 database)",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.OUTBOX_POLL_INTERVAL,
+            help="발송할 이벤트가 없을 때 대기하는 시간(초)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="대기 중인 이벤트를 모두 발송하고 종료한다.",
+        )
+
+    def handle(self, *args, **options):
+        databases = options["databases"] or get_user_databases()
+
+        while True:
+            dispatched = 0
+            for using in databases:
+                dispatched += dispatch_batch(using, options["batch_size"])
+
+            if dispatched:
+                self.stdout.write(f"dispatched {dispatched} events")
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from accounts.bloom import email_filter
+
+
+class Command(BaseCommand):
+    help = "가입 이메일 Bloom filter를 만들고 크기와 false positive 비율을 출력한다."
+
+    def handle(self, *args, **options):
+        email_filter.build()
+        for key, value in email_filter.stats().items():
+            self.stdout.write(f"{key}: {value}")
@@ -0,0 +1,124 @@
+import copy
+import math
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+from accounts.hashers import TunedPBKDF2PasswordHasher
+
+# hasher 별 비용 parameter 이름과 비용에 따라 검증 시간이 늘어나는 방식
+# - linear: 비용에 비례, power_of_two: 비용(2의 거듭제곱)에 비례, log2: 2의 비용 제곱에 비례
+COST_PARAMETERS = {
+    "iterations": "linear",
+    "time_cost": "linear",
+    "work_factor": "power_of_two",
+    "rounds": "log2",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "PASSWORD_HASHERS의 hasher마다 이 서버에서 비밀번호 검증 한 번의 시간을 측정하고, "
+        "--target-ms에 맞는 비용 parameter(반복 횟수 등)를 추천한다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100.0,
+            help="로그인 한 번의 비밀번호 검증 목표 시간(ms)",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수")
+
+    def handle(self, *args, **options):
+        target_ms = options["target_ms"]
+        for hasher in get_hashers():
+            parameter = self.get_cost_parameter(hasher)
+            if parameter is None:
+                self.stdout.write(f"[{hasher.algorithm}] 비용 parameter가 없어 건너뜀")
+                continue
+
+            cost = getattr(hasher, parameter)
+            try:
+                current_ms = self.measure(hasher, parameter, cost, options["repeat"])
+            except ValueError as error:
+                self.stdout.write(f"[{hasher.algorithm}] 측정할 수 없음: {error}")
+                continue
+
+            recommended = self.recommend(parameter, cost, current_ms, target_ms)
+            try:
+                recommended_ms = self.measure(
+                    hasher, parameter, recommended, options["repeat"]
+                )
+            except ValueError as error:
+                recommended_ms = math.nan
+                self.stdout.write(f"[{hasher.algorithm}] 추천 값 측정 실패: {error}")
+
+            self.stdout.write(
+                f"[{hasher.algorithm}] current {parameter}={cost} "
+                f"verify={current_ms:.1f}ms logins/sec/core={1000 / current_ms:.1f} "
+                f"-> recommended {parameter}={recommended} "
+                f"verify={recommended_ms:.1f}ms (target {target_ms:.0f}ms)",
+            )
+            if isinstance(hasher, TunedPBKDF2PasswordHasher):
+                self.stdout.write(
+                    f"  settings: PASSWORD_HASH_ITERATIONS = {recommended} "
+                    f"(현재 {settings.PASSWORD_HASH_ITERATIONS})",
+                )
+
+    def get_cost_parameter(self, hasher) -> str:
+        for parameter in COST_PARAMETERS:
+            if hasattr(hasher, parameter):
+                return parameter
+        return None
+
+    def measure(self, hasher, parameter: str, cost: int, repeat: int) -> float:
+        """cost로 해싱한 비밀번호를 repeat 번 검증하고 중앙값을 반환한다.
+
+        Raises:
+            ValueError: hasher의 라이브러리가 설치되어 있지 않거나 비용이 허용 범위를 넘는 경우
+
+        Returns:
+            float: 검증 한 번의 시간(ms)
+        """
+        password = "benchmark-password"
+        salt = hasher.salt()
+        if parameter == "iterations":
+            # PBKDF2 계열은 반복 횟수를 encode 인자로 받는다.
+            encoded = hasher.encode(password, salt, cost)
+        else:
+            hasher = copy.copy(hasher)
+            setattr(hasher, parameter, cost)
+            encoded = hasher.encode(password, salt)
+
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hasher.verify(password, encoded)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def recommend(
+        self, parameter: str, cost: int, measured_ms: float, target_ms: float
+    ) -> int:
+        """측정한 시간과 목표 시간의 비율로 비용 parameter를 계산한다.
+
+        Returns:
+            int: 추천 비용
+        """
+        ratio = target_ms / measured_ms
+        growth = COST_PARAMETERS[parameter]
+        if growth == "linear":
+            recommended = cost * ratio
+            if parameter == "iterations":
+                # 유효 숫자 두 자리로 반올림한다. 예) 612345 -> 610000
+                digits = max(0, int(math.log10(recommended)) - 1)
+                return max(1000, int(round(recommended, -digits)))
+            return max(1, round(recommended))
+        if growth == "power_of_two":
+            return 2 ** max(1, round(math.log2(cost * ratio)))
+        return min(31, max(4, cost + round(math.log2(ratio))))
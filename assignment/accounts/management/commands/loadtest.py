@@ -0,0 +1,91 @@
+import asyncio
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from accounts.loadtest import SCENARIOS, run_scenario
+
+
+class Command(BaseCommand):
+    help = "실행 중인 서버에 asyncio 가상 유저로 부하를 주고 처리량과 응답 시간을 측정한다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenarios", nargs="+", choices=list(SCENARIOS))
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument(
+            "--duration", type=float, default=30.0, help="시나리오 별 실행 시간(초)"
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=10.0, help="요청 별 timeout(초)"
+        )
+        parser.add_argument(
+            "--email", default="master@test.com", help="browse, approve에 사용할 계정"
+        )
+        parser.add_argument("--password", default="master1234!")
+        parser.add_argument(
+            "--login-pattern",
+            default="staff{i}@test.com",
+            help="login 시나리오에서 돌아가며 사용할 계정의 이메일, {i}는 --login-ids의 숫자",
+        )
+        parser.add_argument(
+            "--login-ids", default="2-30", help="login 계정 번호 범위 (config/local.py)"
+        )
+        parser.add_argument("--login-password", default="staff1234!")
+        parser.add_argument(
+            "--max-page", type=int, default=20, help="browse에서 조회할 마지막 페이지"
+        )
+        parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+        parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+
+    def handle(self, *args, **options):
+        results = {}
+        for name in options["scenarios"]:
+            self.stdout.write(
+                f"[{name}] concurrency={options['concurrency']} "
+                f"duration={options['duration']}s",
+            )
+            results[name] = asyncio.run(run_scenario(name, options["url"], options))
+
+        previous = {}
+        if options["compare"]:
+            previous = json.loads(Path(options["compare"]).read_text())["results"]
+
+        for name, result in results.items():
+            self.write_result(name, result, previous.get(name))
+
+        if options["output"]:
+            report = {
+                "options": {
+                    key: options[key]
+                    for key in ("url", "concurrency", "duration", "max_page")
+                },
+                "results": results,
+            }
+            Path(options["output"]).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"saved {options['output']}")
+
+    def write_result(self, name: str, result: dict, previous: dict = None) -> None:
+        rows = [("total", result["total"])] + list(result["steps"].items())
+        self.stdout.write(f"\n{name} ({result['elapsed_seconds']}s)")
+        self.stdout.write(
+            f"{'step':<22}{'requests':>9}{'rps':>9}{'p50':>9}{'p95':>9}"
+            f"{'p99':>9}{'errors':>8}{'429':>8}  statuses",
+        )
+        for label, row in rows:
+            self.stdout.write(
+                f"{label:<22}{row['requests']:>9}{row['throughput']:>9}"
+                f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+                f"{row['error_rate']:>8.1%}{row['rate_limited_rate']:>8.1%}  "
+                f"{row.get('statuses', '')}",
+            )
+
+        if previous:
+            before, after = previous["total"], result["total"]
+            self.stdout.write(
+                f"compared to previous: rps {before['throughput']} -> "
+                f"{after['throughput']}, p95 {before['p95_ms']}ms -> "
+                f"{after['p95_ms']}ms, error_rate {before['error_rate']:.1%} -> "
+                f"{after['error_rate']:.1%}",
+            )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.directory import rebuild_directory
+from accounts.sharding import get_user_databases
+
+
+class Command(BaseCommand):
+    help = "회원 목록 읽기 모델(EmployeeDirectory)을 Employee, User로부터 다시 만든다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="databases",
+            help="다시 만들 database alias, 여러 번 지정 가능 (기본값: 모든 shard 또는 default)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for using in options["databases"] or get_user_databases():
+            count = rebuild_directory(using, options["batch_size"])
+            self.stdout.write(f"[{using}] {count} rows")
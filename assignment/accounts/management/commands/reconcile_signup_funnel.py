@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from accounts.funnel import reconcile
+from accounts.sharding import get_user_databases
+
+
+class Command(BaseCommand):
+    help = "가입 현황 counter를 원본 테이블 집계 결과와 비교해서 어긋난 값을 바로잡는다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            action="append",
+            dest="databases",
+            help="확인할 database alias, 여러 번 지정 가능 (기본값: 모든 shard 또는 default)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="최근 며칠의 일자 별 건수만 다시 계산한다. (기본값: 전체 기간)",
+        )
+
+    def handle(self, *args, **options):
+        for using in options["databases"] or get_user_databases():
+            corrected = reconcile(using, options["days"])
+            self.stdout.write(f"[{using}] {len(corrected)} counters corrected")
+            for key, (before, after) in sorted(corrected.items()):
+                self.stdout.write(f"    {key}: {before} -> {after}")
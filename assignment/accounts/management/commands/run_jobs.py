@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = "Job 테이블에 등록된 작업(내보내기, 읽기 모델 재생성 등)을 실행한다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help="실행할 작업이 없을 때 대기하는 시간(초)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="대기 중인 작업을 모두 실행하고 종료한다.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            executed = run_pending()
+            if executed:
+                self.stdout.write(f"executed {executed} jobs")
+                continue
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from accounts.slowlog import summarize
+
+
+class Command(BaseCommand):
+    help = "slow query 기록을 fingerprint 별로 모아 전체 소요 시간이 긴 순서로 출력한다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument("--file", default=None, help="기본값: SLOW_QUERY_LOG_FILE")
+
+    def handle(self, *args, **options):
+        summary = summarize(options["file"])
+        if not summary:
+            self.stdout.write("기록된 slow query가 없습니다.")
+            return
+
+        for rank, item in enumerate(summary[: options["top"]], start=1):
+            average = item["total_ms"] / item["count"]
+            self.stdout.write(
+                f"#{rank} count={item['count']} total={item['total_ms']:.1f}ms "
+                f"avg={average:.1f}ms max={item['max_ms']:.1f}ms "
+                f"params={item['params_shape']}",
+            )
+            self.stdout.write(f"    {item['fingerprint']}")
+            locations = sorted(
+                item["locations"].items(),
+                key=lambda location: location[1],
+                reverse=True,
+            )
+            for location, count in locations:
+                self.stdout.write(f"    - {location} ({count})")
@@ -0,0 +1,148 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.test.utils import override_settings
+
+# mode 별로 적용하는 settings, apply_sqlite_pragmas가 연결을 만들 때 읽는다.
+MODE_SETTINGS = {
+    "default": {"SQLITE_PRAGMAS": {}, "SQLITE_WRITE_QUEUE": False},
+    "profile": {"SQLITE_WRITE_QUEUE": True},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "SQLite 기본 설정과 성능 프로필(SQLITE_PRAGMAS, SQLITE_WRITE_QUEUE)의 "
+        "동시 쓰기 처리량(writes/sec)과 에러 수를 Django 연결로 비교한다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=5.0,
+            help="sqlite3 연결의 lock 대기 시간(초), Django 기본값과 동일하게 5초",
+        )
+
+    def handle(self, *args, **options):
+        for mode in ("default", "profile"):
+            with override_settings(**MODE_SETTINGS[mode]):
+                result = self.run_benchmark(mode, **options)
+            self.stdout.write(
+                f"[{mode}] writes={result['writes']} "
+                f"reads={result['reads']} "
+                f"errors={result['errors']} "
+                f"writes/sec={result['writes_per_sec']:.1f}",
+            )
+
+    def run_benchmark(self, mode: str, **options) -> dict:
+        """임시 SQLite 파일을 database alias로 등록하고, 가입 승인(transaction 안에서
+            읽은 뒤 쓰기)과 로그인 시간 갱신(autocommit 쓰기)을 여러 스레드에서 동시에 실행한다.
+            스레드마다 Django 연결을 사용하므로 connection_created 시 적용되는
+            pragma와 execute wrapper(serialize_writes)가 그대로 적용된다.
+
+        Args:
+            mode (str): "default"이면 기본 설정, "profile"이면 pragma와 쓰기 직렬화 적용
+
+        Returns:
+            dict: 쓰기, 읽기, 에러 횟수와 초당 쓰기 횟수
+        """
+        alias = f"sqlite_benchmark_{mode}"
+        with tempfile.TemporaryDirectory() as directory:
+            self.add_database(alias, Path(directory) / "benchmark.sqlite3", options)
+            try:
+                self.create_table(alias, options["rows"])
+                counts = {"writes": 0, "reads": 0, "errors": 0}
+                counts_lock = threading.Lock()
+                deadline = time.perf_counter() + options["seconds"]
+
+                def worker(worker_id):
+                    index = worker_id
+                    while time.perf_counter() < deadline:
+                        user_id = index % options["rows"] + 1
+                        index += options["threads"]
+                        try:
+                            self.read(alias)
+                            self.approve(alias, user_id)
+                            self.update_last_login(alias, user_id)
+                            result = {"writes": 2, "reads": 1}
+                        except OperationalError:
+                            result = {"errors": 1}
+                        with counts_lock:
+                            for key, value in result.items():
+                                counts[key] += value
+                    connections[alias].close()
+
+                started = time.perf_counter()
+                threads = [
+                    threading.Thread(target=worker, args=(i,))
+                    for i in range(options["threads"])
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+            finally:
+                connections[alias].close()
+                del connections.settings[alias]
+
+        counts["writes_per_sec"] = counts["writes"] / elapsed
+        return counts
+
+    def add_database(self, alias: str, path: Path, options: dict) -> None:
+        """임시 SQLite 파일을 connections에 alias로 등록한다."""
+        databases = connections.configure_settings(
+            {
+                DEFAULT_DB_ALIAS: dict(connections.settings[DEFAULT_DB_ALIAS]),
+                alias: {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": str(path),
+                    "OPTIONS": {"timeout": options["timeout"]},
+                },
+            },
+        )
+        connections.settings[alias] = databases[alias]
+
+    def create_table(self, alias: str, rows: int) -> None:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE users ("
+                "id INTEGER PRIMARY KEY, email TEXT, state TEXT, last_login REAL)",
+            )
+            cursor.executemany(
+                "INSERT INTO users (id, email, state) VALUES (%s, %s, 'AW')",
+                [(i, f"user{i}@test.com") for i in range(1, rows + 1)],
+            )
+
+    def read(self, alias: str) -> None:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT id, email, state FROM users ORDER BY id DESC LIMIT 7",
+            )
+            cursor.fetchall()
+
+    def approve(self, alias: str, user_id: int) -> None:
+        """accounts.services처럼 transaction 안에서 상태를 읽고 바꾼다."""
+        with transaction.atomic(using=alias):
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT state FROM users WHERE id = %s", [user_id])
+                cursor.fetchone()
+                cursor.execute(
+                    "UPDATE users SET state = 'AP' WHERE id = %s",
+                    [user_id],
+                )
+
+    def update_last_login(self, alias: str, user_id: int) -> None:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "UPDATE users SET last_login = %s WHERE id = %s",
+                [time.time(), user_id],
+            )
@@ -0,0 +1,110 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# 새 인터프리터에서 실행되어 cold start 단계 별 시간(ms)을 json으로 출력한다.
+CHILD_SCRIPT = """
+import json
+import sys
+import time
+
+durations = {}
+started_at = time.perf_counter()
+
+def mark(name):
+    global started_at
+    now = time.perf_counter()
+    durations[name] = round((now - started_at) * 1000, 2)
+    started_at = now
+
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+mark("import_settings")
+
+django.setup()
+mark("django_setup")
+
+if sys.argv[2] == "warm":
+    from accounts.warmup import warmup
+    warmup()
+    mark("warmup")
+
+from django.test import Client
+client = Client(HTTP_HOST="localhost")
+mark("create_client")
+
+response = client.get(sys.argv[1])
+mark("first_request")
+server_timing = response.get("Server-Timing", "")
+
+client.get(sys.argv[1])
+mark("second_request")
+
+print(json.dumps({
+    "status": response.status_code,
+    "durations": durations,
+    "server_timing": server_timing,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "새 프로세스에서 settings import, django.setup(), 첫 요청, 두 번째 요청의 시간을 "
+        "측정해서 warmup 전후의 cold start 비용을 비교한다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--path", default="/login/", help="측정할 요청 경로")
+
+    def handle(self, *args, **options):
+        for mode in ("cold", "warm"):
+            results = [
+                self.run_child(mode, options["path"]) for _ in range(options["runs"])
+            ]
+            self.stdout.write(
+                f"[{mode}] runs={len(results)} status={results[0]['status']}",
+            )
+            for phase in results[0]["durations"]:
+                values = [result["durations"][phase] for result in results]
+                self.stdout.write(
+                    f"    {phase:<16} median={statistics.median(values):.2f}ms "
+                    f"max={max(values):.2f}ms",
+                )
+            if results[0]["server_timing"]:
+                self.stdout.write(
+                    f"    first request Server-Timing: {results[0]['server_timing']}",
+                )
+
+    def run_child(self, mode: str, path: str) -> dict:
+        """새 python 프로세스를 띄워 한 번의 cold start를 측정한다.
+
+        Args:
+            mode (str): "cold"이면 바로 요청, "warm"이면 accounts.warmup.warmup() 후 요청
+            path (str): 측정할 요청 경로
+
+        Raises:
+            CommandError: 자식 프로세스가 실패한 경우
+
+        Returns:
+            dict: 응답 status, 단계 별 소요 시간(ms), 첫 요청의 Server-Timing 헤더
+        """
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        completed = subprocess.run(
+            [sys.executable, "-c", CHILD_SCRIPT, path, mode],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise CommandError(completed.stderr.strip())
+        return json.loads(completed.stdout.strip().splitlines()[-1])
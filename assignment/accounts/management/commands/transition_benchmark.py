@@ -0,0 +1,137 @@
+import time
+import uuid
+from contextlib import ExitStack
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from accounts import services
+from accounts.funnel import reconcile
+from accounts.models import Employee, OutboxEvent, User
+from accounts.sharding import get_user_databases
+
+
+class StatementCounter:
+    """실행된 SQL 문 수와 commit 수를 센다.
+    autocommit 상태에서 실행된 문은 각각 하나의 commit으로 센다.
+    """
+
+    def __init__(self, aliases: list) -> None:
+        self.aliases = aliases
+        self.statements = 0
+        self.commits = 0
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements += 1
+        if not context["connection"].in_atomic_block:
+            self.commits += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for alias in self.aliases:
+            connection = connections[alias]
+            connection.ensure_connection()
+            self.stack.enter_context(connection.execute_wrapper(self))
+            self.stack.callback(self.count_commits(connection))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+    def count_commits(self, connection):
+        """transaction.atomic이 끝날 때 호출하는 connection.commit을 감싸고, 되돌리는 함수를 반환한다."""
+        commit = connection.commit
+
+        def counted_commit():
+            self.commits += 1
+            commit()
+
+        connection.commit = counted_commit
+        return lambda: delattr(connection, "commit")
+
+
+class Command(BaseCommand):
+    help = (
+        "가입 승인, 거절, 탈퇴를 accounts.services로 처리할 때 전이 당 SQL 문 수, "
+        "commit 수, 시간을 대상 하나씩 처리한 경우와 한 번에 처리한 경우로 비교한다. "
+        "측정용 유저를 만들고 끝나면 지우므로 개발 DB에서 실행한다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100, help="전이 당 대상 수")
+
+    def handle(self, *args, **options):
+        self.prefix = f"benchmark-{uuid.uuid4().hex[:8]}"
+        try:
+            for mode in ("single", "batch"):
+                for transition in ("approve", "reject", "resign"):
+                    result = self.run_benchmark(mode, transition, options["count"])
+                    self.stdout.write(
+                        f"[{mode:>6}] {transition:<7} "
+                        f"statements/transition={result['statements']:.1f} "
+                        f"commits/transition={result['commits']:.2f} "
+                        f"ms/transition={result['ms']:.2f}",
+                    )
+        finally:
+            self.cleanup()
+
+    def run_benchmark(self, mode: str, transition: str, count: int) -> dict:
+        """측정용 대상을 만들고 mode에 따라 하나씩 또는 한 번에 전이시킨다.
+
+        Args:
+            mode (str): "single"이면 대상마다 service를 호출하고, "batch"이면 한 번 호출한다.
+            transition (str): "approve", "reject", "resign" 중 하나
+            count (int): 대상 수
+
+        Returns:
+            dict: 전이 당 SQL 문 수, commit 수, 시간(ms)
+        """
+        users = self.create_users(f"{mode}-{transition}", count)
+        if transition == "resign":
+            targets = services.approve(users)
+            operation = partial(services.resign, reason_for_resignation="benchmark")
+        elif transition == "reject":
+            targets = users
+            operation = partial(services.reject, reason_for_refusal="benchmark")
+        else:
+            targets = users
+            operation = services.approve
+
+        with StatementCounter(get_user_databases()) as counter:
+            started = time.perf_counter()
+            if mode == "single":
+                for target in targets:
+                    operation(target)
+            else:
+                operation(targets)
+            elapsed = time.perf_counter() - started
+
+        return {
+            "statements": counter.statements / count,
+            "commits": counter.commits / count,
+            "ms": elapsed * 1000 / count,
+        }
+
+    def create_users(self, name: str, count: int) -> list:
+        users = []
+        for index in range(count):
+            user = User.objects.create_user(
+                email=f"{self.prefix}-{name}-{index}@benchmark.test",
+                password=None,
+                username=name,
+                phone="01000000000",
+            )
+            users.append(user)
+        return users
+
+    def cleanup(self) -> None:
+        """측정용 유저와 outbox 이벤트를 지우고 가입 현황 counter를 다시 맞춘다."""
+        for using in get_user_databases():
+            users = User.objects.using(using).filter(email__startswith=self.prefix)
+            user_ids = list(users.values_list("pk", flat=True))
+            OutboxEvent.objects.using(using).filter(user_id__in=user_ids).delete()
+            Employee.objects.using(using).filter(user_id__in=user_ids).delete()
+            users.delete()
+            reconcile(using, days=1)
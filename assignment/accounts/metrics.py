@@ -0,0 +1,219 @@
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+def make_key(name: str, labels: dict) -> str:
+    """metric 이름과 label을 exposition 형식의 key로 만든다.
+
+    Returns:
+        str: 예) login_attempts_total{outcome="success"}
+    """
+    if not labels:
+        return name
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{pairs}}}"
+
+
+class MetricsRegistry:
+    """프로세스 별 counter와 histogram
+
+    - 값 갱신은 dict 연산 한 번만 lock 안에서 처리한다.
+    - METRICS_DIR이 설정되어 있으면 METRICS_FLUSH_INTERVAL 마다 pid 별 파일로 저장하고,
+      /metrics 요청 시 실행 중인 worker의 파일을 합쳐서 보여준다. (pre-fork worker 지원)
+    - 종료된 worker의 파일은 합치지 않고 지운다. 재시작한 worker의 counter는 0부터 다시
+      시작하므로 Prometheus는 counter reset으로 처리한다.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.pid = os.getpid()
+        self.counters = {}
+        self.histograms = {}
+        self.flushed_at = time.monotonic()
+        # 같은 pid를 쓰던 종료된 프로세스의 파일은 이 프로세스의 값이 아니다.
+        if settings.METRICS_DIR:
+            self.get_path().unlink(missing_ok=True)
+
+    def get_path(self) -> Path:
+        return Path(settings.METRICS_DIR) / f"{self.pid}.json"
+
+    def check_fork(self) -> None:
+        # fork된 worker는 부모 프로세스의 값을 이어받지 않는다.
+        if self.pid != os.getpid():
+            self.reset()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = make_key(name, labels)
+        with self.lock:
+            self.check_fork()
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """histogram에 값을 기록한다.
+        buckets는 누적하지 않고 구간 별로 저장하고 exposition 시 누적한다.
+        """
+        buckets = settings.METRICS_LATENCY_BUCKETS
+        key = make_key(name, labels)
+        index = bisect.bisect_left(buckets, value)
+        with self.lock:
+            self.check_fork()
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    "buckets": [0] * (len(buckets) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            self.check_fork()
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    key: {**value, "buckets": list(value["buckets"])}
+                    for key, value in self.histograms.items()
+                },
+            }
+
+    def flush(self) -> None:
+        """현재 프로세스의 값을 METRICS_DIR/<pid>.json에 저장한다."""
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+
+        self.flushed_at = time.monotonic()
+        with self.lock:
+            self.check_fork()
+        path = self.get_path()
+        temporary_path = path.with_suffix(".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary_path, path)
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self.flushed_at >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+
+registry = MetricsRegistry()
+
+
+def merge_snapshots(snapshots: list) -> dict:
+    merged = {"counters": {}, "histograms": {}}
+    for snapshot in snapshots:
+        for key, value in snapshot["counters"].items():
+            merged["counters"][key] = merged["counters"].get(key, 0) + value
+        for key, value in snapshot["histograms"].items():
+            histogram = merged["histograms"].get(key)
+            if histogram is None:
+                merged["histograms"][key] = {**value, "buckets": list(value["buckets"])}
+                continue
+            histogram["buckets"] = [
+                a + b for a, b in zip(histogram["buckets"], value["buckets"])
+            ]
+            histogram["sum"] += value["sum"]
+            histogram["count"] += value["count"]
+    return merged
+
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # 다른 유저의 프로세스가 pid를 사용 중이다.
+        return True
+    return True
+
+
+def collect() -> dict:
+    """실행 중인 모든 worker의 값을 합친다. METRICS_DIR이 없으면 현재 프로세스의 값만 반환한다.
+    종료된 worker의 파일은 지운다.
+    """
+    if not settings.METRICS_DIR:
+        return registry.snapshot()
+
+    registry.flush()
+    snapshots = []
+    for path in Path(settings.METRICS_DIR).glob("*.json"):
+        if not path.stem.isdigit() or not is_process_alive(int(path.stem)):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return merge_snapshots(snapshots)
+
+
+def render_histogram(key: str, histogram: dict) -> list:
+    if "{" in key:
+        name, labels = key[:-1].split("{", 1)
+        labels += ","
+    else:
+        name, labels = key, ""
+
+    lines = []
+    cumulative = 0
+    bounds = [*settings.METRICS_LATENCY_BUCKETS, "+Inf"]
+    for bound, count in zip(bounds, histogram["buckets"]):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+    suffix = f"{{{labels[:-1]}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram['sum']}")
+    lines.append(f"{name}_count{suffix} {histogram['count']}")
+    return lines
+
+
+def group_by_name(values: dict) -> dict:
+    """key를 metric 이름 별로 묶는다. 같은 이름의 행은 # TYPE 행 아래에 모여 있어야 한다."""
+    groups = {}
+    for key, value in sorted(values.items()):
+        groups.setdefault(key.split("{", 1)[0], []).append((key, value))
+    return groups
+
+
+def render_text(gauges: dict = None) -> str:
+    """Prometheus text exposition 형식으로 변환한다.
+
+    Args:
+        gauges (dict): 요청 시점에 계산한 gauge 값 (예: 가입 대기 수)
+
+    Returns:
+        str: exposition text
+    """
+    metrics = collect()
+    lines = []
+    for name, rows in group_by_name(metrics["counters"]).items():
+        lines.append(f"# TYPE {name} counter")
+        lines.extend(f"{key} {value}" for key, value in rows)
+    for name, rows in group_by_name(metrics["histograms"]).items():
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in rows:
+            lines.extend(render_histogram(key, histogram))
+    for name, rows in group_by_name(gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(f"{key} {value}" for key, value in rows)
+    return "\n".join(lines) + "\n"
+
+
+def record_cache_access(cache_name: str, hit: bool) -> None:
+    registry.inc(
+        "cache_requests_total",
+        cache=cache_name,
+        result="hit" if hit else "miss",
+    )
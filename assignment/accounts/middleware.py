@@ -0,0 +1,154 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from accounts.instrumentation import RequestTimings, current_timings, record_query
+from accounts.metrics import registry
+from accounts.routers import read_from_replica
+
+
+performance_logger = logging.getLogger("accounts.performance")
+
+REPLICA_PIN_COOKIE = "primary_pinned_until"
+
+
+class ReplicaMiddleware:
+    """요청마다 replica에서 읽어도 되는지를 결정한다.
+
+    - GET, HEAD 요청만 replica에서 읽는다.
+    - POST 등 쓰기 요청 후에는 REPLICA_STICKY_SECONDS 동안 같은 브라우저의 요청을
+      primary에서 읽도록 쿠키를 남긴다. (read-your-writes)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        use_replica = request.method in ("GET", "HEAD") and not self.is_pinned(request)
+        token = read_from_replica.set(use_replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_from_replica.reset(token)
+
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                str(time.time() + sticky_seconds),
+                max_age=sticky_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def is_pinned(self, request: HttpRequest) -> bool:
+        """최근 쓰기 요청으로 인해 primary에서 읽어야 하는지 확인한다.
+
+        Args:
+            request (HttpRequest): 현재 요청
+
+        Returns:
+            bool: 쓰기 후 REPLICA_STICKY_SECONDS가 지나지 않았으면 True
+        """
+        pinned_until = request.COOKIES.get(REPLICA_PIN_COOKIE)
+        if not pinned_until:
+            return False
+        try:
+            return float(pinned_until) > time.time()
+        except ValueError:
+            return False
+
+
+class ServerTimingMiddleware:
+    """SERVER_TIMING_SAMPLE_RATE 비율의 요청에 대해 구간 별 소요 시간을 측정한다.
+
+    - db: SQL 실행 횟수와 시간 (connection.execute_wrapper)
+    - tpl: template render 시간 (TimedDjangoTemplates)
+    - hash: LoginForm의 비밀번호 검증 시간
+    - total: 이 middleware 안쪽의 전체 처리 시간
+
+    측정 결과는 Server-Timing 헤더와 accounts.performance 로그 한 줄로 남긴다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record_query))
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        response["Server-Timing"] = timings.as_server_timing()
+        performance_logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": timings.query_count,
+                    **{
+                        key: round(value, 2) for key, value in timings.durations.items()
+                    },
+                    "total": round(timings.total, 2),
+                },
+            ),
+        )
+        return response
+
+
+class MetricsMiddleware:
+    """모든 요청의 처리 시간과 SQL 실행 횟수를 url name 별로 metrics registry에 기록한다.
+    METRICS_URL_NAMES에 없는 url은 "other"로 묶는다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        query_count = [0]
+
+        def count_query(execute, sql, params, many, context):
+            query_count[0] += 1
+            return execute(sql, params, many, context)
+
+        started_at = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started_at
+
+        url_name = getattr(request.resolver_match, "url_name", None)
+        if url_name not in settings.METRICS_URL_NAMES:
+            url_name = "other"
+
+        registry.observe(
+            "http_request_duration_seconds",
+            duration,
+            url_name=url_name,
+            method=request.method,
+        )
+        registry.inc(
+            "http_responses_total",
+            url_name=url_name,
+            status=response.status_code,
+        )
+        registry.inc("db_queries_total", query_count[0], url_name=url_name)
+        registry.maybe_flush()
+        return response
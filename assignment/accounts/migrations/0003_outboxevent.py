@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_sharddirectory"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("signup.approved", "가입 승인"),
+                            ("signup.rejected", "가입 거절"),
+                            ("employee.resigned", "퇴사"),
+                            ("employee.updated", "권한 및 정보 수정"),
+                        ],
+                        max_length=30,
+                        verbose_name="이벤트 종류",
+                    ),
+                ),
+                ("user_id", models.BigIntegerField(verbose_name="대상 유저 id")),
+                ("payload", models.JSONField(default=dict, verbose_name="이벤트 내용")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="생성일"),
+                ),
+                (
+                    "dispatched_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="발송일시"),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="발송 시도 횟수"
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="다음 발송 시도 일시"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, default="", verbose_name="마지막 발송 에러"),
+                ),
+            ],
+            options={
+                "verbose_name": "outbox 이벤트",
+                "verbose_name_plural": "outbox 이벤트 목록",
+                "indexes": [
+                    models.Index(
+                        fields=["dispatched_at", "next_attempt_at"],
+                        name="outbox_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
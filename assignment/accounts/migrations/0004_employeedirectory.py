@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:37
+
+from django.db import migrations, models
+
+
+def fill_employee_directory(apps, schema_editor):
+    """기존 임직원을 읽기 모델에 채운다."""
+    using = schema_editor.connection.alias
+    Employee = apps.get_model("accounts", "Employee")
+    EmployeeDirectory = apps.get_model("accounts", "EmployeeDirectory")
+    employees = Employee.objects.using(using).select_related("user")
+    EmployeeDirectory.objects.using(using).bulk_create(
+        [
+            EmployeeDirectory(
+                id=employee.pk,
+                user_id=employee.user_id,
+                email=employee.user.email,
+                username=employee.user.username,
+                authorization_grade=employee.authorization_grade,
+                is_resigned=employee.is_resigned,
+                joined_at=employee.user.created_at,
+                last_login=employee.user.last_login,
+            )
+            for employee in employees.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_outboxevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmployeeDirectory",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="임직원 id"
+                    ),
+                ),
+                ("user_id", models.BigIntegerField(unique=True, verbose_name="유저 id")),
+                ("email", models.EmailField(max_length=254, verbose_name="이메일")),
+                ("username", models.CharField(max_length=50, verbose_name="이름")),
+                (
+                    "authorization_grade",
+                    models.CharField(
+                        choices=[("MS", "마스터"), ("MA", "관리자"), ("ST", "일반")],
+                        max_length=2,
+                        null=True,
+                        verbose_name="등급",
+                    ),
+                ),
+                (
+                    "is_resigned",
+                    models.BooleanField(default=False, verbose_name="퇴사 유무"),
+                ),
+                ("joined_at", models.DateTimeField(verbose_name="가입일시")),
+                (
+                    "last_login",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="최근 로그인일시"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "임직원 목록 읽기 모델",
+                "verbose_name_plural": "임직원 목록 읽기 모델",
+                "indexes": [
+                    models.Index(
+                        fields=["is_resigned", "-id"], name="directory_active_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_employee_directory, migrations.RunPython.noop),
+    ]
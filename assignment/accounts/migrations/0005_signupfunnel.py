@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_employeedirectory"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SignupFunnelDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(unique=True, verbose_name="일자")),
+                (
+                    "signed_up",
+                    models.PositiveIntegerField(default=0, verbose_name="가입 신청"),
+                ),
+                ("approved", models.PositiveIntegerField(default=0, verbose_name="승인")),
+                ("rejected", models.PositiveIntegerField(default=0, verbose_name="거절")),
+                ("resigned", models.PositiveIntegerField(default=0, verbose_name="퇴사")),
+            ],
+            options={
+                "verbose_name": "일자 별 가입 현황",
+                "verbose_name_plural": "일자 별 가입 현황 목록",
+            },
+        ),
+        migrations.CreateModel(
+            name="SignupFunnelTotal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("AW", "대기"),
+                            ("AP", "승인"),
+                            ("RJ", "거절"),
+                            ("RS", "퇴사"),
+                        ],
+                        max_length=2,
+                        unique=True,
+                        verbose_name="상태",
+                    ),
+                ),
+                ("count", models.BigIntegerField(default=0, verbose_name="유저 수")),
+            ],
+            options={
+                "verbose_name": "상태 별 가입 현황",
+                "verbose_name_plural": "상태 별 가입 현황 목록",
+            },
+        ),
+    ]
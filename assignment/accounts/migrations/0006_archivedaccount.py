@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:41
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_signupfunnel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedAccount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_id", models.BigIntegerField(unique=True, verbose_name="유저 id")),
+                (
+                    "email",
+                    models.EmailField(
+                        db_index=True, max_length=254, verbose_name="이메일"
+                    ),
+                ),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[("RJ", "가입 거절"), ("RS", "퇴사")],
+                        max_length=2,
+                        verbose_name="보관 사유",
+                    ),
+                ),
+                ("joined_at", models.DateTimeField(verbose_name="가입일시")),
+                (
+                    "rejected_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="거절일시"),
+                ),
+                (
+                    "resigned_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="퇴사일"),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="보관일시"),
+                ),
+                (
+                    "user_data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name="유저 정보",
+                    ),
+                ),
+                (
+                    "employee_data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="임직원 정보",
+                    ),
+                ),
+                (
+                    "resignation_data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="퇴사 정보",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "보관된 계정",
+                "verbose_name_plural": "보관된 계정 목록",
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_archivedaccount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="version",
+            field=models.PositiveIntegerField(default=0, verbose_name="버전"),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="version",
+            field=models.PositiveIntegerField(default=0, verbose_name="버전"),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="claim_expires_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="검토 점유 만료일시"
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="claimed_by",
+            field=models.BigIntegerField(
+                blank=True, null=True, verbose_name="검토 중인 임직원의 유저 id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["state", "claim_expires_at"], name="signup_queue_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_signup_claim"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Job",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task", models.CharField(max_length=50, verbose_name="작업 이름")),
+                ("kwargs", models.JSONField(default=dict, verbose_name="작업 인자")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QU", "대기"),
+                            ("RU", "실행 중"),
+                            ("DO", "완료"),
+                            ("FA", "실패"),
+                        ],
+                        default="QU",
+                        max_length=2,
+                        verbose_name="상태",
+                    ),
+                ),
+                (
+                    "requested_by",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="요청한 유저 id"
+                    ),
+                ),
+                (
+                    "processed",
+                    models.PositiveIntegerField(default=0, verbose_name="처리한 건수"),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="전체 건수"
+                    ),
+                ),
+                (
+                    "result",
+                    models.FileField(
+                        blank=True, upload_to="exports/", verbose_name="결과 파일"
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="마지막 에러"),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="실행 횟수"),
+                ),
+                (
+                    "locked_until",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="실행 점유 만료일시"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="생성일"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="시작일시"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="종료일시"),
+                ),
+            ],
+            options={
+                "verbose_name": "작업",
+                "verbose_name_plural": "작업 목록",
+                "indexes": [
+                    models.Index(fields=["status", "created_at"], name="job_queue_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0009_job"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outboxevent",
+            name="event_type",
+            field=models.CharField(
+                choices=[
+                    ("signup.created", "가입 신청"),
+                    ("signup.approved", "가입 승인"),
+                    ("signup.rejected", "가입 거절"),
+                    ("employee.resigned", "퇴사"),
+                    ("employee.updated", "권한 및 정보 수정"),
+                ],
+                max_length=30,
+                verbose_name="이벤트 종류",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0010_signup_created_event"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="resignation",
+            name="resigned_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, null=True, verbose_name="퇴사일"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="phone",
+            field=models.CharField(db_index=True, max_length=11, verbose_name="연락처"),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="username",
+            field=models.CharField(db_index=True, max_length=50, verbose_name="이름"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["created_at"], name="user_created_idx"),
+        ),
+    ]
@@ -2,16 +2,26 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.base_user import BaseUserManager
 from django.utils import timezone
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F
 
+from accounts.sharding import (
+    ShardedQuerySet,
+    allocate_user_id,
+    is_sharding_enabled,
+)
 
-class UserManager(BaseUserManager):
+
+class UserManager(BaseUserManager.from_queryset(ShardedQuerySet)):
     def _create_user(self, email, password, **extra_fields):
         if not email:
             raise ValueError("이메일을 반드시 입력해야합니다.")
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
+        if is_sharding_enabled() and user.pk is None:
+            user.pk = allocate_user_id(email)
         user.save(using=self._db)
         return user
 
@@ -40,17 +50,101 @@ class BaseModel(models.Model):
         abstract = True
 
 
-class User(AbstractUser, BaseModel):
+class VersionConflict(Exception):
+    """다른 요청이 먼저 저장해서 version이 달라진 경우 발생한다."""
+
+
+class VersionedModel(models.Model):
+    """저장할 때마다 version을 1 올리는 모델 (낙관적 동시성 제어)
+    - save(): UPDATE 시 version = version + 1 을 함께 저장한다.
+    - save_with_version(): 화면에서 읽었던 version과 DB의 version이 같을 때만
+      UPDATE ... WHERE version = ? 으로 저장하고, 다르면 VersionConflict를 발생시킨다.
+    - version_exempt_fields만 저장하는 경우(예: 최근 로그인일시)는 version을 올리지 않는다.
+    - save_without_version(): 화면의 수정과 충돌하지 않는 내부 갱신(예: 로그인 시 비밀번호
+      재해싱)을 version을 올리지 않고 저장한다.
+    """
+
+    version = models.PositiveIntegerField(verbose_name="버전", default=0)
+
+    version_exempt_fields = frozenset()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            keep_version = getattr(self, "_keep_version", False)
+            if not keep_version and not update_fields <= self.version_exempt_fields:
+                update_fields.add("version")
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+    def save_with_version(self, expected_version: int, update_fields: list) -> None:
+        """expected_version으로 읽은 값을 기준으로 수정한 필드를 저장한다.
+
+        Args:
+            expected_version (int): 수정 화면을 열었을 때의 version
+            update_fields (list): 저장할 필드 이름 목록
+
+        Raises:
+            VersionConflict: 그 사이에 다른 요청이 저장한 경우 발생
+        """
+        self._expected_version = expected_version
+        try:
+            self.save(update_fields=update_fields)
+        finally:
+            self._expected_version = None
+        self.version = expected_version + 1
+
+    def save_without_version(self, update_fields: list) -> None:
+        """update_fields만 저장하고 version은 올리지 않는다.
+
+        Args:
+            update_fields (list): 저장할 필드 이름 목록
+        """
+        self._keep_version = True
+        try:
+            self.save(update_fields=update_fields)
+        finally:
+            self._keep_version = False
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        values = [
+            (field, model, F("version") + 1 if field.name == "version" else value)
+            for field, model, value in values
+        ]
+        expected_version = getattr(self, "_expected_version", None)
+        if expected_version is not None:
+            base_qs = base_qs.filter(version=expected_version)
+
+        updated = super()._do_update(
+            base_qs,
+            using,
+            pk_val,
+            values,
+            update_fields,
+            forced_update,
+        )
+        if expected_version is not None and not updated:
+            raise VersionConflict
+        return updated
+
+
+class User(AbstractUser, BaseModel, VersionedModel):
     class StateChoices(models.TextChoices):
         AWAIT = "AW", "대기"
         APPROVAL = "AP", "승인"
         REJECTED = "RJ", "거절"
 
     email = models.EmailField(verbose_name="이메일", unique=True)
-    username = models.CharField(verbose_name="이름", max_length=50)
+    # admin 검색(startswith)에 사용하는 컬럼은 index를 둔다.
+    username = models.CharField(verbose_name="이름", max_length=50, db_index=True)
     phone = models.CharField(
         verbose_name="연락처",
         max_length=11,
+        db_index=True,
     )
     state = models.CharField(
         verbose_name="회원가입 상태",
@@ -69,9 +163,23 @@ class User(AbstractUser, BaseModel):
         null=True,
         max_length=50,
     )
+    claimed_by = models.BigIntegerField(
+        verbose_name="검토 중인 임직원의 유저 id",
+        blank=True,
+        null=True,
+    )
+    claim_expires_at = models.DateTimeField(
+        verbose_name="검토 점유 만료일시",
+        blank=True,
+        null=True,
+    )
 
     objects = UserManager()
 
+    # 로그인 시 갱신하는 최근 로그인일시는 수정 충돌로 보지 않는다.
+    # 다시 해싱한 비밀번호는 verify_password가 save_without_version으로 저장한다.
+    version_exempt_fields = frozenset({"last_login"})
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
@@ -81,6 +189,13 @@ class User(AbstractUser, BaseModel):
     class Meta:
         verbose_name = "회원가입 내역"
         verbose_name_plural = "회원가입 내역 목록"
+        indexes = [
+            models.Index(
+                fields=["state", "claim_expires_at"],
+                name="signup_queue_idx",
+            ),
+            models.Index(fields=["created_at"], name="user_created_idx"),
+        ]
 
     def get_password(self) -> str:
         """User object의 패스워드를 반환한다.
@@ -101,7 +216,7 @@ class User(AbstractUser, BaseModel):
         return True
 
 
-class Employee(models.Model):
+class Employee(VersionedModel):
     class AuthorizationGradeChoices(models.TextChoices):
         MASTER = "MS", "마스터"
         MANAGER = "MA", "관리자"
@@ -143,6 +258,8 @@ class Employee(models.Model):
         default=False,
     )
 
+    objects = ShardedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.authorization_grade} ({self.signup_approval_authorization})"
 
@@ -158,7 +275,14 @@ class Resignation(models.Model):
         on_delete=models.CASCADE,
     )
     reason_for_resignation = models.CharField(verbose_name="퇴사 사유", max_length=50)
-    resigned_at = models.DateTimeField(verbose_name="퇴사일", blank=True, null=True)
+    resigned_at = models.DateTimeField(
+        verbose_name="퇴사일",
+        blank=True,
+        null=True,
+        db_index=True,
+    )
+
+    objects = ShardedQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.resigned_user} ({self.resigned_at})"
@@ -166,3 +290,240 @@ class Resignation(models.Model):
     class Meta:
         verbose_name = "퇴사자"
         verbose_name_plural = "퇴사자 목록"
+
+
+class EmployeeDirectory(models.Model):
+    """회원 목록 화면에 필요한 컬럼만 가진 Employee, User의 비정규화 읽기 모델
+    pk는 Employee의 pk와 같고, accounts.directory의 signal receiver가 Employee와 User 저장 시
+    함께 갱신한다. 어긋난 경우 rebuild_employee_directory 명령어로 다시 만든다.
+    """
+
+    id = models.BigIntegerField(verbose_name="임직원 id", primary_key=True)
+    user_id = models.BigIntegerField(verbose_name="유저 id", unique=True)
+    email = models.EmailField(verbose_name="이메일")
+    username = models.CharField(verbose_name="이름", max_length=50)
+    authorization_grade = models.CharField(
+        verbose_name="등급",
+        max_length=2,
+        choices=Employee.AuthorizationGradeChoices.choices,
+        null=True,
+    )
+    is_resigned = models.BooleanField(verbose_name="퇴사 유무", default=False)
+    joined_at = models.DateTimeField(verbose_name="가입일시")
+    last_login = models.DateTimeField(verbose_name="최근 로그인일시", blank=True, null=True)
+
+    objects = ShardedQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.email} ({self.authorization_grade})"
+
+    class Meta:
+        verbose_name = "임직원 목록 읽기 모델"
+        verbose_name_plural = "임직원 목록 읽기 모델"
+        indexes = [
+            models.Index(
+                fields=["is_resigned", "-id"],
+                name="directory_active_idx",
+            ),
+        ]
+
+
+class SignupFunnelDaily(models.Model):
+    """일자 별 가입 신청, 승인, 거절, 퇴사 건수
+    accounts.funnel이 상태 변경과 같은 transaction 안에서 값을 1씩 증가시킨다.
+    """
+
+    day = models.DateField(verbose_name="일자", unique=True)
+    signed_up = models.PositiveIntegerField(verbose_name="가입 신청", default=0)
+    approved = models.PositiveIntegerField(verbose_name="승인", default=0)
+    rejected = models.PositiveIntegerField(verbose_name="거절", default=0)
+    resigned = models.PositiveIntegerField(verbose_name="퇴사", default=0)
+
+    def __str__(self):
+        return f"{self.day}"
+
+    class Meta:
+        verbose_name = "일자 별 가입 현황"
+        verbose_name_plural = "일자 별 가입 현황 목록"
+
+
+class SignupFunnelTotal(models.Model):
+    """현재 상태 별 유저 수 (대기, 승인, 거절, 퇴사)"""
+
+    class StateChoices(models.TextChoices):
+        AWAIT = "AW", "대기"
+        APPROVAL = "AP", "승인"
+        REJECTED = "RJ", "거절"
+        RESIGNED = "RS", "퇴사"
+
+    state = models.CharField(
+        verbose_name="상태",
+        max_length=2,
+        choices=StateChoices.choices,
+        unique=True,
+    )
+    count = models.BigIntegerField(verbose_name="유저 수", default=0)
+
+    def __str__(self):
+        return f"{self.state} ({self.count})"
+
+    class Meta:
+        verbose_name = "상태 별 가입 현황"
+        verbose_name_plural = "상태 별 가입 현황 목록"
+
+
+class ArchivedAccount(models.Model):
+    """보관 기간이 지나 hot 테이블(User, Employee, Resignation)에서 옮겨진 계정
+    원래 행의 모든 컬럼을 json으로 보관하고, accounts.archive.restore로 되돌린다.
+    """
+
+    class ReasonChoices(models.TextChoices):
+        REJECTED = "RJ", "가입 거절"
+        RESIGNED = "RS", "퇴사"
+
+    user_id = models.BigIntegerField(verbose_name="유저 id", unique=True)
+    email = models.EmailField(verbose_name="이메일", db_index=True)
+    reason = models.CharField(
+        verbose_name="보관 사유",
+        max_length=2,
+        choices=ReasonChoices.choices,
+    )
+    joined_at = models.DateTimeField(verbose_name="가입일시")
+    rejected_at = models.DateTimeField(verbose_name="거절일시", blank=True, null=True)
+    resigned_at = models.DateTimeField(verbose_name="퇴사일", blank=True, null=True)
+    archived_at = models.DateTimeField(verbose_name="보관일시", auto_now_add=True)
+    user_data = models.JSONField(verbose_name="유저 정보", encoder=DjangoJSONEncoder)
+    employee_data = models.JSONField(
+        verbose_name="임직원 정보",
+        encoder=DjangoJSONEncoder,
+        null=True,
+    )
+    resignation_data = models.JSONField(
+        verbose_name="퇴사 정보",
+        encoder=DjangoJSONEncoder,
+        null=True,
+    )
+
+    def __str__(self):
+        return f"{self.email} ({self.reason})"
+
+    class Meta:
+        verbose_name = "보관된 계정"
+        verbose_name_plural = "보관된 계정 목록"
+
+
+class Job(models.Model):
+    """요청 밖에서 실행할 작업 (DB 기반 작업 큐)
+    accounts.jobs.enqueue로 등록하고 run_jobs 명령어 또는 프로세스 안의 worker thread가
+    accounts.tasks에 등록된 함수를 실행한다.
+    """
+
+    class StatusChoices(models.TextChoices):
+        QUEUED = "QU", "대기"
+        RUNNING = "RU", "실행 중"
+        DONE = "DO", "완료"
+        FAILED = "FA", "실패"
+
+    task = models.CharField(verbose_name="작업 이름", max_length=50)
+    kwargs = models.JSONField(verbose_name="작업 인자", default=dict)
+    status = models.CharField(
+        verbose_name="상태",
+        max_length=2,
+        choices=StatusChoices.choices,
+        default=StatusChoices.QUEUED,
+    )
+    requested_by = models.BigIntegerField(
+        verbose_name="요청한 유저 id",
+        blank=True,
+        null=True,
+    )
+    processed = models.PositiveIntegerField(verbose_name="처리한 건수", default=0)
+    total = models.PositiveIntegerField(verbose_name="전체 건수", blank=True, null=True)
+    result = models.FileField(verbose_name="결과 파일", upload_to="exports/", blank=True)
+    error = models.TextField(verbose_name="마지막 에러", blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(verbose_name="실행 횟수", default=0)
+    locked_until = models.DateTimeField(
+        verbose_name="실행 점유 만료일시",
+        blank=True,
+        null=True,
+    )
+    created_at = models.DateTimeField(verbose_name="생성일", auto_now_add=True)
+    started_at = models.DateTimeField(verbose_name="시작일시", blank=True, null=True)
+    finished_at = models.DateTimeField(verbose_name="종료일시", blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
+
+    class Meta:
+        verbose_name = "작업"
+        verbose_name_plural = "작업 목록"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="job_queue_idx"),
+        ]
+
+    @property
+    def progress(self) -> int:
+        """진행률(%)"""
+        if self.status == self.StatusChoices.DONE:
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.processed * 100 // self.total)
+
+
+class ShardDirectory(models.Model):
+    """샤딩 사용 시 default DB에서 전역 user_id를 발급하고 이메일의 유일성을 보장한다.
+    pk가 곧 User의 pk가 되며, 이메일로 User가 저장된 shard를 찾을 때 사용한다.
+    """
+
+    email = models.EmailField(verbose_name="이메일", unique=True)
+    created_at = models.DateTimeField(verbose_name="생성일", auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.email} ({self.pk})"
+
+    class Meta:
+        verbose_name = "샤드 디렉터리"
+        verbose_name_plural = "샤드 디렉터리 목록"
+
+
+class OutboxEvent(models.Model):
+    """계정 상태 변경 이벤트를 상태 변경과 같은 transaction 안에서 기록하는 outbox
+    dispatch_outbox 명령어가 미발송 이벤트를 묶어서 외부 시스템에 전달한다.
+    """
+
+    class EventTypeChoices(models.TextChoices):
+        SIGNUP_CREATED = "signup.created", "가입 신청"
+        SIGNUP_APPROVED = "signup.approved", "가입 승인"
+        SIGNUP_REJECTED = "signup.rejected", "가입 거절"
+        EMPLOYEE_RESIGNED = "employee.resigned", "퇴사"
+        EMPLOYEE_UPDATED = "employee.updated", "권한 및 정보 수정"
+
+    event_type = models.CharField(
+        verbose_name="이벤트 종류",
+        max_length=30,
+        choices=EventTypeChoices.choices,
+    )
+    user_id = models.BigIntegerField(verbose_name="대상 유저 id")
+    payload = models.JSONField(verbose_name="이벤트 내용", default=dict)
+    created_at = models.DateTimeField(verbose_name="생성일", auto_now_add=True)
+    dispatched_at = models.DateTimeField(verbose_name="발송일시", blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(verbose_name="발송 시도 횟수", default=0)
+    next_attempt_at = models.DateTimeField(
+        verbose_name="다음 발송 시도 일시",
+        default=timezone.now,
+    )
+    last_error = models.TextField(verbose_name="마지막 발송 에러", blank=True, default="")
+
+    def __str__(self):
+        return f"{self.event_type} ({self.user_id})"
+
+    class Meta:
+        verbose_name = "outbox 이벤트"
+        verbose_name_plural = "outbox 이벤트 목록"
+        indexes = [
+            models.Index(
+                fields=["dispatched_at", "next_attempt_at"],
+                name="outbox_pending_idx",
+            ),
+        ]
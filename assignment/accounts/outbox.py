@@ -0,0 +1,144 @@
+import json
+import logging
+import urllib.request
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from accounts.models import OutboxEvent
+from accounts.sharding import get_user_databases
+
+
+logger = logging.getLogger(__name__)
+
+
+def record_event(event_type: str, user, payload: dict = None) -> OutboxEvent:
+    """상태 변경과 같은 DB, 같은 transaction 안에서 outbox 이벤트를 저장한다.
+        호출하는 쪽에서 transaction.atomic(using=user._state.db)으로 감싸야 한다.
+
+    Args:
+        event_type (str): OutboxEvent.EventTypeChoices 중 하나
+        user (User): 상태가 변경된 유저
+        payload (dict): 이벤트에 함께 보낼 값
+
+    Returns:
+        OutboxEvent: 저장된 이벤트
+    """
+    event = OutboxEvent(
+        event_type=event_type,
+        user_id=user.pk,
+        payload={"email": user.email, "state": user.state, **(payload or {})},
+    )
+    event.save(using=user._state.db or "default")
+    return event
+
+
+def serialize_event(event: OutboxEvent) -> dict:
+    return {
+        "id": event.pk,
+        "event_type": event.event_type,
+        "user_id": event.user_id,
+        "payload": event.payload,
+        "created_at": event.created_at.isoformat(),
+    }
+
+
+def log_handler(events: list) -> None:
+    """이벤트를 로그로 남긴다. OUTBOX_HANDLER의 기본값"""
+    for event in events:
+        logger.info("outbox event %s", json.dumps(event, ensure_ascii=False))
+
+
+def webhook_handler(events: list) -> None:
+    """OUTBOX_WEBHOOK_URL로 이벤트 묶음을 한 번의 POST 요청으로 보낸다.
+
+    Args:
+        events (list): serialize_event로 변환된 이벤트 목록
+    """
+    request = urllib.request.Request(
+        settings.OUTBOX_WEBHOOK_URL,
+        data=json.dumps({"events": events}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        response.read()
+
+
+def claim_batch(using: str, batch_size: int, now) -> list:
+    """발송 대기 중인 이벤트를 batch_size 개 골라 OUTBOX_LEASE_SECONDS 동안 점유한다.
+        next_attempt_at을 점유 만료일시로 미루고 바로 commit 하므로 다른 worker는
+        같은 이벤트를 가져가지 않고, 발송 중에 worker가 죽으면 만료 후 다시 발송된다.
+
+    Returns:
+        list: 점유한 이벤트 목록
+    """
+    with transaction.atomic(using=using):
+        events = list(
+            OutboxEvent.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .filter(
+                dispatched_at__isnull=True,
+                next_attempt_at__lte=now,
+                attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by("id")[:batch_size],
+        )
+        if events:
+            OutboxEvent.objects.using(using).filter(
+                pk__in=[event.pk for event in events],
+            ).update(
+                next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+            )
+    return events
+
+
+def dispatch_batch(using: str = None, batch_size: int = None) -> int:
+    """발송 대기 중인 이벤트를 batch_size 만큼 묶어서 OUTBOX_HANDLER로 전달한다.
+        - 이벤트를 점유하는 transaction을 commit한 뒤 handler를 호출하므로
+          외부 요청을 기다리는 동안 outbox 테이블의 lock을 잡지 않는다.
+        - 발송에 성공하면 묶음 전체의 dispatched_at을 한 번의 UPDATE로 기록한다.
+        - 실패하면 attempts를 늘리고 지수 백오프로 next_attempt_at을 미룬다.
+        - OUTBOX_MAX_ATTEMPTS 번 실패한 이벤트는 더 이상 발송하지 않는다.
+
+    Args:
+        using (str): outbox 테이블이 있는 database alias (기본값: 모든 유저 database)
+        batch_size (int): database 별로 한 번에 발송할 이벤트 수
+
+    Returns:
+        int: 발송에 성공한 이벤트 수
+    """
+    if using is None:
+        return sum(dispatch_batch(using, batch_size) for using in get_user_databases())
+
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    handler = import_string(settings.OUTBOX_HANDLER)
+    now = timezone.now()
+
+    events = claim_batch(using, batch_size, now)
+    if not events:
+        return 0
+
+    try:
+        handler([serialize_event(event) for event in events])
+    except Exception as error:
+        logger.warning("outbox dispatch failed: %s", error)
+        for event in events:
+            event.attempts += 1
+            event.next_attempt_at = now + timedelta(
+                seconds=settings.OUTBOX_RETRY_BACKOFF * 2 ** (event.attempts - 1),
+            )
+            event.last_error = repr(error)
+        OutboxEvent.objects.using(using).bulk_update(
+            events,
+            ["attempts", "next_attempt_at", "last_error"],
+        )
+        return 0
+
+    OutboxEvent.objects.using(using).filter(
+        pk__in=[event.pk for event in events],
+    ).update(dispatched_at=timezone.now())
+    return len(events)
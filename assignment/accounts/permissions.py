@@ -0,0 +1,146 @@
+from itertools import product
+
+from accounts.models import Employee
+
+
+MASTER = Employee.AuthorizationGradeChoices.MASTER
+MANAGER = Employee.AuthorizationGradeChoices.MANAGER
+STAFF = Employee.AuthorizationGradeChoices.STAFF
+# 등급이 없는 임직원(관리자가 승인한 임직원)과 아직 임직원이 아닌 가입 신청 유저
+NO_GRADE = None
+GRADES = (MASTER, MANAGER, STAFF, NO_GRADE)
+
+REFUSE = "refuse"
+RESIGN = "resign"
+UPDATE = "update"
+ACTIONS = (REFUSE, RESIGN, UPDATE)
+
+USER_FIELDS = ("username", "phone")
+AUTHORIZATION_FIELDS = (
+    "signup_approval_authorization",
+    "list_read_authorization",
+    "update_authorization",
+    "resign_authorization",
+)
+# 회원 상세 화면에서 수정하는 Employee, User 필드
+EMPLOYEE_FIELDS = ("authorization_grade", *AUTHORIZATION_FIELDS)
+UPDATE_FIELDS = (*EMPLOYEE_FIELDS, *USER_FIELDS)
+
+# 권한 정책 표: (현재 임직원 등급, 대상 등급, 행동, 필드, 현재 임직원에게 필요한 권한)
+# - 필드가 없는 행동(거절, 탈퇴)은 필드를 None으로 둔다.
+# - 필요한 권한이 None이면 등급만으로 허용한다.
+# - 표에 없는 조합은 모두 허용하지 않는다.
+POLICY = [
+    # 마스터는 모든 대상을 거절, 탈퇴시킬 수 있고 모든 필드를 수정할 수 있다.
+    (MASTER, GRADES, REFUSE, None, None),
+    (MASTER, GRADES, RESIGN, None, None),
+    (MASTER, GRADES, UPDATE, UPDATE_FIELDS, None),
+    # 수정 권한이 있는 관리자는 마스터가 아닌 임직원의 이름과 전화번호를 수정할 수 있다.
+    (
+        MANAGER,
+        (MANAGER, STAFF, NO_GRADE),
+        UPDATE,
+        USER_FIELDS,
+        "update_authorization",
+    ),
+    # 관리자는 일반 등급 임직원의 권한을 수정할 수 있다.
+    (MANAGER, (STAFF,), UPDATE, AUTHORIZATION_FIELDS, None),
+]
+
+
+def compile_policy(policy: list) -> dict:
+    """권한 정책 표를 (현재 등급, 대상 등급, 행동, 필드) 를 key로 하는 dict로 펼친다.
+        대상 등급과 필드는 여러 개를 묶어서 적을 수 있다.
+
+    Args:
+        policy (list): POLICY 형식의 정책 표
+
+    Raises:
+        ValueError: 같은 조합이 서로 다른 조건으로 두 번 적혀 있는 경우 발생
+
+    Returns:
+        dict: 허용하는 조합 별 현재 임직원에게 필요한 권한 (없으면 None)
+    """
+    compiled = {}
+    for actor_grade, target_grades, action, fields, required in policy:
+        for target_grade, field in product(target_grades, fields or (None,)):
+            key = (actor_grade, target_grade, action, field)
+            if key in compiled and compiled[key] != required:
+                raise ValueError(f"권한 정책이 중복되었습니다: {key}")
+            compiled[key] = required
+    return compiled
+
+
+PERMISSIONS = compile_policy(POLICY)
+
+
+def is_allowed(
+    actor: Employee, target_grade: str, action: str, field: str = None
+) -> bool:
+    """현재 임직원이 target_grade 등급의 대상에게 action을 할 수 있는지 확인한다.
+
+    Args:
+        actor (Employee): 현재 로그인된 임직원
+        target_grade (str): 대상 임직원의 등급, 임직원이 아니면 None
+        action (str): REFUSE, RESIGN, UPDATE 중 하나
+        field (str): UPDATE인 경우 수정할 필드 이름
+
+    Returns:
+        bool: 허용하면 True
+    """
+    key = (actor.authorization_grade, target_grade, action, field)
+    if key not in PERMISSIONS:
+        return False
+    required = PERMISSIONS[key]
+    return required is None or getattr(actor, required)
+
+
+def get_allowed_fields(actor: Employee, target_grade: str) -> set:
+    """현재 임직원이 target_grade 등급의 대상에게서 수정할 수 있는 필드 목록"""
+    return {
+        field
+        for field in UPDATE_FIELDS
+        if is_allowed(actor, target_grade, UPDATE, field)
+    }
+
+
+def can_review_signup(actor: Employee) -> bool:
+    """가입 신청을 승인, 거절할 수 있는지 확인한다.
+    가입 승인 권한이 있는 마스터와 관리자만 허용한다.
+
+    Args:
+        actor (Employee): 현재 로그인된 임직원, 임직원이 아니면 None
+
+    Returns:
+        bool: 허용하면 True
+    """
+    return (
+        actor is not None
+        and actor.authorization_grade in (MASTER, MANAGER)
+        and actor.signup_approval_authorization
+    )
+
+
+def evaluate_batch(
+    actor: Employee, targets: list, action: str, field: str = None
+) -> dict:
+    """여러 대상에 대한 허용 여부를 한 번에 계산한다. 등급 별로 한 번만 판단한다.
+        UPDATE에서 필드를 주지 않으면 수정할 수 있는 필드가 하나라도 있는지 판단한다.
+
+    Args:
+        actor (Employee): 현재 로그인된 임직원
+        targets (list): 대상 목록, authorization_grade가 없는 대상은 None 등급으로 본다.
+        action (str): REFUSE, RESIGN, UPDATE 중 하나
+        field (str): UPDATE인 경우 수정할 필드 이름
+
+    Returns:
+        dict: 대상의 pk 별 허용 여부
+    """
+    if action == UPDATE and field is None:
+        decisions = {grade: bool(get_allowed_fields(actor, grade)) for grade in GRADES}
+    else:
+        decisions = {grade: is_allowed(actor, grade, action, field) for grade in GRADES}
+    return {
+        target.pk: decisions[getattr(target, "authorization_grade", NO_GRADE)]
+        for target in targets
+    }
@@ -0,0 +1,95 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpRequest
+
+from accounts.metrics import record_cache_access
+
+
+_lock = threading.Lock()
+
+
+class TokenBucket:
+    """cache에 (남은 토큰 수, 마지막 갱신 시각)을 저장하는 token bucket
+
+    - capacity: 한 번에 허용하는 최대 시도 횟수
+    - refill_rate: 초당 채워지는 토큰 수
+    - cache에 update가 있으면(SharedMemoryCache) 읽고 쓰기를 cache의 lock 안에서 해서
+      여러 worker 프로세스가 같은 bucket을 사용해도 토큰을 중복으로 쓰지 않는다.
+    """
+
+    def __init__(self, name: str, capacity: int, refill_rate: float) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.timeout = math.ceil(capacity / refill_rate)
+
+    def get_cache_key(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return f"ratelimit:{self.name}:{digest}"
+
+    def consume(self, key: str) -> bool:
+        """key의 bucket에서 토큰 1개를 사용한다.
+
+        Args:
+            key (str): IP 또는 이메일
+
+        Returns:
+            bool: 토큰이 남아 있으면 True, 없으면 False
+        """
+        cache = caches[settings.LOGIN_RATE_LIMIT_CACHE]
+        cache_key = self.get_cache_key(key)
+        now = time.time()
+        result = {}
+
+        def take(state):
+            result["hit"] = state is not None
+            tokens, updated_at = state or (self.capacity, now)
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+            result["allowed"] = tokens >= 1
+            if result["allowed"]:
+                tokens -= 1
+            return (tokens, now)
+
+        if hasattr(cache, "update"):
+            cache.update(cache_key, take, timeout=self.timeout)
+        else:
+            # 프로세스 안에서만 공유되는 cache(LocMemCache 등)는 thread lock으로 충분하다.
+            with _lock:
+                cache.set(cache_key, take(cache.get(cache_key)), timeout=self.timeout)
+        record_cache_access(settings.LOGIN_RATE_LIMIT_CACHE, result["hit"])
+        return result["allowed"]
+
+
+def get_client_ip(request: HttpRequest) -> str:
+    """LOGIN_RATE_LIMIT_IP_HEADER에서 클라이언트 IP를 얻는다.
+    X-Forwarded-For처럼 여러 값이 있으면 첫 번째 값을 사용한다.
+    """
+    value = request.META.get(settings.LOGIN_RATE_LIMIT_IP_HEADER, "")
+    return value.split(",")[0].strip()
+
+
+def allow_login_attempt(request: HttpRequest, email: str) -> bool:
+    """IP와 이메일 bucket 모두에 토큰이 남아 있을 때만 로그인 시도를 허용한다.
+        비밀번호 해싱과 DB 조회 전에 호출해야 한다.
+
+    Args:
+        request (HttpRequest): 로그인 요청
+        email (str): 입력된 이메일
+
+    Returns:
+        bool: 허용되면 True, 차단되면 False
+    """
+    if not settings.LOGIN_RATE_LIMIT_ENABLED:
+        return True
+
+    ip_bucket = TokenBucket("login-ip", **settings.LOGIN_RATE_LIMIT["ip"])
+    email_bucket = TokenBucket("login-email", **settings.LOGIN_RATE_LIMIT["email"])
+
+    return ip_bucket.consume(get_client_ip(request)) and email_bucket.consume(
+        (email or "").strip().lower(),
+    )
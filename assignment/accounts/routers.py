@@ -0,0 +1,145 @@
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from accounts.sharding import get_shard_key, is_sharding_enabled, shard_for_user_id
+
+
+PRIMARY_DATABASE = "default"
+
+# 현재 요청이 replica에서 읽어도 되는지를 나타낸다. ReplicaMiddleware가 설정한다.
+read_from_replica = contextvars.ContextVar("read_from_replica", default=False)
+
+# replica alias 별 (측정 시각, 지연 시간(초))
+_replica_lag_cache = {}
+
+
+def get_replica_lag(alias: str) -> float:
+    """replica의 복제 지연 시간(초)을 반환한다.
+        PostgreSQL replica만 지연 시간을 측정하고, 그 외 DB는 0으로 본다.
+        측정 결과는 REPLICA_LAG_CHECK_INTERVAL 동안 재사용한다.
+
+    Args:
+        alias (str): DATABASES에 등록된 replica alias
+
+    Returns:
+        float: 복제 지연 시간(초)
+    """
+    interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 5)
+    checked_at, lag = _replica_lag_cache.get(alias, (0, 0.0))
+    if time.monotonic() - checked_at < interval:
+        return lag
+
+    connection = connections[alias]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE("
+                "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)",
+            )
+            lag = float(cursor.fetchone()[0])
+    else:
+        lag = 0.0
+
+    _replica_lag_cache[alias] = (time.monotonic(), lag)
+    return lag
+
+
+def get_available_replicas() -> list:
+    """REPLICA_MAX_LAG_SECONDS 이내로 따라온 replica alias 목록을 반환한다.
+
+    Returns:
+        list: 읽기에 사용할 수 있는 replica alias 목록
+    """
+    max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", None)
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    if max_lag is None:
+        return list(replicas)
+    return [alias for alias in replicas if get_replica_lag(alias) <= max_lag]
+
+
+class ReplicaRouter:
+    """GET 요청의 읽기는 replica로, 그 외 읽기와 모든 쓰기는 primary로 보낸다.
+
+    - replica가 없거나 모두 REPLICA_MAX_LAG_SECONDS를 넘게 지연되면 primary에서 읽는다.
+    - 자신의 POST 직후에는 ReplicaMiddleware가 read_from_replica를 False로 두어
+      방금 쓴 데이터를 primary에서 읽는다.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not read_from_replica.get():
+            return PRIMARY_DATABASE
+
+        replicas = get_available_replicas()
+        if not replicas:
+            return PRIMARY_DATABASE
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY_DATABASE, *getattr(settings, "DATABASE_REPLICAS", [])}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ShardRouter:
+    """DATABASE_SHARDS가 설정되어 있을 때 User와 User에 딸린 모델(Employee, Resignation,
+    EmployeeDirectory, ArchivedAccount) 인스턴스를 같은 user_id 기준의 shard로 보낸다.
+
+    - 인스턴스 hint가 없는 쿼리는 다음 router(ReplicaRouter)에 맡긴다.
+    - ShardDirectory는 default DB에만 존재한다.
+    """
+
+    sharded_models = {
+        "user",
+        "employee",
+        "resignation",
+        "employeedirectory",
+        "archivedaccount",
+    }
+
+    def get_shard(self, model, **hints):
+        if not is_sharding_enabled():
+            return None
+        if model._meta.app_label != "accounts":
+            return None
+        if model._meta.model_name not in self.sharded_models:
+            return None
+
+        instance = hints.get("instance")
+        if instance is None:
+            return None
+        if instance._state.db in settings.DATABASE_SHARDS:
+            return instance._state.db
+
+        user_id = get_shard_key(instance)
+        if user_id is None:
+            return None
+        return shard_for_user_id(user_id)
+
+    def db_for_read(self, model, **hints):
+        return self.get_shard(model, **hints)
+
+    def db_for_write(self, model, **hints):
+        return self.get_shard(model, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not is_sharding_enabled():
+            return None
+        shards = settings.DATABASE_SHARDS
+        if obj1._state.db in shards and obj2._state.db in shards:
+            return obj1._state.db == obj2._state.db
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not is_sharding_enabled() or app_label != "accounts":
+            return None
+        if model_name == "sharddirectory":
+            return db == PRIMARY_DATABASE
+        return None
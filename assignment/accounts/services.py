@@ -0,0 +1,247 @@
+from django.db import models, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.funnel import record_resignation, record_state_changes
+from accounts.models import Employee, EmployeeDirectory, OutboxEvent, Resignation, User
+from accounts.outbox import record_event
+
+
+def as_list(targets) -> list:
+    """모델 인스턴스 하나 또는 여러 개를 pk가 중복되지 않는 list로 바꾼다."""
+    if isinstance(targets, models.Model):
+        return [targets]
+    return list({target.pk: target for target in targets}.values())
+
+
+def group_by_database(instances: list) -> dict:
+    """인스턴스를 저장된 database alias 별로 나눈다. 샤딩 시 shard 별로 transaction을 연다."""
+    groups = {}
+    for instance in instances:
+        using = instance._state.db or router.db_for_write(type(instance))
+        groups.setdefault(using, []).append(instance)
+    return groups
+
+
+def lock_users(using: str, users: list, states: list) -> dict:
+    """users 중 아직 states 상태인 유저를 잠그고 DB에 저장된 상태를 반환한다.
+    다른 요청이 먼저 처리한 유저는 빠진다.
+
+    Returns:
+        dict: 잠근 유저의 pk 별 변경 전 상태
+    """
+    return dict(
+        User.objects.using(using)
+        .select_for_update()
+        .filter(pk__in=[user.pk for user in users], state__in=states)
+        .values_list("pk", "state"),
+    )
+
+
+def approve(users, authorizations: dict = None) -> list:
+    """가입 대기 유저를 승인하고 임직원으로 등록한다.
+        database 마다 하나의 transaction으로 처리하고, 유저 상태는 한 번의 UPDATE로 바꾼다.
+
+    Args:
+        users (User | list): 승인할 유저 또는 유저 목록
+        authorizations (dict): 임직원에게 줄 등급과 권한 (없으면 모델 기본값)
+
+    Returns:
+        list: 등록된 Employee 목록, 이미 처리된 유저는 제외된다.
+    """
+    employees = []
+    for using, batch in group_by_database(as_list(users)).items():
+        with transaction.atomic(using=using):
+            previous_states = lock_users(using, batch, [User.StateChoices.AWAIT])
+            if not previous_states:
+                continue
+
+            User.objects.using(using).filter(pk__in=previous_states).update(
+                state=User.StateChoices.APPROVAL,
+                claimed_by=None,
+                claim_expires_at=None,
+                version=F("version") + 1,
+            )
+            for user in batch:
+                if user.pk not in previous_states:
+                    continue
+                user.state = User.StateChoices.APPROVAL
+                user.claimed_by = user.claim_expires_at = None
+                employee = Employee.objects.create(
+                    user_id=user.pk,
+                    **(authorizations or {}),
+                )
+                record_event(
+                    OutboxEvent.EventTypeChoices.SIGNUP_APPROVED,
+                    user,
+                    {"authorization_grade": employee.authorization_grade},
+                )
+                employees.append(employee)
+            record_state_changes(
+                using,
+                User.StateChoices.APPROVAL,
+                list(previous_states.values()),
+            )
+    return employees
+
+
+def reject(users, reason_for_refusal: str) -> list:
+    """가입 대기 또는 거절된 유저의 가입 신청을 거절한다. (거절 사유와 거절일시를 다시 기록한다.)
+        database 마다 하나의 transaction과 한 번의 UPDATE로 처리한다.
+
+    Args:
+        users (User | list): 거절할 유저 또는 유저 목록
+        reason_for_refusal (str): 거절 사유
+
+    Returns:
+        list: 거절된 유저 목록, 이미 승인된 유저는 제외된다.
+    """
+    rejected = []
+    rejected_at = timezone.now()
+    for using, batch in group_by_database(as_list(users)).items():
+        with transaction.atomic(using=using):
+            previous_states = lock_users(
+                using,
+                batch,
+                [User.StateChoices.AWAIT, User.StateChoices.REJECTED],
+            )
+            if not previous_states:
+                continue
+
+            User.objects.using(using).filter(pk__in=previous_states).update(
+                state=User.StateChoices.REJECTED,
+                reason_for_refusal=reason_for_refusal,
+                rejected_at=rejected_at,
+                claimed_by=None,
+                claim_expires_at=None,
+                version=F("version") + 1,
+            )
+            for user in batch:
+                if user.pk not in previous_states:
+                    continue
+                user.state = User.StateChoices.REJECTED
+                user.reason_for_refusal = reason_for_refusal
+                user.rejected_at = rejected_at
+                user.claimed_by = user.claim_expires_at = None
+                record_event(
+                    OutboxEvent.EventTypeChoices.SIGNUP_REJECTED,
+                    user,
+                    {"reason_for_refusal": reason_for_refusal},
+                )
+                rejected.append(user)
+            # 이미 거절된 유저는 거절 사유만 다시 기록하므로 집계하지 않는다.
+            record_state_changes(
+                using,
+                User.StateChoices.REJECTED,
+                [
+                    state
+                    for state in previous_states.values()
+                    if state != User.StateChoices.REJECTED
+                ],
+            )
+    return rejected
+
+
+def resign(employees, reason_for_resignation: str) -> list:
+    """재직 중인 임직원을 탈퇴시킨다.
+        database 마다 하나의 transaction으로 처리하고, 퇴사 유무와 읽기 모델은 한 번씩 UPDATE한다.
+
+    Args:
+        employees (Employee | list): 탈퇴시킬 임직원 또는 임직원 목록
+        reason_for_resignation (str): 탈퇴 사유
+
+    Returns:
+        list: 생성된 Resignation 목록, 이미 탈퇴한 임직원은 제외된다.
+    """
+    resignations = []
+    resigned_at = timezone.now()
+    for using, batch in group_by_database(as_list(employees)).items():
+        with transaction.atomic(using=using):
+            locked_ids = set(
+                Employee.objects.using(using)
+                .select_for_update()
+                .filter(pk__in=[employee.pk for employee in batch], is_resigned=False)
+                .values_list("pk", flat=True),
+            )
+            batch = [employee for employee in batch if employee.pk in locked_ids]
+            if not batch:
+                continue
+
+            Employee.objects.using(using).filter(pk__in=locked_ids).update(
+                is_resigned=True,
+                version=F("version") + 1,
+            )
+            EmployeeDirectory.objects.using(using).filter(pk__in=locked_ids).update(
+                is_resigned=True,
+            )
+            users = User.objects.using(using).in_bulk(
+                [employee.user_id for employee in batch],
+            )
+            for employee in batch:
+                employee.is_resigned = True
+                resignations.append(
+                    Resignation.objects.create(
+                        resigned_user=employee,
+                        reason_for_resignation=reason_for_resignation,
+                        resigned_at=resigned_at,
+                    ),
+                )
+                record_event(
+                    OutboxEvent.EventTypeChoices.EMPLOYEE_RESIGNED,
+                    users[employee.user_id],
+                    {"reason_for_resignation": reason_for_resignation},
+                )
+            record_resignation(batch[0], len(batch))
+    return resignations
+
+
+def save_changes(instance, changes: dict, expected_version: int = None) -> None:
+    """바뀐 필드만 저장한다. expected_version이 있으면 version이 같을 때만 저장한다."""
+    if not changes:
+        return
+    if expected_version is None:
+        instance.save(update_fields=list(changes))
+    else:
+        instance.save_with_version(expected_version, list(changes))
+
+
+def update(
+    employee: Employee,
+    user: User,
+    employee_changes: dict,
+    user_changes: dict,
+    employee_version: int = None,
+    user_version: int = None,
+) -> bool:
+    """임직원 정보와 유저 정보 중 바뀐 컬럼만 하나의 transaction으로 저장한다.
+        바뀐 값이 없으면 DB에 쓰지 않는다. instance에는 바뀐 값이 이미 적용되어 있어야 한다.
+
+    Args:
+        employee (Employee): 수정할 임직원
+        user (User): 수정할 임직원의 유저
+        employee_changes (dict): 바뀐 Employee 필드 별 값
+        user_changes (dict): 바뀐 User 필드 별 값
+        employee_version (int): 수정 화면을 열었을 때의 Employee version
+        user_version (int): 수정 화면을 열었을 때의 User version
+
+    Raises:
+        VersionConflict: 그 사이에 다른 요청이 저장한 경우 발생
+
+    Returns:
+        bool: 저장했으면 True, 바뀐 값이 없으면 False
+    """
+    if not employee_changes and not user_changes:
+        return False
+
+    with transaction.atomic(using=employee._state.db):
+        save_changes(employee, employee_changes, employee_version)
+        save_changes(user, user_changes, user_version)
+        record_event(
+            OutboxEvent.EventTypeChoices.EMPLOYEE_UPDATED,
+            user,
+            {
+                "employee_fields": list(employee_changes),
+                "user_fields": list(user_changes),
+            },
+        )
+    return True
@@ -0,0 +1,184 @@
+import heapq
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+
+
+# shard를 결정할 수 있는 filter key. 샤딩 시 Employee, Resignation의 pk는 user_id와 같다.
+SHARD_KEY_LOOKUPS = (
+    "pk",
+    "id",
+    "user",
+    "user_id",
+    "resigned_user",
+    "resigned_user_id",
+)
+
+
+def is_sharding_enabled() -> bool:
+    """DATABASE_SHARDS가 설정되어 있으면 샤딩을 사용한다."""
+    return bool(getattr(settings, "DATABASE_SHARDS", []))
+
+
+def get_user_databases() -> list:
+    """User와 User에 딸린 모델이 저장되는 database alias 목록"""
+    return list(getattr(settings, "DATABASE_SHARDS", [])) or ["default"]
+
+
+def shard_for_user_id(user_id: int) -> str:
+    """user_id가 저장될 shard의 database alias를 반환한다.
+        - range: SHARD_RANGE_SIZE 단위로 id 구간을 나눠 순서대로 shard에 배정한다.
+        - hash: user_id를 shard 수로 나눈 나머지로 배정한다.
+
+    Args:
+        user_id (int): User의 pk
+
+    Raises:
+        ImproperlyConfigured: range 방식에서 user_id가 마지막 shard 구간을 넘을 경우 발생
+
+    Returns:
+        str: shard의 database alias
+    """
+    shards = settings.DATABASE_SHARDS
+    user_id = int(user_id)
+
+    if getattr(settings, "SHARD_STRATEGY", "range") == "hash":
+        return shards[user_id % len(shards)]
+
+    index = (user_id - 1) // settings.SHARD_RANGE_SIZE
+    if index >= len(shards):
+        raise ImproperlyConfigured(
+            f"user_id {user_id}에 해당하는 shard가 없습니다. DATABASE_SHARDS를 추가하세요.",
+        )
+    return shards[index]
+
+
+def get_shard_key(instance) -> int:
+    """모델 인스턴스의 shard key(user_id)를 반환한다.
+
+    Args:
+        instance: User, Employee 또는 Resignation 인스턴스
+
+    Returns:
+        int: shard key. 아직 정해지지 않았으면 None
+    """
+    if hasattr(instance, "user_id"):
+        return instance.user_id
+    if hasattr(instance, "resigned_user_id"):
+        return instance.resigned_user_id
+    return instance.pk
+
+
+def allocate_user_id(email: str) -> int:
+    """default DB의 ShardDirectory에 이메일을 등록하고 전역에서 유일한 user_id를 발급한다.
+
+    Args:
+        email (str): 가입할 이메일
+
+    Returns:
+        int: 새 User의 pk
+    """
+    directory = apps.get_model("accounts", "ShardDirectory")
+    return directory.objects.using("default").create(email=email).pk
+
+
+def user_id_for_email(email: str) -> int:
+    """이메일로 가입된 user_id를 ShardDirectory에서 찾는다.
+
+    Args:
+        email (str): 찾을 이메일
+
+    Returns:
+        int: user_id. 가입되지 않은 이메일이면 None
+    """
+    directory = apps.get_model("accounts", "ShardDirectory")
+    return (
+        directory.objects.using("default")
+        .filter(email=email)
+        .values_list("pk", flat=True)
+        .first()
+    )
+
+
+class ShardedQuerySet(models.QuerySet):
+    """filter에 shard key가 있으면 해당 shard로 쿼리를 보내는 QuerySet
+
+    - pk, user_id, resigned_user_id 등으로 조회하면 하나의 shard만 조회한다.
+    - User를 email로 조회하면 ShardDirectory에서 user_id를 찾아 shard를 결정한다.
+    """
+
+    def filter(self, *args, **kwargs):
+        queryset = super().filter(*args, **kwargs)
+        if not is_sharding_enabled() or self._db is not None:
+            return queryset
+
+        user_id = self._find_shard_key(kwargs)
+        if user_id is None:
+            return queryset
+        return queryset.using(shard_for_user_id(user_id))
+
+    def create(self, **kwargs):
+        if not is_sharding_enabled() or self._db is not None:
+            return super().create(**kwargs)
+
+        obj = self.model(**kwargs)
+        user_id = get_shard_key(obj)
+        if user_id is None:
+            return super().create(**kwargs)
+
+        obj.pk = user_id
+        obj.save(force_insert=True, using=shard_for_user_id(user_id))
+        return obj
+
+    def _find_shard_key(self, lookups: dict) -> int:
+        for key in SHARD_KEY_LOOKUPS:
+            if key in lookups:
+                value = lookups[key]
+                return value.pk if isinstance(value, models.Model) else value
+
+        if "email" in lookups and self.model._meta.label == settings.AUTH_USER_MODEL:
+            return user_id_for_email(lookups["email"])
+        return None
+
+
+class ShardedList:
+    """각 shard에 같은 쿼리를 보내고 pk 순서로 병합하는 읽기 전용 목록
+
+    Paginator가 사용하는 count()와 slicing만 지원한다.
+    한 페이지를 얻기 위해 shard마다 offset + limit 개의 행을 읽는다.
+    """
+
+    ordered = True
+
+    def __init__(self, queryset: models.QuerySet) -> None:
+        self.queryset = queryset
+        ordering = queryset.query.order_by or ("-id",)
+        self.reverse = ordering[0].startswith("-")
+
+    def count(self) -> int:
+        return sum(
+            self.queryset.using(alias).count() for alias in settings.DATABASE_SHARDS
+        )
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self[key : key + 1][0]
+
+        start = key.start or 0
+        stop = key.stop
+        per_shard = []
+        for alias in settings.DATABASE_SHARDS:
+            queryset = self.queryset.using(alias)
+            per_shard.append(queryset[:stop] if stop is not None else queryset)
+        merged = heapq.merge(
+            *per_shard,
+            key=lambda obj: obj.pk,
+            reverse=self.reverse,
+        )
+        return list(islice(merged, start, stop))
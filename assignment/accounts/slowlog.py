@@ -0,0 +1,158 @@
+import json
+import re
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from django.conf import settings
+
+
+_lock = threading.Lock()
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+# 쿼리를 감싸기만 하는 모듈은 호출 위치에서 제외한다.
+IGNORED_FILES = (
+    "accounts/db.py",
+    "accounts/instrumentation.py",
+    "accounts/middleware.py",
+    "accounts/routers.py",
+    "accounts/sharding.py",
+    "accounts/slowlog.py",
+)
+
+
+def fingerprint(sql: str) -> str:
+    """값만 다른 쿼리가 같은 문자열이 되도록 sql을 정규화한다.
+
+    Args:
+        sql (str): 실행된 sql
+
+    Returns:
+        str: 예) SELECT ... WHERE "id" IN (...) LIMIT ?
+    """
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = PLACEHOLDER_LIST.sub("(...)", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def get_params_shape(params, many: bool) -> str:
+    """파라미터 값은 남기지 않고 타입과 개수만 남긴다."""
+    if params is None:
+        return "()"
+    if many:
+        params = list(params)
+        first = params[0] if params else ()
+        return f"{len(params)} x {get_params_shape(first, False)}"
+    if isinstance(params, dict):
+        params = params.values()
+    return "(" + ", ".join(type(param).__name__ for param in params) + ")"
+
+
+def get_app_stack() -> list:
+    """호출 스택에서 프로젝트 코드의 frame만 골라 가장 안쪽부터 SLOW_QUERY_STACK_DEPTH 개 반환한다.
+
+    Returns:
+        list: "accounts/views.py:123 in update_when_update_btn" 형식의 문자열 목록
+    """
+    base_dir = str(settings.BASE_DIR)
+    frames = []
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if not filename.startswith(base_dir) or "site-packages" in filename:
+            continue
+        relative = filename[len(base_dir) :].lstrip("/")
+        if relative in IGNORED_FILES:
+            continue
+        frames.append(f"{relative}:{frame.lineno} in {frame.name}")
+        if len(frames) >= settings.SLOW_QUERY_STACK_DEPTH:
+            break
+    return frames
+
+
+def record_slow_query(sql: str, params, many: bool, duration: float, alias: str):
+    entry = {
+        "time": time.time(),
+        "database": alias,
+        "duration_ms": round(duration * 1000, 3),
+        "fingerprint": fingerprint(sql),
+        "sql": sql,
+        "params_shape": get_params_shape(params, many),
+        "stack": get_app_stack(),
+    }
+    path = Path(settings.SLOW_QUERY_LOG_FILE)
+    with _lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """SLOW_QUERY_THRESHOLD_MS 보다 오래 걸린 쿼리를 SLOW_QUERY_LOG_FILE에 기록한다."""
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started_at
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            record_slow_query(
+                sql,
+                params,
+                many,
+                duration,
+                context["connection"].alias,
+            )
+
+
+def install_slow_query_logger(sender, connection, **kwargs) -> None:
+    """connection_created signal 수신 시 slow query 기록 wrapper를 등록한다."""
+    if settings.SLOW_QUERY_THRESHOLD_MS is None:
+        return
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_queries)
+
+
+def summarize(path=None) -> list:
+    """slow query 기록을 fingerprint 별로 모은다.
+
+    Args:
+        path: slow query 기록 파일. 없으면 SLOW_QUERY_LOG_FILE
+
+    Returns:
+        list: 전체 소요 시간이 긴 순서로 정렬된 fingerprint 별 통계
+    """
+    path = Path(path or settings.SLOW_QUERY_LOG_FILE)
+    if not path.exists():
+        return []
+
+    summary = {}
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            item = summary.setdefault(
+                entry["fingerprint"],
+                {
+                    "fingerprint": entry["fingerprint"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "params_shape": entry["params_shape"],
+                    "locations": {},
+                },
+            )
+            item["count"] += 1
+            item["total_ms"] += entry["duration_ms"]
+            item["max_ms"] = max(item["max_ms"], entry["duration_ms"])
+            location = entry["stack"][0] if entry["stack"] else "(unknown)"
+            item["locations"][location] = item["locations"].get(location, 0) + 1
+
+    return sorted(summary.values(), key=lambda item: item["total_ms"], reverse=True)
@@ -0,0 +1,133 @@
+import csv
+import os
+import tempfile
+from datetime import datetime
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from accounts.directory import rebuild_directory
+from accounts.funnel import reconcile
+from accounts.jobs import register, report_progress
+from accounts.models import EmployeeDirectory, User
+from accounts.sharding import get_user_databases
+
+
+# 내보내기 파일의 (머리글, 컬럼) 목록
+EMPLOYEE_COLUMNS = [
+    ("ID", "user_id"),
+    ("이메일", "email"),
+    ("이름", "username"),
+    ("등급", "authorization_grade"),
+    ("퇴사 유무", "is_resigned"),
+    ("가입일시", "joined_at"),
+    ("최근 로그인일시", "last_login"),
+]
+SIGNUP_COLUMNS = [
+    ("ID", "id"),
+    ("이메일", "email"),
+    ("상태", "state"),
+    ("이름", "username"),
+    ("가입일시", "created_at"),
+    ("거절일시", "rejected_at"),
+]
+
+
+# 스프레드시트가 수식으로 실행하는 값의 첫 글자 (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime("%Y-%m-%d %H:%M")
+    if value is None:
+        return "-"
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # 이름 등 사용자가 입력한 값이 수식으로 실행되지 않도록 문자열로 표시한다.
+        return f"'{value}"
+    return value
+
+
+def write_csv(job, querysets: list, columns: list) -> None:
+    """querysets의 행을 pk 순서로 JOB_EXPORT_CHUNK_SIZE 개씩 읽어 CSV 파일로 저장한다.
+        OFFSET 대신 마지막 pk 이후를 읽어서 뒤쪽 chunk도 같은 비용으로 읽고,
+        chunk마다 진행 상황을 보고한다.
+
+    Args:
+        job (Job): 실행 중인 작업, 결과 파일은 job.result에 저장된다.
+        querysets (list): database 별 queryset
+        columns (list): (머리글, 컬럼) 목록
+    """
+    chunk_size = settings.JOB_EXPORT_CHUNK_SIZE
+    fields = [field for _, field in columns]
+    total = sum(queryset.count() for queryset in querysets)
+    processed = 0
+    report_progress(job, processed, total)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"{job.task}-{job.pk}.csv")
+        # 엑셀에서 한글이 깨지지 않도록 BOM을 붙인다.
+        with open(path, "w", newline="", encoding="utf-8-sig") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow([header for header, _ in columns])
+            for queryset in querysets:
+                last_pk = None
+                while True:
+                    chunk = queryset.order_by("pk")
+                    if last_pk is not None:
+                        chunk = chunk.filter(pk__gt=last_pk)
+                    rows = list(chunk.values_list("pk", *fields)[:chunk_size])
+                    if not rows:
+                        break
+                    writer.writerows(
+                        [format_value(value) for value in row[1:]] for row in rows
+                    )
+                    last_pk = rows[-1][0]
+                    processed += len(rows)
+                    report_progress(job, processed)
+
+        with open(path, "rb") as csv_file:
+            job.result.save(os.path.basename(path), File(csv_file), save=False)
+
+
+@register("export_employees")
+def export_employees(job, include_resigned: bool = False) -> None:
+    """회원 목록을 CSV로 내보낸다. 마스터 등급만 퇴사자를 포함할 수 있다."""
+    querysets = []
+    for using in get_user_databases():
+        queryset = EmployeeDirectory.objects.using(using).all()
+        if not include_resigned:
+            queryset = queryset.filter(is_resigned=False)
+        querysets.append(queryset)
+    write_csv(job, querysets, EMPLOYEE_COLUMNS)
+
+
+@register("export_signups")
+def export_signups(job) -> None:
+    """가입 대기 목록과 같은 조건의 유저를 CSV로 내보낸다."""
+    querysets = [
+        User.objects.using(using)
+        .exclude(state=User.StateChoices.APPROVAL)
+        .filter(is_superuser=False)
+        for using in get_user_databases()
+    ]
+    write_csv(job, querysets, SIGNUP_COLUMNS)
+
+
+@register("rebuild_employee_directory")
+def rebuild_employee_directory(job) -> None:
+    databases = get_user_databases()
+    report_progress(job, 0, len(databases))
+    for index, using in enumerate(databases, start=1):
+        rebuild_directory(using)
+        report_progress(job, index)
+
+
+@register("reconcile_signup_funnel")
+def reconcile_signup_funnel(job, days: int = None) -> None:
+    databases = get_user_databases()
+    report_progress(job, 0, len(databases))
+    for index, using in enumerate(databases, start=1):
+        reconcile(using, days)
+        report_progress(job, index)
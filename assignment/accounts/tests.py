@@ -1,3 +1,1088 @@
-# from django.test import TestCase
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+from datetime import timedelta
+from itertools import product
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import (
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.utils import timezone
+
+from accounts import services
+from accounts.bloom import EMAIL_FILTER_VERSION_KEY, BloomFilter, EmailFilter
+from accounts.cache import SharedMemoryCache
+from accounts.events import fetch_new_events, format_message
+from accounts.forms import EmployeeForm, UserForm
+from accounts.hashers import verify_password
+from accounts.jobs import claim_next
+from accounts.metrics import MetricsRegistry, render_text
+from accounts.middleware import REPLICA_PIN_COOKIE, ReplicaMiddleware
+from accounts.models import (
+    Employee,
+    Job,
+    OutboxEvent,
+    ShardDirectory,
+    SignupFunnelDaily,
+    SignupFunnelTotal,
+    User,
+    VersionConflict,
+)
+from accounts.outbox import dispatch_batch, record_event, serialize_event
+from accounts.permissions import (
+    ACTIONS,
+    AUTHORIZATION_FIELDS,
+    GRADES,
+    REFUSE,
+    RESIGN,
+    UPDATE,
+    UPDATE_FIELDS,
+    USER_FIELDS,
+    evaluate_batch,
+    get_allowed_fields,
+    is_allowed,
+)
+from accounts.ratelimit import TokenBucket
+from accounts.routers import PRIMARY_DATABASE, ReplicaRouter
+from accounts.sharding import ShardedList, shard_for_user_id
+from accounts.tasks import format_value
+from accounts.utils import CheckAuthAndAddError
+
+AUTHORIZATIONS = [
+    "signup_approval_authorization",
+    "list_read_authorization",
+    "update_authorization",
+    "resign_authorization",
+]
+
+
+def create_employee(email: str, grade: str = None, **authorizations) -> Employee:
+    """승인된 유저와 임직원을 만든다."""
+    user = User.objects.create_user(
+        email=email,
+        password="password1234!",
+        username=email.split("@")[0],
+        phone="01012341234",
+        state=User.StateChoices.APPROVAL,
+    )
+    return Employee.objects.create(
+        user=user,
+        authorization_grade=grade,
+        **authorizations,
+    )
+
+
+def get_update_data(employee: Employee, **changes) -> dict:
+    """회원 상세 화면의 수정 버튼이 보내는 POST 데이터를 만든다."""
+    employee = Employee.objects.get(pk=employee.pk)
+    user = employee.user
+    data = {
+        "email": user.email,
+        "username": user.username,
+        "phone": user.phone,
+        "authorization_grade": employee.authorization_grade or "",
+        "user_version": user.version,
+        "employee_version": employee.version,
+        "update-btn": "",
+    }
+    for authorization in AUTHORIZATIONS:
+        if getattr(employee, authorization):
+            data[authorization] = "on"
+    data.update(changes)
+    return data
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class ConcurrentUpdateTest(TestCase):
+    """같은 version으로 읽은 두 수정 요청 중 두 번째 요청은 저장되지 않는다."""
+
+    def setUp(self):
+        self.master = create_employee(
+            "master@test.com",
+            "MS",
+            list_read_authorization=True,
+            update_authorization=True,
+        )
+        self.target = create_employee("staff@test.com", "ST")
+
+    def test_second_update_with_same_version_raises_conflict(self):
+        first = Employee.objects.get(pk=self.target.pk)
+        second = Employee.objects.get(pk=self.target.pk)
+        first_user, second_user = first.user, second.user
+        employee_version, user_version = first.version, first_user.version
+
+        first.update_authorization = True
+        first_user.phone = "01011111111"
+        services.update(
+            first,
+            first_user,
+            {"update_authorization": True},
+            {"phone": "01011111111"},
+            employee_version,
+            user_version,
+        )
+
+        second.resign_authorization = True
+        second_user.phone = "01022222222"
+        with self.assertRaises(VersionConflict):
+            services.update(
+                second,
+                second_user,
+                {"resign_authorization": True},
+                {"phone": "01022222222"},
+                employee_version,
+                user_version,
+            )
+
+        saved = Employee.objects.get(pk=self.target.pk)
+        self.assertTrue(saved.update_authorization)
+        self.assertFalse(saved.resign_authorization)
+        self.assertEqual(saved.user.phone, "01011111111")
+        self.assertEqual(saved.version, employee_version + 1)
+        self.assertEqual(saved.user.version, user_version + 1)
+
+    def test_second_post_with_same_version_renders_conflict(self):
+        first_client, second_client = Client(), Client()
+        first_client.force_login(self.master.user)
+        second_client.force_login(self.master.user)
+        url = f"/employees/{self.target.pk}"
+        first_data = get_update_data(self.target, phone="01011111111")
+        second_data = get_update_data(self.target, username="renamed")
+
+        first_client.post(url, first_data)
+        response = second_client.post(url, second_data)
+
+        saved = Employee.objects.get(pk=self.target.pk)
+        content = response.content.decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("다른 관리자가 먼저 수정했습니다.", content)
+        self.assertEqual(saved.user.phone, "01011111111")
+        self.assertEqual(saved.user.username, "staff")
+        self.assertEqual(saved.user.version, second_data["user_version"] + 1)
+        self.assertEqual(saved.version, second_data["employee_version"])
+        # 다시 렌더링된 화면의 hidden input에는 DB에 저장된 최신 version이 있다.
+        self.assertEqual(
+            re.search(r'name="user_version" value="(\d+)"', content).group(1),
+            str(saved.user.version),
+        )
+        self.assertEqual(
+            re.search(r'name="employee_version" value="(\d+)"', content).group(1),
+            str(saved.version),
+        )
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class RejectTest(TestCase):
+    """이미 거절된 유저를 다시 거절하면 사유만 바뀌고 가입 집계는 바뀌지 않는다."""
+
+    def test_reject_again_does_not_count_twice(self):
+        user = User.objects.create_user(
+            email="await@test.com",
+            password="password1234!",
+            username="await",
+            phone="01012341234",
+        )
+
+        services.reject(user, "첫 번째 사유")
+        rejected = services.reject(User.objects.get(pk=user.pk), "두 번째 사유")
+
+        self.assertEqual(len(rejected), 1)
+        self.assertEqual(User.objects.get(pk=user.pk).reason_for_refusal, "두 번째 사유")
+        self.assertEqual(SignupFunnelDaily.objects.get().rejected, 1)
+        self.assertEqual(
+            SignupFunnelTotal.objects.get(state=User.StateChoices.REJECTED).count,
+            1,
+        )
+
+
+class PasswordRehashTest(TestCase):
+    """로그인 시 비밀번호를 다시 해싱해도 version은 바뀌지 않는다.
+    비밀번호를 실제로 바꾸면 다른 수정과 같이 version을 올린다.
+    """
+
+    def test_rehash_on_login_keeps_version(self):
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            user = User.objects.create_user(
+                email="rehash@test.com",
+                password="password1234!",
+                username="rehash",
+                phone="01012341234",
+            )
+        user = User.objects.get(pk=user.pk)
+        encoded, version = user.password, user.version
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.assertTrue(verify_password(user, "password1234!"))
+
+        saved = User.objects.get(pk=user.pk)
+        self.assertNotEqual(saved.password, encoded)
+        self.assertEqual(saved.version, version)
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=1000)
+    def test_password_change_bumps_version(self):
+        user = User.objects.create_user(
+            email="change@test.com",
+            password="password1234!",
+            username="change",
+            phone="01012341234",
+        )
+        user = User.objects.get(pk=user.pk)
+        version = user.version
+
+        user.set_password("changed1234!")
+        user.save(update_fields=["password"])
+
+        saved = User.objects.get(pk=user.pk)
+        self.assertTrue(saved.check_password("changed1234!"))
+        self.assertEqual(saved.version, version + 1)
+        # 이미 현재 설정으로 해싱된 비밀번호는 다시 저장하지 않는다.
+        self.assertTrue(verify_password(saved, "changed1234!"))
+        self.assertFalse(verify_password(saved, "password1234!"))
+        self.assertEqual(User.objects.get(pk=user.pk).version, version + 1)
+
+
+@override_settings(JOB_MAX_ATTEMPTS=3)
+class ClaimNextTest(TestCase):
+    """점유가 만료된 실행 중 작업은 남은 시도 횟수에 따라 다시 실행되거나 실패로 바뀐다."""
+
+    def create_expired_job(self, attempts: int) -> Job:
+        return Job.objects.create(
+            task="export_employees",
+            status=Job.StatusChoices.RUNNING,
+            attempts=attempts,
+            locked_until=timezone.now() - timedelta(seconds=1),
+        )
+
+    def test_expired_job_with_attempts_left_is_claimed(self):
+        job = self.create_expired_job(attempts=1)
+
+        claimed = claim_next()
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_expired_job_without_attempts_left_fails(self):
+        job = self.create_expired_job(attempts=3)
+
+        self.assertIsNone(claim_next())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.StatusChoices.FAILED)
+        self.assertIsNone(job.locked_until)
+        self.assertIsNotNone(job.finished_at)
+
+
+class FormatValueTest(SimpleTestCase):
+    """CSV로 내보내는 값 중 수식으로 실행될 수 있는 문자열은 앞에 '를 붙인다."""
+
+    def test_formula_is_escaped(self):
+        for value in ("=1+1", "+82", "-1", "@SUM(A1)", "\tcmd"):
+            with self.subTest(value=value):
+                self.assertEqual(format_value(value), f"'{value}")
+
+    def test_other_values_are_kept(self):
+        for value in ("staff", "staff@test.com", "01012341234", 1, True):
+            with self.subTest(value=value):
+                self.assertEqual(format_value(value), value)
+        self.assertEqual(format_value(None), "-")
+
+
+# dispatch_batch가 handler를 호출할 때의 상태
+handled = []
+
+
+def recording_handler(events: list) -> None:
+    """handler 호출 시점에 transaction 밖인지, 이벤트가 점유되어 있는지 기록한다."""
+    handled.append(
+        {
+            "in_atomic_block": connection.in_atomic_block,
+            "claimed": not OutboxEvent.objects.filter(
+                pk__in=[event["id"] for event in events],
+                next_attempt_at__lte=timezone.now(),
+            ).exists(),
+        },
+    )
+
+
+def failing_handler(events: list) -> None:
+    raise ConnectionError("webhook unavailable")
+
+
+class DispatchBatchTest(TransactionTestCase):
+    """이벤트를 점유하는 transaction을 commit한 뒤에 handler를 호출한다."""
+
+    def setUp(self):
+        handled.clear()
+        self.event = OutboxEvent.objects.create(
+            event_type=OutboxEvent.EventTypeChoices.SIGNUP_CREATED,
+            user_id=1,
+        )
+
+    @override_settings(OUTBOX_HANDLER="accounts.tests.recording_handler")
+    def test_handler_runs_after_claim_is_committed(self):
+        self.assertEqual(dispatch_batch(), 1)
+
+        self.assertEqual(handled, [{"in_atomic_block": False, "claimed": True}])
+        self.event.refresh_from_db()
+        self.assertIsNotNone(self.event.dispatched_at)
+        self.assertEqual(dispatch_batch(), 0)
+
+    @override_settings(OUTBOX_HANDLER="accounts.tests.failing_handler")
+    def test_failed_batch_is_retried_later(self):
+        self.assertEqual(dispatch_batch(), 0)
+
+        self.event.refresh_from_db()
+        self.assertIsNone(self.event.dispatched_at)
+        self.assertEqual(self.event.attempts, 1)
+        self.assertIn("webhook unavailable", self.event.last_error)
+        self.assertGreater(self.event.next_attempt_at, timezone.now())
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class SignupReviewPermissionTest(TestCase):
+    """가입 승인 권한이 있는 마스터, 관리자만 가입 신청을 승인할 수 있다."""
+
+    def setUp(self):
+        self.applicant = User.objects.create_user(
+            email="applicant@test.com",
+            password="password1234!",
+            username="applicant",
+            phone="01012341234",
+        )
+
+    def approve(self, actor: Employee):
+        client = Client()
+        client.force_login(actor.user)
+        return client.post(
+            f"/accounts/signup-list/{self.applicant.pk}",
+            {
+                "email": self.applicant.email,
+                "username": self.applicant.username,
+                "phone": self.applicant.phone,
+                "approval-btn": "",
+            },
+        )
+
+    def test_staff_or_no_grade_cannot_approve(self):
+        for index, grade in enumerate(("ST", None)):
+            actor = create_employee(
+                f"actor{index}@test.com",
+                grade,
+                signup_approval_authorization=True,
+            )
+            with self.subTest(grade=grade):
+                self.assertEqual(self.approve(actor).status_code, 403)
+                self.assertEqual(
+                    User.objects.get(pk=self.applicant.pk).state,
+                    User.StateChoices.AWAIT,
+                )
+        self.assertFalse(Employee.objects.filter(user=self.applicant).exists())
+
+    def test_manager_without_authorization_cannot_approve(self):
+        actor = create_employee(
+            "manager@test.com", "MA", signup_approval_authorization=False
+        )
+
+        self.assertEqual(self.approve(actor).status_code, 403)
+        self.assertFalse(Employee.objects.filter(user=self.applicant).exists())
+
+    def test_manager_with_authorization_approves(self):
+        actor = create_employee(
+            "manager@test.com", "MA", signup_approval_authorization=True
+        )
+
+        self.assertEqual(self.approve(actor).status_code, 302)
+        self.assertEqual(
+            User.objects.get(pk=self.applicant.pk).state,
+            User.StateChoices.APPROVAL,
+        )
+        self.assertTrue(Employee.objects.filter(user=self.applicant).exists())
+
+
+class BloomFilterTest(SimpleTestCase):
+    def test_added_values_are_always_found(self):
+        bloom = BloomFilter(1000, 0.01)
+        emails = [f"user{i}@test.com" for i in range(1000)]
+        for email in emails:
+            bloom.add(email)
+
+        self.assertTrue(all(email in bloom for email in emails))
+        false_positives = sum(f"other{i}@test.com" in bloom for i in range(1000))
+        self.assertLess(false_positives, 30)
+
+
+@override_settings(EMAIL_FILTER_CACHE="default", PASSWORD_HASH_ITERATIONS=1000)
+class EmailFilterTest(TestCase):
+    """filter를 믿을 수 없는 경우(아직 만들지 않았거나 version이 다른 경우)에는
+    가입되지 않았다고 판단하지 않고 DB에서 확인하게 한다.
+    """
+
+    def setUp(self):
+        caches["default"].clear()
+        self.filter = EmailFilter()
+        self.user = create_employee("joined@test.com").user
+
+    def test_unbuilt_filter_is_built_in_background(self):
+        with mock.patch.object(self.filter, "rebuild_in_background") as rebuild:
+            self.assertFalse(self.filter.is_definitely_missing("missing@test.com"))
+        rebuild.assert_called_once()
+
+    def test_built_filter_knows_joined_emails(self):
+        self.filter.build()
+
+        self.assertTrue(self.filter.is_definitely_missing("missing@test.com"))
+        self.assertFalse(self.filter.is_definitely_missing("joined@test.com"))
+
+    def test_version_changed_by_other_process_is_not_trusted(self):
+        self.filter.build()
+        caches["default"].incr(EMAIL_FILTER_VERSION_KEY)
+
+        with mock.patch.object(self.filter, "rebuild_in_background") as rebuild:
+            self.assertFalse(self.filter.is_definitely_missing("missing@test.com"))
+        rebuild.assert_called_once()
+
+    def test_created_email_is_added_after_commit(self):
+        self.filter.build()
+        version = self.filter.version
+
+        with mock.patch("accounts.bloom.email_filter", self.filter):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                create_employee("new@test.com")
+                # commit 전에는 다른 프로세스에 알리지 않는다.
+                self.assertEqual(self.filter.get_version(), version)
+                self.assertNotIn("new@test.com", self.filter.bloom)
+
+        self.assertTrue(callbacks)
+        self.assertEqual(self.filter.get_version(), version + 1)
+        self.assertEqual(self.filter.version, version + 1)
+        self.assertFalse(self.filter.is_definitely_missing("new@test.com"))
+
+
+class SharedMemoryCacheFileTest(SimpleTestCase):
+    """저장된 값을 unpickle 하므로 현재 유저만 쓸 수 있는 파일만 사용한다."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache", "shared")
+
+    def create_cache(self) -> SharedMemoryCache:
+        return SharedMemoryCache(self.path, {"OPTIONS": {"SLOTS": 16, "WAYS": 4}})
+
+    def test_creates_private_file(self):
+        cache = self.create_cache()
+        cache.set("key", "value")
+
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(os.path.dirname(self.path)).st_mode & 0o777, 0o700)
+
+    def test_symlink_is_refused(self):
+        os.makedirs(os.path.dirname(self.path))
+        target = self.path + "-target"
+        open(target, "wb").close()
+        os.symlink(target, self.path)
+
+        with self.assertRaises(OSError):
+            self.create_cache().get("key")
+
+    def test_writable_by_others_is_refused(self):
+        os.makedirs(os.path.dirname(self.path))
+        open(self.path, "wb").close()
+        os.chmod(self.path, 0o666)
+
+        with self.assertRaises(PermissionError):
+            self.create_cache().get("key")
+
+    @skipUnless(hasattr(os, "getuid") and os.getuid() == 0, "root만 소유자를 바꿀 수 있다.")
+    def test_owned_by_other_user_is_refused(self):
+        os.makedirs(os.path.dirname(self.path))
+        open(self.path, "wb").close()
+        os.chmod(self.path, 0o600)
+        os.chown(self.path, 65534, -1)
+
+        with self.assertRaises(PermissionError):
+            self.create_cache().get("key")
+
+
+def consume_tokens(bucket: TokenBucket, attempts: int, results) -> None:
+    results.put(sum(bucket.consume("user@test.com") for _ in range(attempts)))
+
+
+class TokenBucketTest(SimpleTestCase):
+    """capacity 만큼 연속으로 허용하고, 그 뒤에는 refill_rate 만큼 회복된 토큰만 허용한다."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = os.path.join(directory.name, "shared")
+
+    def get_caches(self, backend: str) -> dict:
+        if backend == "locmem":
+            return {
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            }
+        return {
+            "default": {
+                "BACKEND": "accounts.cache.SharedMemoryCache",
+                "LOCATION": self.location,
+                "OPTIONS": {"SLOTS": 64, "WAYS": 4},
+            },
+        }
+
+    def test_capacity_and_refill(self):
+        for backend in ("locmem", "shared"):
+            with self.subTest(backend=backend), override_settings(
+                CACHES=self.get_caches(backend), LOGIN_RATE_LIMIT_CACHE="default"
+            ), mock.patch("accounts.ratelimit.time.time") as now:
+                caches["default"].clear()
+                bucket = TokenBucket("test", capacity=3, refill_rate=0.5)
+                now.return_value = 1000.0
+                self.assertEqual(
+                    [bucket.consume("user@test.com") for _ in range(4)],
+                    [True, True, True, False],
+                )
+                # 다른 key의 bucket은 따로 센다.
+                self.assertTrue(bucket.consume("other@test.com"))
+
+                now.return_value = 1002.0
+                self.assertTrue(bucket.consume("user@test.com"))
+                self.assertFalse(bucket.consume("user@test.com"))
+
+    def test_processes_share_one_bucket(self):
+        with override_settings(
+            CACHES=self.get_caches("shared"), LOGIN_RATE_LIMIT_CACHE="default"
+        ):
+            bucket = TokenBucket("test", capacity=50, refill_rate=0.001)
+            context = multiprocessing.get_context("fork")
+            results = context.Queue()
+            processes = [
+                context.Process(target=consume_tokens, args=(bucket, 100, results))
+                for _ in range(4)
+            ]
+            for process in processes:
+                process.start()
+            allowed = sum(results.get() for _ in processes)
+            for process in processes:
+                process.join()
+
+        self.assertEqual(allowed, 50)
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class SignupEventsTest(TestCase):
+    """가입 대기 목록 화면에 보내는 이벤트"""
+
+    def create_event(self, pk: int, event_type=None) -> OutboxEvent:
+        return OutboxEvent.objects.create(
+            pk=pk,
+            event_type=event_type or OutboxEvent.EventTypeChoices.SIGNUP_CREATED,
+            user_id=pk,
+        )
+
+    def test_created_message_has_email_for_the_new_row(self):
+        user = User.objects.create_user(
+            email="new@test.com",
+            password="password1234!",
+            username="new",
+            phone="01012341234",
+        )
+        event = record_event(
+            OutboxEvent.EventTypeChoices.SIGNUP_CREATED,
+            user,
+            {"username": user.username},
+        )
+
+        message = format_message(serialize_event(event)).decode()
+        data = json.loads(message.split("data: ", 1)[1])
+        self.assertTrue(message.startswith("event: signup.created\n"))
+        self.assertEqual(data["email"], "new@test.com")
+        self.assertEqual(data["username"], "new")
+        self.assertEqual(data["user_id"], user.pk)
+
+    def test_event_committed_after_a_higher_pk_is_not_skipped(self):
+        last_ids, gaps = {"default": 0}, {}
+        self.create_event(1)
+        self.create_event(3)
+
+        events = fetch_new_events(last_ids, gaps)
+        self.assertEqual([event["id"] for event in events], [1, 3])
+        self.assertEqual(last_ids, {"default": 3})
+
+        # pk 2의 transaction이 늦게 commit된다.
+        self.create_event(2)
+        self.create_event(4, OutboxEvent.EventTypeChoices.EMPLOYEE_RESIGNED)
+        self.assertEqual(
+            [event["id"] for event in fetch_new_events(last_ids, gaps)], [2]
+        )
+        self.assertEqual(gaps, {"default": {}})
+
+    @override_settings(SIGNUP_EVENTS_GAP_TIMEOUT=10)
+    def test_gap_is_dropped_after_timeout(self):
+        last_ids, gaps = {"default": 0}, {}
+        self.create_event(2)
+        with mock.patch("accounts.events.time.monotonic", return_value=100.0):
+            fetch_new_events(last_ids, gaps)
+        self.assertEqual(list(gaps["default"]), [1])
+
+        with mock.patch("accounts.events.time.monotonic", return_value=111.0):
+            self.assertEqual(fetch_new_events(last_ids, gaps), [])
+        self.assertEqual(gaps, {"default": {}})
+
+
+class MetricsTest(SimpleTestCase):
+    """METRICS_DIR의 worker 별 파일 중 실행 중인 worker의 값만 합친다."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(METRICS_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        registry_patch = mock.patch("accounts.metrics.registry", MetricsRegistry())
+        self.registry = registry_patch.start()
+        self.addCleanup(registry_patch.stop)
+
+    def write_snapshot(self, pid: int, counters: dict) -> str:
+        path = os.path.join(self.directory, f"{pid}.json")
+        with open(path, "w") as file:
+            json.dump({"counters": counters, "histograms": {}}, file)
+        return path
+
+    def get_dead_pid(self) -> int:
+        process = multiprocessing.get_context("fork").Process(target=os.getpid)
+        process.start()
+        process.join()
+        return process.pid
+
+    def test_dead_worker_snapshot_is_pruned(self):
+        self.registry.inc("requests_total")
+        path = self.write_snapshot(self.get_dead_pid(), {"requests_total": 5})
+
+        self.assertIn("requests_total 1\n", render_text())
+        self.assertFalse(os.path.exists(path))
+
+    def test_reused_pid_does_not_inherit_snapshot(self):
+        self.write_snapshot(os.getpid(), {"requests_total": 5})
+
+        registry = MetricsRegistry()
+        registry.inc("requests_total")
+        with mock.patch("accounts.metrics.registry", registry):
+            self.assertIn("requests_total 1\n", render_text())
+
+    def test_type_lines(self):
+        self.registry.inc("requests_total", method="GET")
+        self.registry.inc("requests_total", method="POST")
+        self.registry.observe("request_duration_seconds", 0.1)
+
+        lines = render_text({"signup_pending": 2}).splitlines()
+        self.assertEqual(lines.count("# TYPE requests_total counter"), 1)
+        self.assertEqual(
+            lines[lines.index("# TYPE requests_total counter") + 1 :][:2],
+            ['requests_total{method="GET"} 1', 'requests_total{method="POST"} 1'],
+        )
+        self.assertIn("# TYPE request_duration_seconds histogram", lines)
+        self.assertEqual(
+            lines[-2:], ["# TYPE signup_pending gauge", "signup_pending 2"]
+        )
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica1", "replica2"],
+    REPLICA_STICKY_SECONDS=5,
+    REPLICA_MAX_LAG_SECONDS=2,
+)
+class ReplicaRouterTest(SimpleTestCase):
+    """ReplicaMiddleware가 정한 요청 별 읽기 DB를 ReplicaRouter가 따르는지 확인한다."""
+
+    def setUp(self):
+        self.lags = {"replica1": 0.0, "replica2": 0.0}
+        lag_patch = mock.patch(
+            "accounts.routers.get_replica_lag", side_effect=self.lags.__getitem__
+        )
+        lag_patch.start()
+        self.addCleanup(lag_patch.stop)
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def get_response(self, request):
+        """view 대신 요청 처리 중에 router가 고른 DB를 기록한다."""
+        self.read_database = self.router.db_for_read(User)
+        self.write_database = self.router.db_for_write(User)
+        return HttpResponse()
+
+    def request(self, method: str, cookies: dict = None):
+        request = getattr(self.factory, method)("/")
+        request.COOKIES.update(cookies or {})
+        return ReplicaMiddleware(self.get_response)(request)
+
+    def test_get_reads_from_replica(self):
+        for method in ("get", "head"):
+            with self.subTest(method=method):
+                response = self.request(method)
+                self.assertIn(self.read_database, ("replica1", "replica2"))
+                self.assertEqual(self.write_database, PRIMARY_DATABASE)
+                self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
+        # 요청 밖의 읽기는 primary에서 한다.
+        self.assertEqual(self.router.db_for_read(User), PRIMARY_DATABASE)
+
+    def test_post_pins_primary(self):
+        response = self.request("post")
+        self.assertEqual(self.read_database, PRIMARY_DATABASE)
+        self.assertEqual(self.write_database, PRIMARY_DATABASE)
+        cookie = response.cookies[REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], 5)
+
+        # 쓰기 직후 같은 브라우저의 GET은 primary에서 읽는다.
+        self.request("get", {REPLICA_PIN_COOKIE: cookie.value})
+        self.assertEqual(self.read_database, PRIMARY_DATABASE)
+
+        # 고정 시간이 지나면 다시 replica에서 읽는다.
+        with mock.patch(
+            "accounts.middleware.time.time", return_value=float(cookie.value) + 1
+        ):
+            self.request("get", {REPLICA_PIN_COOKIE: cookie.value})
+        self.assertIn(self.read_database, ("replica1", "replica2"))
+
+    def test_invalid_cookie_is_ignored(self):
+        self.request("get", {REPLICA_PIN_COOKIE: "invalid"})
+        self.assertIn(self.read_database, ("replica1", "replica2"))
+
+    def test_lagging_replica_is_skipped(self):
+        self.lags["replica1"] = 10.0
+        for _ in range(20):
+            self.request("get")
+            self.assertEqual(self.read_database, "replica2")
+
+    def test_all_replicas_lagging_falls_back_to_primary(self):
+        self.lags.update(replica1=10.0, replica2=3.0)
+        self.request("get")
+        self.assertEqual(self.read_database, PRIMARY_DATABASE)
+
+
+class ShardedRows(list):
+    """한 shard의 조회 결과 대신 사용하는 목록"""
+
+    def count(self) -> int:
+        return len(self)
+
+
+class FakeShardedQuerySet:
+    """ShardedList가 사용하는 query.order_by, using()만 가진 shard 별 조회 결과"""
+
+    def __init__(self, pks_by_alias: dict, ordering: str) -> None:
+        self.pks_by_alias = pks_by_alias
+        self.query = SimpleNamespace(order_by=(ordering,))
+        self.reverse = ordering.startswith("-")
+
+    def using(self, alias: str) -> ShardedRows:
+        pks = sorted(self.pks_by_alias[alias], reverse=self.reverse)
+        return ShardedRows(SimpleNamespace(pk=pk) for pk in pks)
+
+
+@override_settings(DATABASE_SHARDS=["shard1", "shard2"], SHARD_RANGE_SIZE=3)
+class ShardingTest(SimpleTestCase):
+    def test_range_strategy(self):
+        self.assertEqual(
+            [shard_for_user_id(user_id) for user_id in range(1, 7)],
+            ["shard1"] * 3 + ["shard2"] * 3,
+        )
+        self.assertEqual(shard_for_user_id("4"), "shard2")
+
+    def test_range_strategy_past_last_shard(self):
+        with self.assertRaises(ImproperlyConfigured):
+            shard_for_user_id(7)
+
+    @override_settings(SHARD_STRATEGY="hash")
+    def test_hash_strategy(self):
+        self.assertEqual(
+            [shard_for_user_id(user_id) for user_id in range(1, 8)],
+            ["shard2", "shard1", "shard2", "shard1", "shard2", "shard1", "shard2"],
+        )
+
+    def test_sharded_list_merges_by_pk(self):
+        pks_by_alias = {"shard1": [1, 5, 6, 9], "shard2": [2, 4, 7, 8]}
+        rows = ShardedList(FakeShardedQuerySet(pks_by_alias, "-id"))
+
+        self.assertEqual(rows.count(), 8)
+        self.assertEqual([row.pk for row in rows[0:3]], [9, 8, 7])
+        self.assertEqual([row.pk for row in rows[3:6]], [6, 5, 4])
+        self.assertEqual([row.pk for row in rows[6:9]], [2, 1])
+        self.assertEqual(rows[1].pk, 8)
+
+        rows = ShardedList(FakeShardedQuerySet(pks_by_alias, "id"))
+        self.assertEqual([row.pk for row in rows[2:5]], [4, 5, 6])
+
+
+class ShardAlias(str):
+    pass
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000, DATABASE_SHARDS=["default"])
+class SignupShardTest(TestCase):
+    """가입 시 발급한 user_id의 shard에서 transaction을 열고 유저를 저장한다.
+    테스트 DB가 하나뿐이라 shard alias도 default DB를 가리키고, 그 alias가 쓰였는지 확인한다.
+    """
+
+    data = {
+        "email": "shard@test.com",
+        "username": "shard",
+        "phone": "01012341234",
+        "password": "password1234!",
+        "password_confirm": "password1234!",
+    }
+
+    def setUp(self):
+        self.atomic_databases = []
+        atomic = transaction.atomic
+
+        def record_atomic(using=None, **kwargs):
+            self.atomic_databases.append(using)
+            return atomic(using=using, **kwargs)
+
+        for target, patch in (
+            ("accounts.views.transaction", SimpleNamespace(atomic=record_atomic)),
+            ("accounts.forms.email_filter.is_definitely_missing", lambda email: False),
+        ):
+            patcher = mock.patch(target, patch)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_transaction_is_opened_on_the_shard(self):
+        # default와 같은 DB를 가리키지만 default와 구분되는 shard alias
+        shard = ShardAlias("default")
+        with mock.patch(
+            "accounts.views.shard_for_user_id", return_value=shard
+        ) as shard_for_user_id:
+            response = Client().post("/signup/", self.data)
+
+        self.assertEqual(response.status_code, 302)
+        user_id = ShardDirectory.objects.get(email="shard@test.com").pk
+        shard_for_user_id.assert_called_once_with(user_id)
+        # user_id 발급은 default에서, 유저 저장은 shard에서 연다.
+        self.assertEqual(len(self.atomic_databases), 2)
+        self.assertIsNot(self.atomic_databases[0], shard)
+        self.assertIs(self.atomic_databases[1], shard)
+        self.assertEqual(User.objects.get(email="shard@test.com").pk, user_id)
+
+    def test_failed_signup_releases_user_id(self):
+        with mock.patch("accounts.views.record_signup", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                Client().post("/signup/", self.data)
+
+        self.assertFalse(ShardDirectory.objects.filter(email="shard@test.com").exists())
+        self.assertFalse(User.objects.filter(email="shard@test.com").exists())
+
+
+def legacy_is_allowed(
+    actor_grade: str, update_authorization: bool, target_grade: str, action: str, field
+) -> bool:
+    """권한 정책 표로 바꾸기 전 CheckAuthAndAddError의 분기를 옮겨 적은 기준 값
+    관리자가 권한을 변경할 때 첫 번째 권한만 확인하던 버그는 고친 뒤의 동작이다.
+    """
+    if action in (REFUSE, RESIGN):
+        return actor_grade == "MS"
+    if actor_grade == "MS":
+        return True
+    if field == "authorization_grade":
+        return False
+    if field in USER_FIELDS:
+        return actor_grade == "MA" and update_authorization and target_grade != "MS"
+    # 4가지 권한은 관리자가 일반 등급 임직원의 것만 변경할 수 있다.
+    return actor_grade == "MA" and target_grade == "ST"
+
+
+def get_decisions(action: str):
+    """action에서 확인할 (필드) 목록, 필드가 없는 행동은 None 하나만 확인한다."""
+    return UPDATE_FIELDS if action == UPDATE else (None,)
+
+
+class PermissionPolicyTest(SimpleTestCase):
+    """권한 정책 표의 모든 조합이 이전 CheckAuthAndAddError의 분기와 같은 결과인지 확인한다."""
+
+    def test_is_allowed_matches_legacy_checks(self):
+        for actor_grade, flags, target_grade, action in product(
+            GRADES,
+            product((False, True), repeat=len(AUTHORIZATIONS)),
+            GRADES,
+            ACTIONS,
+        ):
+            actor = Employee(
+                authorization_grade=actor_grade,
+                **dict(zip(AUTHORIZATIONS, flags)),
+            )
+            for field in get_decisions(action):
+                with self.subTest(
+                    actor=actor_grade,
+                    flags=flags,
+                    target=target_grade,
+                    action=action,
+                    field=field,
+                ):
+                    self.assertEqual(
+                        is_allowed(actor, target_grade, action, field),
+                        legacy_is_allowed(
+                            actor_grade,
+                            actor.update_authorization,
+                            target_grade,
+                            action,
+                            field,
+                        ),
+                    )
+
+    def test_get_allowed_fields_matches_legacy_checks(self):
+        for actor_grade, flags, target_grade in product(
+            GRADES,
+            product((False, True), repeat=len(AUTHORIZATIONS)),
+            GRADES,
+        ):
+            actor = Employee(
+                authorization_grade=actor_grade,
+                **dict(zip(AUTHORIZATIONS, flags)),
+            )
+            expected = {
+                field
+                for field in UPDATE_FIELDS
+                if legacy_is_allowed(
+                    actor_grade, actor.update_authorization, target_grade, UPDATE, field
+                )
+            }
+            with self.subTest(actor=actor_grade, flags=flags, target=target_grade):
+                self.assertEqual(get_allowed_fields(actor, target_grade), expected)
+
+    def test_evaluate_batch_matches_is_allowed(self):
+        targets = [
+            Employee(pk=index, authorization_grade=grade)
+            for index, grade in enumerate(GRADES)
+        ]
+        # 임직원이 아닌 대상은 등급이 없는 것으로 본다.
+        targets.append(User(pk=len(GRADES)))
+        for actor_grade, flags, action in product(
+            GRADES,
+            product((False, True), repeat=len(AUTHORIZATIONS)),
+            ACTIONS,
+        ):
+            actor = Employee(
+                authorization_grade=actor_grade,
+                **dict(zip(AUTHORIZATIONS, flags)),
+            )
+            grades = [*GRADES, None]
+            with self.subTest(actor=actor_grade, flags=flags, action=action):
+                for field in get_decisions(action):
+                    self.assertEqual(
+                        evaluate_batch(actor, targets, action, field),
+                        {
+                            index: is_allowed(actor, grade, action, field)
+                            for index, grade in enumerate(grades)
+                        },
+                    )
+                if action == UPDATE:
+                    self.assertEqual(
+                        evaluate_batch(actor, targets, action),
+                        {
+                            index: bool(get_allowed_fields(actor, grade))
+                            for index, grade in enumerate(grades)
+                        },
+                    )
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class EmployeeListPermissionTest(TestCase):
+    """회원 목록의 상세 버튼은 수정이나 퇴사 처리를 할 수 있는 행에서만 관리로 보인다."""
+
+    def get_buttons(self, actor: Employee) -> dict:
+        client = Client()
+        client.force_login(actor.user)
+        content = client.get("/employees/").content.decode()
+        return {
+            int(employee_id): label
+            for employee_id, label in re.findall(
+                r"/employees/(\d+)'\">(\S+)</button>", content
+            )
+        }
+
+    def test_buttons_follow_policy(self):
+        manager = create_employee(
+            "manager@test.com",
+            "MA",
+            list_read_authorization=True,
+            update_authorization=False,
+        )
+        master = create_employee("master@test.com", "MS")
+        staff = create_employee("staff@test.com", "ST")
+
+        buttons = self.get_buttons(manager)
+        self.assertEqual(buttons[staff.pk], "관리")
+        self.assertEqual(buttons[master.pk], "상세")
+        self.assertEqual(buttons[manager.pk], "상세")
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class CheckAuthAndAddErrorTest(TestCase):
+    """모든 필드를 바꾼 form에서 허용하지 않는 필드에만 에러가 추가되는지 확인한다.
+    EmployeeForm의 등급 선택지에 마스터가 없어서 대상은 마스터가 아닌 등급만 확인한다.
+    """
+
+    # 대상 등급 별로 바꿀 등급
+    NEXT_GRADES = {"MA": "ST", "ST": "MA", None: "ST"}
+
+    def test_errors_match_legacy_checks(self):
+        for index, (actor_grade, update_authorization, target_grade) in enumerate(
+            product(GRADES, (False, True), self.NEXT_GRADES)
+        ):
+            actor = create_employee(
+                f"actor{index}@test.com",
+                actor_grade,
+                update_authorization=update_authorization,
+            )
+            target = create_employee(f"target{index}@test.com", target_grade)
+            data = {
+                "username": "changed",
+                "phone": "01099999999",
+                "authorization_grade": self.NEXT_GRADES[target_grade],
+                # 저장된 값과 반대로 체크해서 모든 권한을 바꾼다.
+                **{
+                    authorization: "on"
+                    for authorization in AUTHORIZATION_FIELDS
+                    if not getattr(target, authorization)
+                },
+            }
+            employee_form = EmployeeForm(data, instance=target)
+            user_form = UserForm(data, instance=target.user)
+            self.assertTrue(employee_form.is_valid() and user_form.is_valid())
+
+            checker = CheckAuthAndAddError(actor.user_id, target.user_id)
+            checker.check_in_employee_list(
+                employee_form, user_form, "username", "phone"
+            )
+
+            expected = {
+                field
+                for field in UPDATE_FIELDS
+                if not legacy_is_allowed(
+                    actor_grade, update_authorization, target_grade, UPDATE, field
+                )
+            }
+            with self.subTest(
+                actor=actor_grade,
+                update_authorization=update_authorization,
+                target=target_grade,
+            ):
+                self.assertEqual(
+                    set(employee_form.errors) | set(user_form.errors), expected
+                )
@@ -14,6 +14,7 @@ urlpatterns = [
         views.SignupDetailView.as_view(),
         name="signup_detail",
     ),
+    path("accounts/signup-queue/", views.signup_queue_view, name="signup_queue"),
     path("employees/", views.EmployeeListView.as_view(), name="employee_list"),
     path(
         "employees/<int:employee_id>",
@@ -21,4 +22,13 @@ urlpatterns = [
         name="employee_detail",
     ),
     path("guide/", views.guide_view, name="guide"),
+    path("accounts/funnel/", views.funnel_dashboard_view, name="funnel_dashboard"),
+    path("exports/<str:target>/", views.export_view, name="export"),
+    path("jobs/<int:job_id>/", views.job_detail_view, name="job_detail"),
+    path(
+        "jobs/<int:job_id>/download/",
+        views.job_download_view,
+        name="job_download",
+    ),
+    path("metrics", views.metrics_view, name="metrics"),
 ]
@@ -4,6 +4,13 @@ from django.shortcuts import redirect
 
 from accounts.forms import UserForm, EmployeeForm, ResignationForm
 from accounts.models import User, Employee
+from accounts.permissions import (
+    AUTHORIZATION_FIELDS,
+    REFUSE,
+    RESIGN,
+    UPDATE,
+    is_allowed,
+)
 
 
 def authorization_filter_on_signup_list(function) -> Any:
@@ -88,63 +95,129 @@ def get_authorizations(current_user_grade: str, cleaned_data: dict) -> dict:
     return authorizations
 
 
+def get_changed_values(form, fields: list) -> dict:
+    """form을 만들 때 instance에서 읽은 값(form.initial)과 유효성 검증이 끝난 값을 비교해서
+        실제로 바뀐 필드의 값만 반환한다.
+        - 권한이 없어 에러가 추가된 필드는 cleaned_data에서 빠지므로 반환하지 않는다.
+        - 체크를 해제한 권한(False)도 이전 값과 다르면 바뀐 값으로 본다.
+
+    Args:
+        form (ModelForm): 유효성 검증이 끝난 form
+        fields (list): 저장할 수 있는 필드 이름 목록
+
+    Returns:
+        dict: 바뀐 필드 이름 별 저장할 값
+    """
+    changed = {}
+    for field in fields:
+        if field not in form.cleaned_data:
+            continue
+        # 선택하지 않은 등급("")은 None으로 저장한다.
+        value = form.cleaned_data[field]
+        if value == "":
+            value = None
+        if value != form.initial.get(field):
+            changed[field] = value
+    return changed
+
+
+def apply_changed_values(instance, form, changed: dict) -> None:
+    """ModelForm 유효성 검증 중에 instance에 채워진 입력 값을 form을 만들 때의 값으로 되돌리고
+    바뀐 값만 적용한다. 저장 후 signal이 읽는 instance에 저장하지 않은 입력 값이 남지 않는다.
+    """
+    for field in form._meta.fields:
+        if field in form.initial:
+            setattr(instance, field, form.initial[field])
+    for field, value in changed.items():
+        setattr(instance, field, value)
+
+
 class CheckAuthAndAddError:
+    """현재 임직원이 대상 유저에게 할 수 있는 행동을 accounts.permissions의 권한 정책 표로 확인하고,
+    허용하지 않는 변경은 form에 에러로 추가한다.
+    """
+
     def __init__(self, current_user_id: int, target_user_id: int) -> None:
         self.current_employee = Employee.objects.filter(user_id=current_user_id).last()
         self.target_employee = Employee.objects.filter(user_id=target_user_id).last()
-        self.target_user = User.objects.filter(pk=target_user_id).last() # FIXME: self.target_employee.user_id였지만 수정완료.
+        self.target_user = User.objects.filter(pk=target_user_id).last()
         self.auth_grade = self.current_employee.authorization_grade
         self.update_auth = self.current_employee.update_authorization
+        # 가입 신청 유저처럼 임직원이 아니면 등급이 없는 대상으로 본다.
+        self.target_grade = (
+            self.target_employee.authorization_grade if self.target_employee else None
+        )
 
     def check_to_do_refusal(
         self,
         user_form: UserForm,
     ) -> bool:
         """현재 로그인된 유저가 refusal 권한이 있는지 확인한다.
-            인증 등급이 마스터 등급이면 가입 신청 승인을 거절할 수 있다. 하지만 그 외의 등급은 할 수 없다.
+            권한 정책 표에 따르면 마스터 등급만 가입 신청 승인을 거절할 수 있다.
 
         Args:
-            user_form (UserForm): user_form의 cleaned_data 에서 reason_for_refusal
-            라는 key 값에 대한 값을 None으로 바꾸면서 유효성 검증 시 발생할 에러에 다음 에러 내용을 추가한다.
+            user_form (UserForm): 권한이 없으면 reason_for_refusal에 에러를 추가한다.
 
         Returns:
             bool: 거절할 권한이 있으면 True, 없으면 False
         """
-        if self.auth_grade == "MS":
+        if is_allowed(self.current_employee, self.target_grade, REFUSE):
             return True
-        else:
-            user_form.add_error("reason_for_refusal", "거절할 권한이 없습니다.")
-            return False
+        user_form.add_error("reason_for_refusal", "거절할 권한이 없습니다.")
+        return False
 
     def check_to_do_resignation(
         self,
         resignation_form: ResignationForm,
     ) -> bool:
         """현재 로그인된 유저가 탈퇴시킬 권한이 있는지 확인한다.
-            마스터 등급이면 탈퇴시킬 수 있으나 그 외 등급은 탈퇴시킬 수 없다.
+            권한 정책 표에 따르면 마스터 등급만 탈퇴시킬 수 있다.
 
         Args:
-            - resignation_form (ResignationForm): resignation_form의 cleaned_data 에서
-                reason_for_refusal 라는 key 값에 대한 값을 None으로 바꾸면서
-                유효성 검증 시 발생할 에러에 다음 에러 내용을 추가한다.
+            resignation_form (ResignationForm): 권한이 없으면 reason_for_resignation에 에러를 추가한다.
 
         Returns:
-            bool: 거절할 권한이 있으면 True, 없으면 False
+            bool: 탈퇴시킬 권한이 있으면 True, 없으면 False
         """
-        if self.auth_grade == "MS":
+        if is_allowed(self.current_employee, self.target_grade, RESIGN):
             return True
-        else:
-            resignation_form.add_error("reason_for_resignation", "탈퇴시킬 권한이 없습니다.")
-            return False
+        resignation_form.add_error("reason_for_resignation", "탈퇴시킬 권한이 없습니다.")
+        return False
+
+    def check_changed_fields(self, form, instance, fields: list, message) -> bool:
+        """fields 중 form에 입력된 값이 instance의 이전 값과 다른 필드를 변경 시도로 보고,
+            권한 정책 표에서 허용하지 않으면 form에 에러를 추가한다.
+            에러가 추가된 필드는 cleaned_data에서 빠지므로 저장되지 않는다.
+
+        Args:
+            form (ModelForm): 유효성 검증이 끝난 form
+            instance (Model): 변경 대상의 저장된 값
+            fields (list): 확인할 필드 이름 목록
+            message (str | callable): 에러 메세지 또는 필드 이름을 받아 메세지를 만드는 함수
+
+        Returns:
+            bool: 허용하지 않는 변경이 없으면 True
+        """
+        allowed = True
+        for field in fields:
+            if field not in form.cleaned_data:
+                continue
+            # 선택하지 않은 등급("")은 저장된 None과 같은 값으로 본다.
+            previous_value = getattr(instance, field)
+            next_value = form.cleaned_data[field]
+            if (previous_value or None) == (next_value or None):
+                continue
+            if is_allowed(self.current_employee, self.target_grade, UPDATE, field):
+                continue
+            form.add_error(field, message(field) if callable(message) else message)
+            allowed = False
+        return allowed
 
     def check_to_update_grade(
         self,
         employee_form: EmployeeForm,
     ) -> bool:
-        """현재 임직원과 변경 대상인 임직원의 등급을 비교해서 authorization_grade를 변경할 권한이 있는지 확인한다.
-            내부 정책에 따르면 마스터 등급만이 등급을 변경할 수 있다.
-            등급 변경 시도는 target이 되는 employee의 이전 값과 cleaned_data에 잇는 값을 비교하여
-            달라지면 변경을 시도하는 것으로 파악한다.
+        """등급 변경 시도가 권한 정책 표에서 허용되는지 확인한다. 마스터 등급만 등급을 변경할 수 있다.
 
         Args:
             employee_form (EmployeeForm): EmployeeForm을 통해서 유효성 검사가 끝난 데이터를 가지고 있는 Form
@@ -152,82 +225,43 @@ class CheckAuthAndAddError:
         Returns:
             bool: 인증 등급을 변경할 수 없으면 False를 반환한다.
         """
-        if self.auth_grade == "MS":
-            return True
-        else:
-            previous_grade = self.target_employee.authorization_grade
-            next_grade = employee_form.cleaned_data["authorization_grade"]
-            if previous_grade != next_grade:
-                employee_form.add_error("authorization_grade", "등급을 변경할 권한이 없습니다.")
-                return False
+        return self.check_changed_fields(
+            employee_form,
+            self.target_employee,
+            ["authorization_grade"],
+            "등급을 변경할 권한이 없습니다.",
+        )
 
     def check_to_update_user_name_or_phone(
         self,
         user_form: UserForm,
         target_field: str,
     ) -> bool:
-        """현재 로그인된 user의 등급과 변경 대상인 user의 등급을 비교하고
-            이전 값과 user_form을 통해 새로 입력한 값과 비교하여 값이 변했으면
-            변경 시도로 파악하여 등급에 따라 에러를 발생시킨다.
+        """이름 또는 전화번호 변경 시도가 권한 정책 표에서 허용되는지 확인한다.
+            수정 권한이 있는 관리자는 마스터가 아닌 임직원의 값을 변경할 수 있다.
 
         Args:
-            user_form (UserForm): name과 phone 정보를 가지고 있다.
-            target_field (str): name 또는 phone을 가리킨다.
+            user_form (UserForm): username과 phone 정보를 가지고 있다.
+            target_field (str): username 또는 phone을 가리킨다.
 
         Returns:
             bool: 권한이 없으면 False, 있으면 True를 반환한다.
         """
-        if target_field == "name":
-            field_error = "이름"
-        else:
-            field_error = "전화번호"
-
-        if self.auth_grade == "MS":
-            return True
-        elif self.auth_grade == "MA":
-            if self.update_auth:
-                if self.target_employee.authorization_grade == "MS":
-                    if target_field == "name":
-                        previous_target_field = self.target_user.name
-                    else:
-                        previous_target_field = self.target_user.phone
-                    next_target_field = user_form.cleaned_data[target_field]
-                    if previous_target_field != next_target_field:
-                        user_form.add_error(
-                            target_field,
-                            f"해당 유저의 {field_error}을 변경할 권한이 없습니다.",
-                        )
-                        return False
-
-                else:
-                    return True
-            else:  # 회원 수정 권한이 없을 때
-                user_form.add_error(
-                    target_field,
-                    f"해당 유저의 {field_error}을 변경할 권한이 없습니다.",
-                )
-                return False
-        else:  # "ST" 일 때
-            if target_field == "name":
-                previous_target_field = self.target_user.name
-            else:
-                previous_target_field = self.target_user.phone
-            next_target_field = user_form.cleaned_data[target_field]
-            if previous_target_field != next_target_field:
-                user_form.add_error(
-                    target_field,
-                    f"해당 유저의 {field_error}을 변경할 권한이 없습니다.",
-                )
-                return False
+        field_error = "이름" if target_field == "username" else "전화번호"
+        return self.check_changed_fields(
+            user_form,
+            self.target_user,
+            [target_field],
+            f"해당 유저의 {field_error}을 변경할 권한이 없습니다.",
+        )
 
     def check_to_update_auth(
         self,
         employee_form: EmployeeForm,
     ) -> bool:
-        """현재 로그인된 임직원과 변경 대상인 임직원의 등급을 비교하여
-           Employee model의 4가지 권한을 수정할 수 있는지 판단한다.
-
-           변경 시도를 하는지 판단은 변경 대상의 임직원의 form 입력 전값과 입력 후 값을 비교한다.
+        """Employee model의 4가지 권한 변경 시도가 권한 정책 표에서 허용되는지 확인한다.
+            관리자는 일반 등급 임직원의 권한만 변경할 수 있다.
+            변경하려는 모든 권한을 확인해서 허용하지 않는 권한마다 에러를 추가한다.
 
         Args:
             employee_form (EmployeeForm): 권한들에 대한 정보를 가지고 있는 form
@@ -235,82 +269,12 @@ class CheckAuthAndAddError:
         Returns:
             bool: 권한이 있으면 True, 없으면 False를 반환한다.
         """
-        if self.auth_grade == "MS":
-            return True
-        elif self.auth_grade == "MA":
-            if (
-                self.target_employee.authorization_grade != "ST"
-            ):  # 현재 등급이 매니저이고 대상 등급이 일반이 아닌 경우
-                previous_auth = {
-                    "signup_approval_authorization": self.target_employee.signup_approval_authorization,
-                    "list_read_authorization": self.target_employee.list_read_authorization,
-                    "update_authorization": self.target_employee.update_authorization,
-                    "resign_authorization": self.target_employee.resign_authorization,
-                }
-
-                next_auth = {
-                    "signup_approval_authorization": employee_form.cleaned_data[
-                        "signup_approval_authorization"
-                    ],
-                    "list_read_authorization": employee_form.cleaned_data[
-                        "list_read_authorization"
-                    ],
-                    "update_authorization": employee_form.cleaned_data[
-                        "update_authorization"
-                    ],
-                    "resign_authorization": employee_form.cleaned_data[
-                        "resign_authorization"
-                    ],
-                }
-
-                total_auth = [
-                    "signup_approval_authorization",
-                    "list_read_authorization",
-                    "update_authorization",
-                    "resign_authorization",
-                ]
-
-                for auth in total_auth:
-                    if previous_auth[auth] != next_auth[auth]:
-                        employee_form.add_error(auth, "권한들을 변경할 수 없습니다.")
-                    return False
-                return True
-            else:
-                return True
-        else:  # 현재 로그인된 임직원의 등급이 ST인 경우
-            previous_auth = {
-                "signup_approval_authorization": self.target_employee.signup_approval_authorization,
-                "list_read_authorization": self.target_employee.list_read_authorization,
-                "update_authorization": self.target_employee.update_authorization,
-                "resign_authorization": self.target_employee.resign_authorization,
-            }
-
-            next_auth = {
-                "signup_approval_authorization": employee_form.cleaned_data[
-                    "signup_approval_authorization"
-                ],
-                "list_read_authorization": employee_form.cleaned_data[
-                    "list_read_authorization"
-                ],
-                "update_authorization": employee_form.cleaned_data[
-                    "update_authorization"
-                ],
-                "resign_authorization": employee_form.cleaned_data[
-                    "resign_authorization"
-                ],
-            }
-
-            total_auth = [
-                "signup_approval_authorization",
-                "list_read_authorization",
-                "update_authorization",
-                "resign_authorization",
-            ]
-
-            for auth in total_auth:
-                if previous_auth[auth] != next_auth[auth]:
-                    employee_form.add_error(auth, "권한들을 변경할 수 없습니다.")
-            return True
+        return self.check_changed_fields(
+            employee_form,
+            self.target_employee,
+            AUTHORIZATION_FIELDS,
+            "권한들을 변경할 수 없습니다.",
+        )
 
     def check_in_employee_list(
         self,
@@ -318,17 +282,23 @@ class CheckAuthAndAddError:
         user_form: UserForm,
         name: str,
         phone: str,
-    ) -> None:
+    ) -> bool:
         """위에서 언급된 employee_form과 user_form에 관한 점검 포인트를
             한 곳에 모아놓는다.
 
         Args:
             employee_form (EmployeeForm): EmployeeForm의 form data
             user_form (UserForm): UserForm의 form data
-            name (str): User의 name 값
-            phone (str): User의 phone 값
+            name (str): User의 이름 필드 이름 (username)
+            phone (str): User의 전화번호 필드 이름 (phone)
+
+        Returns:
+            bool: 허용하지 않는 변경이 없으면 True
         """
-        self.check_to_update_auth(employee_form)
-        self.check_to_update_grade(employee_form)
-        self.check_to_update_user_name_or_phone(user_form, name)
-        self.check_to_update_user_name_or_phone(user_form, phone)
+        checks = [
+            self.check_to_update_auth(employee_form),
+            self.check_to_update_grade(employee_form),
+            self.check_to_update_user_name_or_phone(user_form, name),
+            self.check_to_update_user_name_or_phone(user_form, phone),
+        ]
+        return all(checks)
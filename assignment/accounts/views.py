@@ -1,3 +1,4 @@
+import os
 from typing import Any
 from django import http
 
@@ -5,20 +6,30 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.decorators import method_decorator
-from django.http import HttpRequest, HttpResponse
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseForbidden,
+)
 from django.views.generic import FormView, ListView
 from django.contrib.auth import login, logout
+from django.views.decorators.http import require_POST
 from django.views.generic.base import View
 from django.urls import reverse_lazy
-from django.utils import timezone
+from django.db import router, transaction
 from django.db.models import Q
+from django.conf import settings
 
 from config.settings.base import COUNTS_PER_PAGE
 from accounts.utils import (
     authorization_filter_on_employee_list,
     authorization_filter_on_signup_list,
     CheckAuthAndAddError,
+    apply_changed_values,
     get_authorizations,
+    get_changed_values,
 )
 from accounts.forms import (
     ResignationForm,
@@ -27,7 +38,41 @@ from accounts.forms import (
     LoginForm,
     UserForm,
 )
-from accounts.models import User, Employee, Resignation
+from accounts.models import (
+    User,
+    Employee,
+    EmployeeDirectory,
+    Job,
+    Resignation,
+    OutboxEvent,
+    ShardDirectory,
+    VersionConflict,
+)
+from accounts.claims import claim_signups, is_claimed_by_other
+from accounts.funnel import (
+    get_daily,
+    get_totals,
+    record_signup,
+)
+from accounts.jobs import enqueue
+from accounts.metrics import registry, render_text
+from accounts.outbox import record_event
+from accounts.permissions import (
+    EMPLOYEE_FIELDS,
+    RESIGN,
+    UPDATE,
+    USER_FIELDS,
+    can_review_signup,
+    evaluate_batch,
+)
+from accounts.ratelimit import allow_login_attempt, get_client_ip
+from accounts.sharding import (
+    ShardedList,
+    allocate_user_id,
+    is_sharding_enabled,
+    shard_for_user_id,
+)
+from accounts import services
 
 
 @login_required(login_url=reverse_lazy("login"))
@@ -58,6 +103,118 @@ def logout_view(request: HttpRequest):
     return redirect("login")
 
 
+def metrics_view(request: HttpRequest):
+    """
+    수집된 metrics를 Prometheus text 형식으로 반환한다.
+    METRICS_ALLOWED_IPS에서 온 요청만 허용하며, 가입 대기 수는 가입 현황 counter에서 읽는다.
+    """
+    if get_client_ip(request) not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+
+    gauges = {"signup_queue_depth": get_totals()[User.StateChoices.AWAIT]}
+    return HttpResponse(
+        render_text(gauges),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@login_required(login_url=reverse_lazy("login"))
+@authorization_filter_on_signup_list
+def funnel_dashboard_view(request: HttpRequest):
+    """
+    가입 승인 권한이 있는 임직원에게 상태 별 유저 수와 최근 일자 별 가입 신청, 승인,
+    거절, 퇴사 건수를 보여준다. 테이블을 집계하지 않고 counter 테이블만 읽는다.
+    """
+    try:
+        days = min(max(int(request.GET.get("days", 14)), 1), 365)
+    except ValueError:
+        days = 14
+
+    employee = Employee.objects.filter(user_id=request.user.id).last()
+    context = {
+        "totals": get_totals(),
+        "daily": get_daily(days),
+        "days": days,
+        "approval_authorization": True,
+        "read_authorization": employee.list_read_authorization,
+    }
+    return render(request, "funnel.html", context)
+
+
+@login_required(login_url=reverse_lazy("login"))
+@authorization_filter_on_signup_list
+def signup_queue_view(request: HttpRequest):
+    """
+    가입 대기 유저를 SIGNUP_QUEUE_BATCH_SIZE 명씩 현재 임직원에게 점유시켜 보여준다.
+    점유한 유저는 SIGNUP_QUEUE_LEASE_SECONDS 동안 다른 임직원의 목록에 나타나지 않아서
+    여러 임직원이 겹치지 않고 동시에 가입 신청을 처리할 수 있다.
+    """
+    employee = Employee.objects.filter(user_id=request.user.id).last()
+    context = {
+        "object_list": claim_signups(request.user.id),
+        "signup_list": True,
+        "signup_queue": True,
+        "approval_authorization": True,
+        "read_authorization": employee.list_read_authorization,
+    }
+    return render(request, "list.html", context)
+
+
+@login_required(login_url=reverse_lazy("login"))
+@require_POST
+def export_view(request: HttpRequest, target: str):
+    """
+    회원 목록(employees) 또는 가입 대기 목록(signups)을 CSV로 내보내는 작업을 등록하고
+    작업 진행 화면으로 이동한다. 목록 조회 권한과 같은 권한이 필요하고,
+    회원 목록은 마스터 등급만 퇴사자를 포함한다.
+    """
+    employee = Employee.objects.filter(user_id=request.user.id).last()
+    if request.user.state != "AP" or employee is None:
+        return redirect("guide")
+
+    if target == "employees" and employee.list_read_authorization:
+        kwargs = {"include_resigned": employee.authorization_grade == "MS"}
+    elif target == "signups" and employee.signup_approval_authorization:
+        kwargs = {}
+    else:
+        return HttpResponseForbidden()
+
+    job = enqueue(f"export_{target}", requested_by=request.user.id, **kwargs)
+    return redirect("job_detail", job_id=job.pk)
+
+
+@login_required(login_url=reverse_lazy("login"))
+def job_detail_view(request: HttpRequest, job_id: int):
+    """
+    요청한 작업의 진행률을 보여준다. 작업이 끝나기 전에는 화면이 주기적으로 새로고침된다.
+    작업을 요청한 유저만 볼 수 있다.
+    """
+    job = get_object_or_404(Job, pk=job_id, requested_by=request.user.id)
+    employee = Employee.objects.filter(user_id=request.user.id).last()
+    context = {
+        "job": job,
+        "finished": job.status in (Job.StatusChoices.DONE, Job.StatusChoices.FAILED),
+        "approval_authorization": employee and employee.signup_approval_authorization,
+        "read_authorization": employee and employee.list_read_authorization,
+    }
+    return render(request, "job.html", context)
+
+
+@login_required(login_url=reverse_lazy("login"))
+def job_download_view(request: HttpRequest, job_id: int):
+    """
+    완료된 작업의 결과 파일을 내려받는다. 작업을 요청한 유저만 내려받을 수 있다.
+    """
+    job = get_object_or_404(Job, pk=job_id, requested_by=request.user.id)
+    if job.status != Job.StatusChoices.DONE or not job.result:
+        raise Http404
+    return FileResponse(
+        job.result.open("rb"),
+        as_attachment=True,
+        filename=os.path.basename(job.result.name),
+    )
+
+
 class SignUpView(FormView):
     template_name = "user/signup.html"
     form_class = SignUpForm
@@ -69,13 +226,33 @@ class SignUpView(FormView):
         username = form.data.get("username")
         phone = form.data.get("phone")
 
-        user = User.objects.create_user(
-            email=email,
-            password=password,
-            phone=phone,
-            username=username,
-        )
-        user.save()
+        # 샤딩 시 user_id를 먼저 발급해서 유저가 저장될 shard에서 transaction을 연다.
+        user_id, using = None, router.db_for_write(User) or "default"
+        if is_sharding_enabled():
+            with transaction.atomic(using="default"):
+                user_id = allocate_user_id(email)
+            using = shard_for_user_id(user_id)
+
+        try:
+            with transaction.atomic(using=using):
+                user = User.objects.db_manager(using).create_user(
+                    email=email,
+                    password=password,
+                    phone=phone,
+                    username=username,
+                    pk=user_id,
+                )
+                record_signup(user)
+                record_event(
+                    OutboxEvent.EventTypeChoices.SIGNUP_CREATED,
+                    user,
+                    {"username": user.username},
+                )
+        except Exception:
+            # shard에 저장하지 못하면 발급한 user_id를 ShardDirectory에서 지운다.
+            if user_id is not None:
+                ShardDirectory.objects.using("default").filter(pk=user_id).delete()
+            raise
 
         return super().form_valid(form)
 
@@ -93,16 +270,33 @@ class LoginView(FormView):
         """
         return self.redirect_url()
 
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """
+        비밀번호 해싱과 DB 조회 전에 IP와 이메일 별 로그인 시도 횟수를 제한한다.
+        제한을 넘으면 form 검증 없이 429 응답을 반환한다.
+        """
+        email = request.POST.get("email", "")
+        if not allow_login_attempt(request, email):
+            registry.inc("login_attempts_total", outcome="rate_limited")
+            context = self.get_context_data(
+                form=self.form_class(initial={"email": email}),
+                rate_limited=True,
+            )
+            return self.render_to_response(context, status=429)
+        return super().post(request, *args, **kwargs)
+
     def form_valid(self, form):
         email = form.data.get("email")
         user = User.objects.filter(email=email).last()
 
         user.update_last_login()
         login(self.request, user)
+        registry.inc("login_attempts_total", outcome="success")
 
         return super().form_valid(form)
 
     def form_invalid(self, form):
+        registry.inc("login_attempts_total", outcome="invalid")
         return super().form_invalid(form)
 
     def redirect_url(self):
@@ -149,13 +343,30 @@ class SignupListView(ListView):
 
         context["approval_authorization"] = True
         context["signup_list"] = True
+        context["signup_events_path"] = settings.SIGNUP_EVENTS_PATH
 
         return context
 
+    def get_queryset(self):
+        """
+        샤딩을 사용하면 모든 shard의 가입 대기 목록을 -id 순서로 병합한다.
+        """
+        queryset = super().get_queryset()
+        if is_sharding_enabled():
+            return ShardedList(queryset)
+        return queryset
+
 
 @method_decorator(login_required(login_url=reverse_lazy("login")), name="get")
 @method_decorator(authorization_filter_on_employee_list, name="get")
 class EmployeeListView(ListView):
+    """
+    회원 목록을 보여주는 view
+
+    - 현재 임직원이 행 별로 수정, 퇴사 처리할 수 있는지 등급 별로 한 번만 판단해서
+      각 행의 can_update, can_resign에 담는다. 상세 버튼의 표시에 사용한다.
+    """
+
     queryset = None
     template_name = "list.html"
     ordering = ["-id"]
@@ -171,20 +382,32 @@ class EmployeeListView(ListView):
         context["read_authorization"] = True
         context["signup_list"] = False
 
+        rows = list(context["object_list"])
+        can_update = evaluate_batch(employee, rows, UPDATE)
+        can_resign = evaluate_batch(employee, rows, RESIGN)
+        for row in rows:
+            row.can_update = can_update[row.pk]
+            row.can_resign = can_resign[row.pk] and not row.is_resigned
+        context["object_list"] = rows
+
         return context
 
     def get_queryset(self, **kwargs):
         """
         마스터 등급은 퇴사자 명단을 볼 수 있고, 그 이외 등급은 퇴사자 명단을 볼 수 없도록
         queryset을 구분한다.
+        Employee와 User를 join하지 않고 목록 컬럼만 가진 EmployeeDirectory에서 조회한다.
         """
         employee = Employee.objects.filter(user_id=self.request.user.id).last()
         if employee.authorization_grade == "MS":
-            queryset = Employee.objects.select_related("user")
+            queryset = EmployeeDirectory.objects.all()
         else:
-            queryset = Employee.objects.select_related("user").exclude(is_resigned=True)
+            queryset = EmployeeDirectory.objects.filter(is_resigned=False)
         self.queryset = queryset
-        return super().get_queryset()
+        queryset = super().get_queryset()
+        if is_sharding_enabled():
+            return ShardedList(queryset)
+        return queryset
 
 
 class SetFormView(View):
@@ -209,10 +432,11 @@ class SetFormView(View):
         )
         return self.user_form
 
-    def set_resignation_form(self, request, instance):
+    def set_resignation_form(self, request, instance, resigned_user=None):
         self.resignation_form = ResignationForm(
             request,
             instance=instance,
+            resigned_user=resigned_user,
         )
         return self.resignation_form
 
@@ -266,53 +490,57 @@ class SignupDetailView(SetFormView):
         context = self.get_context_data()
         return render(request, "detail.html", context)
 
-    def update_when_refusal_btn(self):
-        self.compare_auth_and_add_error.check_to_do_refusal(self.user_form)
+    def check_to_review(self, request: HttpRequest) -> bool:
+        """이미 승인되었거나 다른 임직원이 검토 대기열에서 점유 중인 유저인지 확인한다.
 
-        reason_for_refusal = self.user_form.cleaned_data.get("reason_for_refusal")
+        Args:
+            request (HttpRequest): request 요청
 
-        self.target_user.reason_for_refusal = reason_for_refusal
-        self.target_user.rejected_at = timezone.now()
-        self.target_user.state = "RJ"
+        Returns:
+            bool: 처리할 수 있으면 True, 없으면 user_form에 에러를 추가하고 False
+        """
+        if self.target_user.state == "AP":
+            self.user_form.add_error(None, "이미 승인된 유저입니다.")
+            return False
+        if is_claimed_by_other(self.target_user, request.user.id):
+            self.user_form.add_error(None, "다른 임직원이 검토 중인 유저입니다.")
+            return False
+        return True
 
-        self.target_user.save(
-            update_fields=["state", "reason_for_refusal", "rejected_at"]
-        )
+    def update_when_refusal_btn(self):
+        if not self.compare_auth_and_add_error.check_to_do_refusal(self.user_form):
+            return False
 
-        return True
+        reason_for_refusal = self.user_form.cleaned_data.get("reason_for_refusal")
+        return bool(services.reject(self.target_user, reason_for_refusal))
 
     def update_when_approval_btn(self):
-        # 가입 신청 승인을 master가 했을 경우
+        # 가입 신청 승인을 master가 했을 경우 선택한 등급과 권한으로 등록하고,
+        # 관리자가 했을 경우 기본 권한으로 등록한다.
+        authorizations = None
         if self.current_employee.authorization_grade == "MS":
-            authorizations = get_authorizations(
-                "MS",
-                self.employee_form.cleaned_data,
-            )
-
-            employee = Employee.objects.create(
-                user_id=self.target_user.id,
-                **authorizations,
-            )
-
-        # 가입 신청 승인을 관리자 등급이 했을 경우
-        elif self.current_employee.authorization_grade == "MA":
-            employee = Employee.objects.create(user_id=self.target_user.id)
+            authorizations = get_authorizations("MS", self.employee_form.cleaned_data)
 
-        self.target_user.state = "AP"
-        self.target_user.save(update_fields=["state"])
-        employee.save()
-
-        return True
+        return bool(services.approve(self.target_user, authorizations))
 
     def post(
         self,
         request: HttpRequest,
         user_id: int,
     ) -> HttpResponse:
+        # 가입 승인 권한이 있는 마스터, 관리자만 승인하거나 거절할 수 있다.
+        if not can_review_signup(self.current_employee):
+            return HttpResponseForbidden()
+
         self.set_user_form(request.POST, self.target_user)
+        if not self.check_to_review(request):
+            context = self.get_context_data()
+            return render(request, "detail.html", context)
+
         if self.user_form.is_valid():
             if "refusal-btn" in request.POST:  # 가입 신청 거절 시
-                self.update_when_refusal_btn(self)
+                self.update_when_refusal_btn()
+                context = self.get_context_data()
                 return render(request, "detail.html", context)
             else:  # 가입 신청 승인 시
                 self.set_employee_form(request.POST, None)
@@ -320,6 +548,7 @@ class SignupDetailView(SetFormView):
                     self.update_when_approval_btn()
                     return redirect("signup_list")
                 else:  # 등급을 선택하지 않고 승인 버튼을 눌렀을 경우
+                    context = self.get_context_data()
                     return render(request, "detail.html", context)
 
         else:  # 거절 사유를 입력하지 않고 거절 버튼을 눌렀을 경우
@@ -391,46 +620,60 @@ class EmployeeDetailView(SetFormView):
         return render(request, "detail.html", context)
 
     def update_when_resignation_btn(self):
-        cleaned_data = self.resignation_form.cleaned_data
-        reason_for_resignation = cleaned_data.get("reason_for_resignation")
-        resignation = Resignation.objects.create(
-            resigned_user=self.target_employee,
-            reason_for_resignation=reason_for_resignation,
-            resigned_at=timezone.now(),
+        reason_for_resignation = self.resignation_form.cleaned_data.get(
+            "reason_for_resignation",
         )
-        resignation.save()
-
-        # 임직원 퇴사 유무 확인 정보 업데이트
-        self.target_employee.is_resigned = True
-        self.target_employee.save(update_fields=["is_resigned"])
+        return bool(services.resign(self.target_employee, reason_for_resignation))
 
     def update_when_update_btn(self):
-        update_fields = []
-
-        # 권한 비교 및 유효성 추가 검증 확인
+        # 권한 비교 및 유효성 추가 검증 확인, 허용하지 않는 변경은 cleaned_data에서 빠진다.
         self.compare_auth_and_add_error.check_in_employee_list(
             self.employee_form,
             self.user_form,
-            "name",
+            "username",
             "phone",
         )
 
-        # 권한에 따른 대상 employee_form에서 저장할 데이터 선별
-        for key, value in self.employee_form.cleaned_data.items():
-            if not value:
-                continue
-            update_fields.append(key)
-
-        self.target_employee.save(update_fields=update_fields)
-        update_fields.clear()
+        # 화면을 열었을 때의 값과 비교해서 실제로 바뀐 컬럼만 저장한다.
+        employee_changes = get_changed_values(self.employee_form, EMPLOYEE_FIELDS)
+        user_changes = get_changed_values(self.user_form, USER_FIELDS)
+        apply_changed_values(self.target_employee, self.employee_form, employee_changes)
+        apply_changed_values(self.target_user, self.user_form, user_changes)
 
-        # 권한에 따른 대상 user_form에서 저장할 데이터 선별
-        for key, value in self.user_form.cleaned_data.items():
-            if not value:
-                continue
-            update_fields.append(key)
+        # 화면을 열었을 때의 version과 다르면 다른 관리자가 먼저 저장한 것이다.
+        try:
+            services.update(
+                self.target_employee,
+                self.target_user,
+                employee_changes,
+                user_changes,
+                self.employee_form.cleaned_data.get("employee_version"),
+                self.user_form.cleaned_data.get("user_version"),
+            )
+        except VersionConflict:
+            self.employee_form.add_error(
+                None,
+                "다른 관리자가 먼저 수정했습니다. 새로고침 후 다시 수정해주세요.",
+            )
+            # 다시 렌더링되는 화면에는 먼저 저장한 요청 이후의 version을 보여준다.
+            self.target_employee.refresh_from_db(fields=["version"])
+            self.target_user.refresh_from_db(fields=["version"])
+            self.refresh_version(self.employee_form, "employee_version")
+            self.refresh_version(self.user_form, "user_version")
+            return False
+
+        # 다시 렌더링되는 화면에서 이어서 저장할 수 있도록 hidden input의 version을 갱신한다.
+        if employee_changes:
+            self.refresh_version(self.employee_form, "employee_version")
+        if user_changes:
+            self.refresh_version(self.user_form, "user_version")
+        return True
 
-        self.target_user.save(update_fields=update_fields)
+    def refresh_version(self, form, key: str) -> None:
+        """hidden input의 version을 form.instance의 현재 version으로 바꾼다."""
+        if form.cleaned_data.get(key) is not None:
+            form.data = form.data.copy()
+            form.data[key] = form.instance.version
 
     def post(
         self,
@@ -439,7 +682,7 @@ class EmployeeDetailView(SetFormView):
     ) -> HttpResponse:
         self.set_user_form(request.POST, self.target_user)
         self.set_employee_form(request.POST, self.target_employee)
-        self.set_resignation_form(request.POST, None)
+        self.set_resignation_form(request.POST, None, self.target_employee)
         if "resignation-btn" in request.POST:  # 퇴사처리 시
             self.compare_auth_and_add_error.check_to_do_resignation(
                 self.resignation_form
@@ -0,0 +1,110 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+from accounts.bloom import email_filter
+from accounts.cache import SharedMemoryCache
+from accounts.forms import EmployeeForm, LoginForm, SignUpForm, UserForm
+
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEMPLATES = [
+    "index.html",
+    "list.html",
+    "detail.html",
+    "pagination.html",
+    "guide.html",
+    "user/login.html",
+    "user/signup.html",
+]
+
+
+def warm_url_resolver() -> None:
+    """URL resolver를 만들고 모든 url name의 reverse 결과를 미리 계산한다."""
+    resolver = get_resolver()
+    for name in [key for key in resolver.reverse_dict if isinstance(key, str)]:
+        try:
+            reverse(name)
+        except Exception:
+            # 인자가 필요한 url은 resolver 구성만으로 충분하다.
+            continue
+
+
+def warm_templates() -> None:
+    """자주 사용하는 template을 미리 compile한다.
+    DEBUG=False 이면 cached loader가 compile 결과를 프로세스 안에 보관한다.
+    """
+    for template_name in WARMUP_TEMPLATES:
+        get_template(template_name)
+
+
+def warm_forms() -> None:
+    """form과 widget template을 한 번 render 해둔다."""
+    for form_class in (SignUpForm, LoginForm, UserForm, EmployeeForm):
+        str(form_class())
+
+
+def warm_databases() -> None:
+    """DB 연결을 한 번 열어 (SQLite pragma 적용 포함) 확인하고 가입 이메일 filter를 만든다.
+    boot thread에서 연 연결은 닫는다. pre-fork 서버(--preload)에서는 모든 worker가
+    같은 소켓과 SQLite handle을 이어받고, thread worker에서는 다시 사용되지 않는다.
+    """
+    try:
+        for alias in connections:
+            connections[alias].ensure_connection()
+        email_filter.build()
+    finally:
+        connections.close_all()
+
+
+def warm_caches() -> None:
+    """shared cache 파일을 만들어 크기를 맞춰 둔다.
+    - cache backend 객체는 thread 마다 만들어지므로 파일만 미리 준비한다.
+    - 권한 정책 표(accounts.permissions.PERMISSIONS)는 url_resolver 단계에서
+      view를 import 할 때 만들어진다.
+    - 가입 현황 수는 counter 테이블에서 한 번에 읽으므로 채워 둘 cache가 없다.
+    """
+    for alias in settings.CACHES:
+        cache = caches[alias]
+        if isinstance(cache, SharedMemoryCache):
+            cache.open()
+
+
+WARMUP_PHASES = [
+    ("url_resolver", warm_url_resolver),
+    ("templates", warm_templates),
+    ("forms", warm_forms),
+    ("databases", warm_databases),
+    ("caches", warm_caches),
+]
+
+
+def warmup() -> dict:
+    """worker가 요청을 받기 전에 첫 요청에서 발생하는 준비 작업을 미리 수행한다.
+        실패한 단계는 로그만 남기고 넘어가서 worker 기동을 막지 않는다.
+
+    Returns:
+        dict: 단계 별 소요 시간(ms)
+    """
+    durations = {}
+    for name, phase in WARMUP_PHASES:
+        started_at = time.perf_counter()
+        try:
+            phase()
+        except Exception:
+            logger.exception("warmup phase %s failed", name)
+        durations[name] = round((time.perf_counter() - started_at) * 1000, 2)
+    logger.info("warmup finished %s", durations)
+    return durations
+
+
+def warmup_on_boot() -> None:
+    """wsgi, asgi application 생성 직후 호출된다. WARMUP_ON_BOOT가 True일 때만 수행한다."""
+    if getattr(settings, "WARMUP_ON_BOOT", False):
+        warmup()
@@ -14,3 +14,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+from accounts.events import SignupEventsMiddleware  # noqa: E402
+from accounts.warmup import warmup_on_boot  # noqa: E402
+
+application = SignupEventsMiddleware(application)
+
+warmup_on_boot()
@@ -20,7 +20,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_DIR = BASE_DIR / ".secrets"
-secrets = json.load(open(os.path.join(SECRET_DIR, "secret.json")))
+with open(os.path.join(SECRET_DIR, "secret.json")) as secret_file:
+    secrets = json.load(secret_file)
 SECRET_KEY = secrets["DJANGO_SECRET_KEY"]
 
 # Media
@@ -51,7 +52,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "accounts.middleware.MetricsMiddleware",
+    "accounts.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "accounts.middleware.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -64,7 +68,7 @@ ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "accounts.instrumentation.TimedDjangoTemplates",
         "DIRS": [TEMPLATE_DIR],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -80,6 +84,33 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# Database router
+DATABASE_ROUTERS = [
+    "accounts.routers.ShardRouter",
+    "accounts.routers.ReplicaRouter",
+]
+
+# Database replica
+# GET 요청의 읽기는 DATABASE_REPLICAS 중 하나로, 쓰기는 default로 보낸다.
+DATABASE_REPLICAS = []
+
+# 쓰기 요청 후 primary에서 읽는 시간(초)
+REPLICA_STICKY_SECONDS = 5
+
+# 복제 지연이 이 값(초)을 넘는 replica는 읽기에서 제외한다. None이면 확인하지 않는다.
+REPLICA_MAX_LAG_SECONDS = 2
+REPLICA_LAG_CHECK_INTERVAL = 5
+
+# Database shard
+# 비어 있으면 샤딩을 사용하지 않는다. User와 Employee, Resignation은 user_id 기준으로
+# 같은 shard에 저장되고, default DB의 ShardDirectory가 user_id를 발급한다.
+DATABASE_SHARDS = []
+SHARD_STRATEGY = "range"  # "range" 또는 "hash"
+# range: user_id 1~SHARD_RANGE_SIZE는 첫 번째 shard, 다음 구간은 두 번째 shard에 저장한다.
+# 마지막 shard 구간을 넘는 user_id는 ImproperlyConfigured가 발생해 가입이 실패하므로
+# 발급된 user_id가 len(DATABASE_SHARDS) * SHARD_RANGE_SIZE에 가까워지기 전에 shard를 추가한다.
+SHARD_RANGE_SIZE = 1_000_000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -99,6 +130,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# 로그인 한 번의 비밀번호 검증 CPU 시간은 PASSWORD_HASH_ITERATIONS로 정한다.
+# python manage.py hasher_benchmark --target-ms 100 으로 서버에 맞는 값을 확인한다.
+# 값을 바꾸면 기존 비밀번호는 다음 로그인 성공 시 새 값으로 다시 해싱된다.
+PASSWORD_HASHERS = [
+    "accounts.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = 600_000
+
 AUTH_USER_MODEL = "accounts.User"
 
 # Internationalization
@@ -119,3 +163,145 @@ USE_TZ = True
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 COUNTS_PER_PAGE = 7
+
+# SQLite 성능 프로필
+# connection_created 시 accounts.db.apply_sqlite_pragmas에서 적용한다.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 134217728,
+    "cache_size": -20000,
+}
+
+# True이면 프로세스 안의 autocommit 쓰기를 하나씩 직렬화하고,
+# transaction.atomic()은 BEGIN IMMEDIATE로 시작한다. (accounts.db.serialize_writes)
+SQLITE_WRITE_QUEUE = False
+
+# Outbox
+# dispatch_outbox 명령어가 OUTBOX_HANDLER로 이벤트 묶음을 전달한다.
+OUTBOX_HANDLER = "accounts.outbox.log_handler"
+OUTBOX_WEBHOOK_URL = None
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_RETRY_BACKOFF = 5  # 첫 재시도까지 대기 시간(초), 실패할 때마다 2배
+OUTBOX_LEASE_SECONDS = 60  # 점유한 묶음을 이 시간 안에 발송하지 못하면 다시 발송한다.
+OUTBOX_POLL_INTERVAL = 1
+
+# Signup events
+# 가입 대기 목록 화면에 가입 신청, 승인, 거절을 Server-Sent Events로 보낸다. (ASGI로 실행할 때)
+# 여러 서버에서 실행하면 SIGNUP_EVENTS_POLL_INTERVAL(초)마다 outbox 테이블을 읽어 전달한다.
+SIGNUP_EVENTS_PATH = "/accounts/signup-events/"
+SIGNUP_EVENTS_KEEPALIVE = 15
+SIGNUP_EVENTS_QUEUE_SIZE = 100
+SIGNUP_EVENTS_POLL_INTERVAL = None
+# 먼저 읽은 이벤트보다 pk가 작은 이벤트가 늦게 commit될 수 있어서 건너뛴 pk를 이 시간(초) 동안 다시 읽는다.
+SIGNUP_EVENTS_GAP_TIMEOUT = 10
+
+# Signup queue
+# 가입 검토 대기열에서 임직원 한 명이 한 번에 점유하는 유저 수와 점유 유지 시간(초)
+SIGNUP_QUEUE_BATCH_SIZE = 7
+SIGNUP_QUEUE_LEASE_SECONDS = 300
+
+# Admin
+# 검색 조건 없이 이 건수 이상인 테이블은 admin 목록에서 DB 통계의 추정 건수를 보여준다.
+# (PostgreSQL, MySQL만 지원하고 그 외 DB는 항상 정확한 건수를 센다.)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
+ADMIN_ACTION_BATCH_SIZE = 500
+
+# Jobs
+# run_jobs 명령어가 Job 테이블의 작업을 실행한다. JOB_RUN_IN_PROCESS가 True이면
+# 작업 등록 시 웹 프로세스 안의 thread에서 바로 실행한다. (별도 worker 없이 사용할 때)
+JOB_RUN_IN_PROCESS = False
+JOB_POLL_INTERVAL = 1
+JOB_LEASE_SECONDS = 300  # 이 시간 동안 진행 상황 보고가 없으면 다른 worker가 다시 실행한다.
+JOB_MAX_ATTEMPTS = 3
+JOB_EXPORT_CHUNK_SIZE = 1000
+
+# Archive
+# archive_accounts 명령어가 보관 기간이 지난 거절 유저와 퇴사자를 ArchivedAccount로 옮긴다.
+ARCHIVE_REJECTED_AFTER_DAYS = 90
+ARCHIVE_RESIGNED_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+
+# Cache
+# "shared"는 한 서버의 worker 프로세스들이 memory-mapped 파일 하나를 공유하는 cache이다.
+# (accounts.cache.SharedMemoryCache) python manage.py cache_benchmark 로 성능을 비교한다.
+# 파일의 값은 unpickle 되므로 LOCATION은 다른 유저가 쓸 수 없는 디렉터리에 둔다.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "accounts.cache.SharedMemoryCache",
+        "LOCATION": os.path.join(BASE_DIR, "cache", "shared"),
+        "OPTIONS": {"SLOTS": 4096, "SLOT_SIZE": 512, "WAYS": 8},
+    },
+}
+
+# Login rate limit
+# IP와 이메일 별 token bucket. capacity 만큼 연속 시도 후 초당 refill_rate 개씩 회복된다.
+# 부하 테스트에서 로그인 처리 비용만 측정할 때만 LOGIN_RATE_LIMIT_ENABLED를 끈다.
+LOGIN_RATE_LIMIT_ENABLED = True
+LOGIN_RATE_LIMIT_CACHE = "shared"
+LOGIN_RATE_LIMIT_IP_HEADER = "REMOTE_ADDR"
+LOGIN_RATE_LIMIT = {
+    "ip": {"capacity": 20, "refill_rate": 0.5},
+    "email": {"capacity": 5, "refill_rate": 0.1},
+}
+
+# Email bloom filter
+# 가입되지 않은 이메일을 DB 조회 없이 판단한다. (accounts.bloom.email_filter)
+# 여러 worker를 사용할 때는 EMAIL_FILTER_CACHE가 worker 간에 공유되는 cache여야 한다.
+EMAIL_FILTER_ENABLED = True
+EMAIL_FILTER_CACHE = "shared"
+EMAIL_FILTER_CAPACITY = 100_000
+EMAIL_FILTER_ERROR_RATE = 0.01
+EMAIL_FILTER_REBUILD_INTERVAL = 3600
+
+# Server-Timing
+# 측정할 요청의 비율 (0 ~ 1). 측정된 요청은 Server-Timing 헤더와 로그를 남긴다.
+SERVER_TIMING_SAMPLE_RATE = 1.0
+
+# Metrics
+# /metrics 에서 Prometheus text 형식으로 노출한다.
+# 여러 worker 프로세스를 사용할 때는 METRICS_DIR을 지정해야 모든 worker의 값이 합쳐진다.
+METRICS_DIR = None
+METRICS_FLUSH_INTERVAL = 5
+METRICS_ALLOWED_IPS = ["127.0.0.1"]
+METRICS_URL_NAMES = [
+    "signup",
+    "login",
+    "signup_list",
+    "signup_detail",
+    "employee_list",
+    "employee_detail",
+]
+METRICS_LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+# Slow query log
+# SLOW_QUERY_THRESHOLD_MS 이상 걸린 쿼리를 호출한 코드 위치와 함께 기록한다. None이면 끈다.
+# python manage.py slow_queries 로 fingerprint 별 통계를 확인한다.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_STACK_DEPTH = 3
+SLOW_QUERY_LOG_FILE = os.path.join(BASE_DIR, "logs", "slow_queries.jsonl")
+
+# Warmup
+# True이면 wsgi, asgi application 생성 직후 accounts.warmup.warmup()을 실행해서
+# URL resolver, template, form, DB 연결, 이메일 filter를 첫 요청 전에 준비한다.
+# python manage.py startup_benchmark 로 cold start 단계 별 시간을 확인한다.
+WARMUP_ON_BOOT = False
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "simple": {"format": "%(asctime)s %(name)s %(levelname)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "simple"},
+    },
+    "loggers": {
+        "accounts": {"handlers": ["console"], "level": "INFO"},
+    },
+}
@@ -23,3 +23,11 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     },
 }
+
+# 로컬에서 replica 라우팅을 확인하려면 db.sqlite3를 복사한 replica.sqlite3를 추가한다.
+# DATABASES["replica"] = {
+#     "ENGINE": "django.db.backends.sqlite3",
+#     "NAME": BASE_DIR / "replica.sqlite3",
+#     "TEST": {"MIRROR": "default"},
+# }
+# DATABASE_REPLICAS = ["replica"]
@@ -8,3 +8,9 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     },
 }
+
+SQLITE_WRITE_QUEUE = True
+
+SERVER_TIMING_SAMPLE_RATE = 0.05
+
+WARMUP_ON_BOOT = True